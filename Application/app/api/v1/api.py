@@ -2,24 +2,35 @@
 Main API Router Configuration
 
 This module configures the main API router and includes all sub-routers
-for different resource endpoints (documents, users, document types).
+for different resource endpoints (authentication, documents, resumable uploads, users, document types, topics, tags,
+relationships, change feed, real-time events).
 
 Author: Marco Alejandro Santiago
 Created: February 14, 2025
 """
 
 from fastapi import APIRouter
-from app.api.v1 import documents, users, document_types
+from app.api.v1 import auth, documents, uploads, users, document_types, topics, tags, relationships, changes, events
 
 # Initialize main API router
 api_router = APIRouter()
 
 # Include sub-routers with their respective prefixes and tags
+api_router.include_router(
+    auth.router,
+    prefix="/auth",
+    tags=["auth"]
+)
 api_router.include_router(
     documents.router,
     prefix="/documents",
     tags=["documents"]
 )
+api_router.include_router(
+    uploads.router,
+    prefix="/uploads",
+    tags=["uploads"]
+)
 api_router.include_router(
     users.router,
     prefix="/users",
@@ -29,4 +40,29 @@ api_router.include_router(
     document_types.router,
     prefix="/document-types",
     tags=["document-types"]
-)
\ No newline at end of file
+)
+api_router.include_router(
+    topics.router,
+    prefix="/topics",
+    tags=["topics"]
+)
+api_router.include_router(
+    tags.router,
+    prefix="/tags",
+    tags=["tags"]
+)
+api_router.include_router(
+    relationships.router,
+    prefix="/relationships",
+    tags=["relationships"]
+)
+api_router.include_router(
+    changes.router,
+    prefix="/changes",
+    tags=["changes"]
+)
+api_router.include_router(
+    events.router,
+    prefix="/events",
+    tags=["events"]
+)
@@ -0,0 +1,89 @@
+"""
+Authentication API Router
+
+This module handles authentication endpoints, including login with token
+issuance and retrieval of the authenticated user.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import get_db, get_read_db
+from app.schemas.schemas import Token, User
+from app.services import auth_service
+
+# Initialize router
+router = APIRouter()
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Dependency resolving the user from a bearer token (no bcrypt involved)
+    
+    Args:
+        token: Bearer token from the Authorization header
+        db: Database session dependency
+    
+    Returns:
+        models.User: Authenticated user
+    
+    Raises:
+        HTTPException: If the token is missing, invalid or expired
+    """
+    db_user = auth_service.get_user_from_token(db, token)
+    if db_user is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return db_user
+
+@router.post("/login", response_model=Token)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db)
+):
+    """
+    Authenticate with username and password
+    
+    Args:
+        form_data: OAuth2 password form (username, password)
+        db: Database session dependency
+    
+    Returns:
+        Bearer access token
+    
+    Raises:
+        HTTPException: If the credentials are invalid
+    """
+    token = await auth_service.login(db, form_data.username, form_data.password)
+    if token is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return token
+
+@router.get("/me", response_model=User)
+def read_current_user(current_user=Depends(get_current_user)):
+    """
+    Retrieve the authenticated user
+    
+    Args:
+        current_user: User resolved from the bearer token
+    
+    Returns:
+        User object
+    """
+    return current_user
@@ -0,0 +1,83 @@
+"""
+Change Feed API Router
+
+This module exposes the change log to downstream mirrors: clients read the
+changes after the last position they processed and, with wait=, hold the
+request open until new changes are committed instead of polling repeatedly.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from typing import List, Optional
+import asyncio
+import time
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from app.core.config import settings
+from app.db.database import read_session
+from app.db.routing import client_key_from_request
+from app.schemas.schemas import ChangeFeed, ChangeLogEntry
+from app.services import change_service
+from app.services.change_service import change_notifier
+
+# Initialize router
+router = APIRouter()
+
+def _read_changes(client_key: Optional[str], since: int, limit: int, entity_types: Optional[List[str]]) -> ChangeFeed:
+    # Each poll holds a connection only while it reads, not while the request waits
+    with read_session(client_key) as db:
+        feed = change_service.get_changes(db, since, limit, entity_types)
+        return ChangeFeed(
+            Changes=[ChangeLogEntry.model_validate(change) for change in feed["Changes"]],
+            NextSince=feed["NextSince"]
+        )
+
+@router.get("/", response_model=ChangeFeed)
+async def read_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="Last ChangeId already processed"),
+    limit: int = Query(1000, ge=1, le=settings.CHANGE_FEED_MAX_LIMIT),
+    wait: float = Query(0, ge=0, le=settings.CHANGE_FEED_MAX_WAIT_SECONDS, description="Seconds to wait for new changes"),
+    entity_type: Optional[List[str]] = Query(None)
+):
+    """
+    Retrieve changes recorded after a position in the change log
+
+    With wait=0 the current page is returned immediately. Otherwise the
+    request returns as soon as changes are available, or with an empty page
+    when wait expires. Commits in this process wake waiting requests
+    immediately; changes committed by other processes are picked up every
+    CHANGE_FEED_POLL_SECONDS.
+
+    Args:
+        request: Incoming request, used for replica routing
+        since: Return changes with a higher ChangeId
+        limit: Maximum number of changes scanned
+        wait: Seconds to wait when there are no new changes
+        entity_type: Only return changes to these entity types
+
+    Returns:
+        Changes in order, and NextSince to pass as since on the next request
+
+    Raises:
+        HTTPException: If an unknown entity type is requested
+    """
+    if entity_type:
+        unknown = sorted(set(entity_type) - set(change_service.ENTITY_TYPES))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown entity type(s): {', '.join(unknown)}")
+
+    client_key = client_key_from_request(request)
+    deadline = time.monotonic() + wait
+    while True:
+        generation = change_notifier.generation
+        feed = await asyncio.to_thread(_read_changes, client_key, since, limit, entity_type)
+        remaining = deadline - time.monotonic()
+        # A filtered page can be empty while NextSince moves past other entities' changes
+        if feed.Changes or feed.NextSince != since or remaining <= 0:
+            return feed
+        if await request.is_disconnected():
+            return feed
+        await change_notifier.wait(generation, min(settings.CHANGE_FEED_POLL_SECONDS, remaining))
@@ -12,8 +12,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.db.database import get_db
-from app.schemas.schemas import DocumentTypeCreate, DocumentType, DocumentTypeUpdate
+from app.core.config import settings
+from app.core.serialization import FastJSONResponse
+from app.db.batching import in_request_order
+from app.db.database import get_db, get_read_db
+from app.schemas.schemas import BatchGetItem, BatchGetRequest, DocumentTypeCreate, DocumentType, DocumentTypeUpdate
 from app.services import document_type_service
 
 # Initialize router
@@ -43,7 +46,7 @@ def create_document_type(
 def get_document_types(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Retrieve all document types with pagination
@@ -56,10 +59,27 @@ def get_document_types(
     Returns:
         List of document type objects
     """
+    if settings.FAST_LIST_RESPONSES:
+        return FastJSONResponse(document_type_service.get_document_type_rows(db, skip=skip, limit=limit))
     return document_type_service.get_document_types(db, skip=skip, limit=limit)
 
+@router.post("/batch-get", response_model=List[BatchGetItem[DocumentType]])
+def batch_get_document_types(request: BatchGetRequest, db: Session = Depends(get_read_db)):
+    """
+    Retrieve many document types by ID in one request
+    
+    Args:
+        request: BatchGetRequest schema with the document type IDs
+        db: Database session dependency
+    
+    Returns:
+        One entry per requested ID, in request order, marking IDs that were not found
+    """
+    found = document_type_service.get_document_types_by_ids(db, request.Ids)
+    return in_request_order(request.Ids, found)
+
 @router.get("/{type_id}", response_model=DocumentType)
-def get_document_type(type_id: int, db: Session = Depends(get_db)):
+def get_document_type(type_id: int, db: Session = Depends(get_read_db)):
     """
     Retrieve a specific document type by ID
     
@@ -9,22 +9,48 @@ Author: Marco Alejandro Santiago
 Created: February 14, 2025
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Literal, Optional
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.core.serialization import FastJSONResponse
+from app.db.batching import in_request_order
+from app.db.database import get_db, get_read_db, read_session
+from app.db.routing import client_key_from_request
 from app import schemas, models
-from app.services import document_service
+from app.schemas.projection import projection_adapter, projection_model
+from app.services import document_service, duplicate_service, metadata_service, stats_service, text_service
+from app.services.activity_service import activity_buffer
 
 # Initialize router
 router = APIRouter()
 
+FIELDS_QUERY = Query(None, description="Comma-separated document fields to return, e.g. DocumentId,DocumentName")
+INCLUDE_QUERY = Query(None, description="Comma-separated relations to return: versions, metadata")
+
+def _projection_response(content, projection: tuple) -> Response:
+    """Encode projected document rows (or one row) with a schema built for the projection"""
+    if settings.FAST_LIST_RESPONSES:
+        return FastJSONResponse(content)
+    fields, include = projection
+    projected = tuple(fields + include)
+    if isinstance(content, list):
+        adapter = projection_adapter(schemas.Document, projected)
+        body = adapter.dump_json(adapter.validate_python(content))
+    else:
+        body = projection_model(schemas.Document, projected).model_validate(content).model_dump_json()
+    return Response(body, media_type="application/json")
+
 @router.get("/", response_model=List[schemas.Document])
 async def get_documents(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    db: Session = Depends(get_read_db)
 ):
     """
     Retrieve all documents with pagination
@@ -32,13 +58,149 @@ async def get_documents(
     Args:
         skip: Number of records to skip
         limit: Maximum number of records to return
+        fields: Only return these fields (and no relations unless included)
+        include: Only return these relations
         db: Database session dependency
     
     Returns:
-        List of document objects
+        List of document objects, projected if fields or include is given
     """
+    projection = document_service.parse_projection(fields, include)
+    if projection is not None:
+        rows = document_service.get_document_rows(db, skip, limit, *projection)
+        return _projection_response(rows, projection)
+    if settings.FAST_LIST_RESPONSES:
+        return FastJSONResponse(document_service.get_document_rows(db, skip=skip, limit=limit))
     return document_service.get_documents(db, skip=skip, limit=limit)
 
+@router.get("/export")
+def export_documents(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    compress: bool = False,
+    document_type_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    modified_since: Optional[datetime] = None,
+    include_deleted: bool = False
+):
+    """
+    Stream the document catalogue as NDJSON or CSV
+    
+    The response is produced row batch by row batch from a server-side
+    cursor, so memory use does not grow with the catalogue size.
+    
+    Args:
+        request: Incoming request, used for replica routing
+        format: "ndjson" or "csv"
+        compress: Gzip the stream (served as a .gz attachment)
+        document_type_id: Only export documents of this type
+        created_from: Only export documents created at or after this time
+        created_to: Only export documents created before this time
+        modified_since: Only export documents modified at or after this time
+        include_deleted: Also export soft-deleted documents
+    
+    Returns:
+        Streaming response with one document per line
+    """
+    client_key = client_key_from_request(request)
+
+    def stream():
+        # The request's dependencies are closed before the body is sent
+        with read_session(client_key) as db:
+            yield from document_service.export_documents(
+                db,
+                export_format=format,
+                document_type_id=document_type_id,
+                created_from=created_from,
+                created_to=created_to,
+                modified_since=modified_since,
+                include_deleted=include_deleted,
+                compress=compress
+            )
+
+    filename = f"documents.{format}"
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/duplicates", response_model=List[schemas.DuplicateGroup])
+def get_duplicate_report(
+    threshold: Optional[float] = Query(None, ge=0, le=1),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Report groups of near-duplicate documents across the corpus
+    
+    Only documents that have been signed are included; run
+    manage.py minhash-backfill once for documents stored earlier.
+    
+    Args:
+        threshold: Minimum estimated similarity (defaults to NEAR_DUPLICATE_THRESHOLD)
+        db: Database session dependency
+    
+    Returns:
+        Groups of document IDs, largest first
+    """
+    return duplicate_service.get_duplicate_report(db, threshold)
+
+@router.get("/stats", response_model=schemas.DocumentStatistics)
+def get_document_statistics(db: Session = Depends(get_read_db)):
+    """
+    Count live documents and their total size, overall and by facet
+    
+    Served from precomputed counters, so the cost does not grow with the
+    number of documents. Counters start from zero on a new install; run
+    manage.py reconcile-stats once to count documents stored earlier.
+    
+    Args:
+        db: Database session dependency
+    
+    Returns:
+        Totals plus buckets by document type, creation month and file type
+    """
+    return stats_service.get_statistics(db)
+
+@router.put("/metadata", response_model=schemas.MetadataUpsertResult)
+def upsert_document_metadata(request: schemas.MetadataUpsertRequest, db: Session = Depends(get_db)):
+    """
+    Insert or overwrite typed metadata for many documents at once
+    
+    Keys not listed for a document are left unchanged. Values are coerced
+    to their DataType; if any value does not fit, nothing is written.
+    
+    Args:
+        request: MetadataUpsertRequest schema with the entries per document
+        db: Database session dependency
+    
+    Returns:
+        Number of entries written and the IDs of missing or deleted documents skipped
+    """
+    return metadata_service.upsert_metadata(db, request.Documents)
+
+@router.post("/metadata/batch-get", response_model=Dict[int, Dict[str, schemas.MetadataValue]])
+def batch_get_document_metadata(request: schemas.MetadataBatchGetRequest, db: Session = Depends(get_read_db)):
+    """
+    Read the metadata of many documents in one request
+    
+    Args:
+        request: MetadataBatchGetRequest schema with the document IDs and optional keys
+        db: Database session dependency
+    
+    Returns:
+        Metadata keyed by DocumentId, then MetadataKey; missing or deleted documents have none
+    """
+    result = metadata_service.get_metadata(db, request.Ids, request.Keys)
+    if settings.FAST_LIST_RESPONSES:
+        return FastJSONResponse({str(document_id): entries for document_id, entries in result.items()})
+    return result
+
 @router.post("/", response_model=schemas.Document)
 async def create_document(
     document: schemas.DocumentCreate,
@@ -58,29 +220,122 @@ async def create_document(
     """
     return await document_service.create_document(db, document, file)
 
+@router.post("/batch-get", response_model=List[schemas.BatchGetItem[schemas.Document]])
+async def batch_get_documents(
+    request: schemas.BatchGetRequest,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve many documents by ID in one request
+    
+    Args:
+        request: BatchGetRequest schema with the document IDs
+        db: Database session dependency
+    
+    Returns:
+        One entry per requested ID, in request order, marking IDs that were not found
+    """
+    found = document_service.get_documents_by_ids(db, request.Ids)
+    for document_id in found:
+        activity_buffer.record_access(document_id)
+    return in_request_order(request.Ids, found)
+
 @router.get("/{document_id}", response_model=schemas.Document)
 async def get_document(
     document_id: int,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    db: Session = Depends(get_read_db)
 ):
     """
     Retrieve a specific document by ID
     
     Args:
         document_id: Document's unique identifier
+        fields: Only return these fields (and no relations unless included)
+        include: Only return these relations
         db: Database session dependency
     
     Returns:
-        Document object if found
+        Document object if found, projected if fields or include is given
     
     Raises:
         HTTPException: If document is not found
     """
+    projection = document_service.parse_projection(fields, include)
+    if projection is not None:
+        rows = document_service.get_document_rows(db, 0, 1, *projection, document_id=document_id)
+        if not rows:
+            raise HTTPException(status_code=404, detail="Document not found")
+        activity_buffer.record_access(document_id)
+        return _projection_response(rows[0], projection)
     document = document_service.get_document(db, document_id)
     if document is None:
         raise HTTPException(status_code=404, detail="Document not found")
+    activity_buffer.record_access(document_id)
     return document
 
+@router.get("/{document_id}/duplicates", response_model=List[schemas.DuplicateCandidate])
+def get_possible_duplicates(
+    document_id: int,
+    threshold: Optional[float] = Query(None, ge=0, le=1),
+    limit: int = Query(50, ge=1, le=1000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List documents that are probably near duplicates of a document
+    
+    Args:
+        document_id: Document's unique identifier
+        threshold: Minimum estimated similarity (defaults to NEAR_DUPLICATE_THRESHOLD)
+        limit: Maximum number of results
+        db: Database session dependency
+    
+    Returns:
+        Matching documents, most similar first
+    
+    Raises:
+        HTTPException: If document is not found
+    """
+    matches = duplicate_service.get_possible_duplicates(db, document_id, threshold, limit)
+    if matches is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return matches
+
+@router.get("/{document_id}/text", response_class=PlainTextResponse)
+def get_document_text(document_id: int, request: Request):
+    """
+    Retrieve the plain text extracted from a document's file
+    
+    Text is served from the extraction cache, or extracted now if the
+    content has not been seen before. The detected format (pdf, docx, html
+    or text) is returned in the X-Text-Format header.
+    
+    Args:
+        document_id: Document's unique identifier
+        request: Incoming request, used for replica routing
+    
+    Returns:
+        Extracted text as text/plain
+    
+    Raises:
+        HTTPException: If the document or its file is not found, the format
+        is not supported, or extraction fails or times out
+    """
+    # The session closes before extraction, which can take seconds
+    with read_session(client_key_from_request(request)) as db:
+        source = text_service.get_text_source(db, document_id)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    result = text_service.text_extractor.extract(source.FileLocation, source.FileType, source.ContentHash)
+    if result.status == text_service.STATUS_OK:
+        return PlainTextResponse(result.text, headers={"X-Text-Format": result.format})
+    if result.status == text_service.STATUS_MISSING:
+        raise HTTPException(status_code=404, detail="Document file not found")
+    if result.status == text_service.STATUS_UNSUPPORTED:
+        raise HTTPException(status_code=415, detail=f"Text cannot be extracted: {result.error}")
+    raise HTTPException(status_code=422, detail=f"Text extraction {result.status}: {result.error}")
+
 @router.put("/{document_id}", response_model=schemas.Document)
 async def update_document(
     document_id: int,
@@ -0,0 +1,156 @@
+"""
+Real-time Events API Router
+
+This module pushes document create/update/delete events to clients over
+Server-Sent Events or a WebSocket, optionally filtered by document type and
+topic, so user interfaces no longer need to poll the document list.
+
+Every event carries its ChangeId; a client that reconnects can catch up on
+what it missed from GET /changes?since=<last ChangeId>.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from typing import List, Optional
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.db.database import read_session
+from app.services.event_service import BrokerFull, Subscription, event_broker
+from app.services.topic_service import topic_tree
+
+# Initialize router
+router = APIRouter()
+
+# WebSocket close code asking the client to reconnect later
+TRY_AGAIN_LATER = 1013
+
+def _topic_subtrees(topic_ids: List[int]) -> List[int]:
+    with read_session() as db:
+        subtree_ids = set()
+        for topic_id in topic_ids:
+            subtree_ids.update(topic_tree.descendant_ids(db, topic_id))
+        return sorted(subtree_ids)
+
+async def _subscribe(document_type_id: Optional[List[int]], topic_id: Optional[List[int]]) -> Subscription:
+    # Topic filters cover each topic's subtree as it is when the client connects
+    topic_ids = await asyncio.to_thread(_topic_subtrees, topic_id) if topic_id else None
+    return event_broker.subscribe(document_type_id, topic_ids)
+
+@router.get("/stream")
+async def stream_events(
+    document_type_id: Optional[List[int]] = Query(None),
+    topic_id: Optional[List[int]] = Query(None, description="Include documents under these topics or their subtopics")
+):
+    """
+    Stream document events as Server-Sent Events
+
+    Each event is sent with its ChangeId as the SSE id and its name
+    (document.created, document.updated, document.deleted) as the SSE event.
+    A client that falls too far behind receives a "dropped" event and the
+    stream ends.
+
+    Args:
+        document_type_id: Only send documents of these types
+        topic_id: Only send documents assigned under these topics
+
+    Returns:
+        text/event-stream response
+
+    Raises:
+        HTTPException: If this process has no room for another subscriber
+    """
+    try:
+        subscription = await _subscribe(document_type_id, topic_id)
+    except BrokerFull:
+        raise HTTPException(status_code=503, detail="Too many event subscribers", headers={"Retry-After": "5"})
+
+    async def stream():
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.next(), settings.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if event is None:
+                    yield b"event: dropped\ndata: {}\n\n"
+                    return
+                yield (
+                    f"id: {event['ChangeId']}\nevent: {event['Event']}\ndata: ".encode()
+                    + dumps(event)
+                    + b"\n\n"
+                )
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    document_type_id: Optional[List[int]] = Query(None),
+    topic_id: Optional[List[int]] = Query(None)
+):
+    """
+    Push document events over a WebSocket as JSON text messages
+
+    Idle connections receive {"Event": "heartbeat"} messages. A client that
+    falls too far behind is closed with code 1013 and should reconnect.
+
+    Args:
+        websocket: Client connection
+        document_type_id: Only send documents of these types
+        topic_id: Only send documents assigned under these topics
+    """
+    try:
+        subscription = await _subscribe(document_type_id, topic_id)
+    except BrokerFull:
+        await websocket.close(code=TRY_AGAIN_LATER)
+        return
+
+    async def receive_until_closed():
+        # Clients send nothing; reading is how a closed connection is noticed
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    closed = pending = None
+    try:
+        await websocket.accept()
+        closed = asyncio.create_task(receive_until_closed())
+        while True:
+            if pending is None:
+                pending = asyncio.create_task(subscription.next())
+            done, _ = await asyncio.wait(
+                {pending, closed},
+                timeout=settings.EVENTS_HEARTBEAT_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if closed in done:
+                return
+            if pending not in done:
+                await websocket.send_text('{"Event":"heartbeat"}')
+                continue
+            event, pending = pending.result(), None
+            if event is None:
+                await websocket.close(code=TRY_AGAIN_LATER)
+                return
+            await websocket.send_text(dumps(event).decode())
+    except (WebSocketDisconnect, RuntimeError):
+        # The client went away mid-send
+        pass
+    finally:
+        event_broker.unsubscribe(subscription)
+        for task in (pending, closed):
+            if task is not None:
+                task.cancel()
@@ -0,0 +1,187 @@
+"""
+Document Relationships API Router
+
+This module handles the document relationship graph endpoints, including
+creation and deactivation of relationships, batched neighbour lookups and
+bounded graph traversal for "related documents" views.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Dict, List, Literal, Optional
+
+from app.api.v1.auth import get_current_user
+from app.core.config import settings
+from app.db.database import get_db, get_read_db
+from app.schemas.schemas import (
+    DocumentIdList,
+    DocumentRelationship,
+    DocumentRelationshipCreate,
+    GraphEdge,
+    RelationshipGraph
+)
+from app.services import document_service, relationship_service
+
+# Initialize router
+router = APIRouter()
+
+Direction = Literal["outgoing", "incoming", "both"]
+
+@router.post("/", response_model=DocumentRelationship)
+def create_relationship(
+    relationship: DocumentRelationshipCreate,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Create a relationship between two documents
+
+    Args:
+        relationship: DocumentRelationshipCreate schema with the edge details
+        db: Database session dependency
+        current_user: Authenticated user, recorded as the creator
+
+    Returns:
+        Created relationship object
+    """
+    return relationship_service.create_relationship(
+        db=db, relationship=relationship, created_by_id=current_user.UserId
+    )
+
+@router.post("/neighbors", response_model=Dict[int, List[GraphEdge]])
+def get_neighbors(
+    documents: DocumentIdList,
+    direction: Direction = "both",
+    relationship_type: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve the relationships of many documents in one call
+
+    Args:
+        documents: DocumentIdList schema with the documents to look up
+        direction: "outgoing", "incoming" or "both"
+        relationship_type: Only return these relationship types (repeatable)
+        db: Database session dependency
+
+    Returns:
+        Edges keyed by DocumentId
+    """
+    return relationship_service.neighbor_map(
+        db,
+        documents.DocumentIds,
+        direction=direction,
+        relationship_types=relationship_type
+    )
+
+@router.get("/documents/{document_id}", response_model=List[DocumentRelationship])
+def get_document_relationships(
+    document_id: int,
+    direction: Direction = "both",
+    relationship_type: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve the relationships of a document
+
+    Args:
+        document_id: Document's unique identifier
+        direction: "outgoing", "incoming" or "both"
+        relationship_type: Only return these relationship types (repeatable)
+        db: Database session dependency
+
+    Returns:
+        List of relationship objects
+    """
+    return relationship_service.get_document_relationships(
+        db,
+        document_id,
+        direction=direction,
+        relationship_types=relationship_type
+    )
+
+@router.get("/documents/{document_id}/graph", response_model=RelationshipGraph)
+def get_document_graph(
+    document_id: int,
+    depth: int = Query(2, ge=0, le=settings.GRAPH_MAX_DEPTH),
+    max_nodes: int = Query(500, ge=1, le=settings.GRAPH_MAX_NODES),
+    max_fanout: int = Query(50, ge=1, le=settings.GRAPH_MAX_FANOUT),
+    direction: Direction = "both",
+    relationship_type: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve the related-documents graph around a document
+
+    Args:
+        document_id: Document the traversal starts from
+        depth: Number of hops to follow
+        max_nodes: Maximum documents in the result
+        max_fanout: Maximum relationships followed per document
+        direction: "outgoing", "incoming" or "both"
+        relationship_type: Only follow these relationship types (repeatable)
+        db: Database session dependency
+
+    Returns:
+        Nodes, edges and whether a limit truncated the graph
+
+    Raises:
+        HTTPException: If the document is not found
+    """
+    if document_service.get_document(db, document_id) is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return relationship_service.traverse(
+        db,
+        document_id,
+        max_depth=depth,
+        max_nodes=max_nodes,
+        max_fanout=max_fanout,
+        direction=direction,
+        relationship_types=relationship_type
+    )
+
+@router.get("/{relationship_id}", response_model=DocumentRelationship)
+def get_relationship(relationship_id: int, db: Session = Depends(get_read_db)):
+    """
+    Retrieve a specific relationship by ID
+
+    Args:
+        relationship_id: Relationship's unique identifier
+        db: Database session dependency
+
+    Returns:
+        Relationship object if found
+
+    Raises:
+        HTTPException: If relationship is not found
+    """
+    db_relationship = relationship_service.get_relationship(db, relationship_id)
+    if db_relationship is None:
+        raise HTTPException(status_code=404, detail="Relationship not found")
+    return db_relationship
+
+@router.delete("/{relationship_id}")
+def delete_relationship(relationship_id: int, db: Session = Depends(get_db)):
+    """
+    Deactivate a relationship
+
+    Args:
+        relationship_id: Relationship's unique identifier
+        db: Database session dependency
+
+    Returns:
+        Success message
+
+    Raises:
+        HTTPException: If relationship is not found
+    """
+    success = relationship_service.delete_relationship(db, relationship_id=relationship_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Relationship not found")
+    return {
+        "status": "success",
+        "message": "Relationship deactivated successfully"
+    }
@@ -0,0 +1,180 @@
+"""
+Tags API Router
+
+This module handles tag endpoints, including creation, retrieval, updating and
+deactivation of tags, bulk tagging of documents, and tag expression queries
+served from the in-memory tag index.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.core.config import settings
+from app.db.database import get_db, get_read_db
+from app.schemas.schemas import Tag, TagAssignment, TagCreate, TagQueryResult, TagUpdate
+from app.services import tag_service
+
+# Initialize router
+router = APIRouter()
+
+@router.post("/", response_model=Tag)
+def create_tag(tag: TagCreate, db: Session = Depends(get_db)):
+    """
+    Create a new tag
+
+    Args:
+        tag: TagCreate schema with tag details
+        db: Database session dependency
+
+    Returns:
+        Created tag object
+    """
+    return tag_service.create_tag(db=db, tag=tag)
+
+@router.get("/", response_model=List[Tag])
+def get_tags(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve all tags with pagination
+
+    Args:
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        db: Database session dependency
+
+    Returns:
+        List of tag objects
+    """
+    return tag_service.get_tags(db, skip=skip, limit=limit)
+
+@router.get("/query", response_model=TagQueryResult)
+def query_tags(
+    q: str = Query(..., description='Tag expression, e.g. invoice AND ("fiscal 2024" OR audit) AND NOT draft'),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.TAG_QUERY_MAX_LIMIT)
+):
+    """
+    Find documents matching a tag expression
+
+    Args:
+        q: Expression combining tag names with AND, OR, NOT and parentheses
+        skip: Number of matching IDs to skip
+        limit: Maximum number of IDs to return
+
+    Returns:
+        Total number of matches and one page of DocumentIds
+    """
+    return tag_service.query_documents(q, skip=skip, limit=limit)
+
+@router.post("/assignments")
+def tag_documents(assignment: TagAssignment, db: Session = Depends(get_db)):
+    """
+    Apply tags to documents in bulk
+
+    Args:
+        assignment: TagAssignment schema with the tags and documents
+        db: Database session dependency
+
+    Returns:
+        Number of new assignments
+    """
+    return {"assigned": tag_service.tag_documents(db, assignment.TagIds, assignment.DocumentIds)}
+
+@router.delete("/assignments")
+def untag_documents(assignment: TagAssignment, db: Session = Depends(get_db)):
+    """
+    Remove tags from documents in bulk
+
+    Args:
+        assignment: TagAssignment schema with the tags and documents
+        db: Database session dependency
+
+    Returns:
+        Number of assignments removed
+    """
+    return {"removed": tag_service.untag_documents(db, assignment.TagIds, assignment.DocumentIds)}
+
+@router.get("/documents/{document_id}", response_model=List[Tag])
+def get_document_tags(document_id: int, db: Session = Depends(get_read_db)):
+    """
+    Retrieve the tags of a document
+
+    Args:
+        document_id: Document's unique identifier
+        db: Database session dependency
+
+    Returns:
+        List of tag objects
+    """
+    return tag_service.get_document_tags(db, document_id)
+
+@router.get("/{tag_id}", response_model=Tag)
+def get_tag(tag_id: int, db: Session = Depends(get_read_db)):
+    """
+    Retrieve a specific tag by ID
+
+    Args:
+        tag_id: Tag's unique identifier
+        db: Database session dependency
+
+    Returns:
+        Tag object if found
+
+    Raises:
+        HTTPException: If tag is not found
+    """
+    db_tag = tag_service.get_tag(db, tag_id)
+    if db_tag is None:
+        raise HTTPException(status_code=404, detail="Tag not found")
+    return db_tag
+
+@router.put("/{tag_id}", response_model=Tag)
+def update_tag(tag_id: int, tag: TagUpdate, db: Session = Depends(get_db)):
+    """
+    Update a tag
+
+    Args:
+        tag_id: Tag's unique identifier
+        tag: TagUpdate schema with update data
+        db: Database session dependency
+
+    Returns:
+        Updated tag object
+
+    Raises:
+        HTTPException: If tag is not found
+    """
+    db_tag = tag_service.update_tag(db, tag_id=tag_id, tag=tag)
+    if db_tag is None:
+        raise HTTPException(status_code=404, detail="Tag not found")
+    return db_tag
+
+@router.delete("/{tag_id}")
+def delete_tag(tag_id: int, db: Session = Depends(get_db)):
+    """
+    Deactivate a tag
+
+    Args:
+        tag_id: Tag's unique identifier
+        db: Database session dependency
+
+    Returns:
+        Success message
+
+    Raises:
+        HTTPException: If tag is not found
+    """
+    success = tag_service.delete_tag(db, tag_id=tag_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Tag not found")
+    return {
+        "status": "success",
+        "message": "Tag deactivated successfully"
+    }
@@ -0,0 +1,285 @@
+"""
+Topics API Router
+
+This module handles topic hierarchy endpoints, including creation, retrieval,
+updating, moving and deactivation of topics, subtree and ancestor lookups,
+and assignment of documents to topics.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.db.database import get_db, get_read_db
+from app.schemas.schemas import Document, DocumentIdList, Topic, TopicCreate, TopicMove, TopicUpdate
+from app.services import topic_service
+
+# Initialize router
+router = APIRouter()
+
+def _require_topic(db: Session, topic_id: int):
+    db_topic = topic_service.get_topic(db, topic_id)
+    if db_topic is None:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    return db_topic
+
+@router.post("/", response_model=Topic)
+def create_topic(topic: TopicCreate, db: Session = Depends(get_db)):
+    """
+    Create a new topic
+
+    Args:
+        topic: TopicCreate schema with topic details
+        db: Database session dependency
+
+    Returns:
+        Created topic object
+    """
+    return topic_service.create_topic(db=db, topic=topic)
+
+@router.get("/", response_model=List[Topic])
+def get_topics(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve all topics with pagination
+
+    Args:
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        db: Database session dependency
+
+    Returns:
+        List of topic objects
+    """
+    return topic_service.get_topics(db, skip=skip, limit=limit)
+
+@router.get("/tree", response_model=List[Topic])
+def get_topic_tree(db: Session = Depends(get_read_db)):
+    """
+    Retrieve the whole active hierarchy with nested child_topics
+
+    Served from the in-memory tree cache as pre-encoded JSON.
+
+    Args:
+        db: Database session dependency
+
+    Returns:
+        List of root topic objects
+    """
+    return Response(content=topic_service.topic_tree.rendered(db), media_type="application/json")
+
+@router.get("/{topic_id}", response_model=Topic)
+def get_topic(topic_id: int, db: Session = Depends(get_read_db)):
+    """
+    Retrieve a specific topic by ID
+
+    Args:
+        topic_id: Topic's unique identifier
+        db: Database session dependency
+
+    Returns:
+        Topic object if found
+
+    Raises:
+        HTTPException: If topic is not found
+    """
+    return _require_topic(db, topic_id)
+
+@router.get("/{topic_id}/descendants", response_model=List[Topic])
+def get_topic_descendants(
+    topic_id: int,
+    max_depth: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve every topic below a topic
+
+    Args:
+        topic_id: Subtree root
+        max_depth: Only return descendants at most this many levels down
+        db: Database session dependency
+
+    Returns:
+        List of topic objects ordered by depth
+
+    Raises:
+        HTTPException: If topic is not found
+    """
+    _require_topic(db, topic_id)
+    return topic_service.get_descendants(db, topic_id, max_depth=max_depth)
+
+@router.get("/{topic_id}/ancestors", response_model=List[Topic])
+def get_topic_ancestors(topic_id: int, db: Session = Depends(get_read_db)):
+    """
+    Retrieve the path from the root to a topic
+
+    Args:
+        topic_id: Topic's unique identifier
+        db: Database session dependency
+
+    Returns:
+        List of topic objects ordered from the root
+
+    Raises:
+        HTTPException: If topic is not found
+    """
+    _require_topic(db, topic_id)
+    return topic_service.get_ancestors(db, topic_id)
+
+@router.put("/{topic_id}", response_model=Topic)
+def update_topic(
+    topic_id: int,
+    topic: TopicUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Update a topic
+
+    Args:
+        topic_id: Topic's unique identifier
+        topic: TopicUpdate schema with update data
+        db: Database session dependency
+
+    Returns:
+        Updated topic object
+
+    Raises:
+        HTTPException: If topic is not found
+    """
+    db_topic = topic_service.update_topic(db, topic_id=topic_id, topic=topic)
+    if db_topic is None:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    return db_topic
+
+@router.post("/{topic_id}/move", response_model=Topic)
+def move_topic(
+    topic_id: int,
+    move: TopicMove,
+    db: Session = Depends(get_db)
+):
+    """
+    Move a topic and its subtree under a new parent
+
+    Args:
+        topic_id: Root of the subtree to move
+        move: TopicMove schema with the new parent
+        db: Database session dependency
+
+    Returns:
+        Moved topic object
+
+    Raises:
+        HTTPException: If topic is not found or the move is invalid
+    """
+    db_topic = topic_service.move_topic(db, topic_id, move.ParentTopicId)
+    if db_topic is None:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    return db_topic
+
+@router.delete("/{topic_id}")
+def delete_topic(topic_id: int, db: Session = Depends(get_db)):
+    """
+    Deactivate a topic and its subtree
+
+    Args:
+        topic_id: Topic's unique identifier
+        db: Database session dependency
+
+    Returns:
+        Success message
+
+    Raises:
+        HTTPException: If topic is not found
+    """
+    success = topic_service.delete_topic(db, topic_id=topic_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    return {
+        "status": "success",
+        "message": "Topic deactivated successfully"
+    }
+
+@router.get("/{topic_id}/documents", response_model=List[Document])
+def get_topic_documents(
+    topic_id: int,
+    include_descendants: bool = True,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve documents assigned to a topic or its subtree
+
+    Args:
+        topic_id: Topic's unique identifier
+        include_descendants: Include documents of descendant topics
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        db: Database session dependency
+
+    Returns:
+        List of document objects
+
+    Raises:
+        HTTPException: If topic is not found
+    """
+    _require_topic(db, topic_id)
+    return topic_service.get_topic_documents(
+        db,
+        topic_id,
+        include_descendants=include_descendants,
+        skip=skip,
+        limit=limit
+    )
+
+@router.post("/{topic_id}/documents")
+def assign_topic_documents(
+    topic_id: int,
+    documents: DocumentIdList,
+    db: Session = Depends(get_db)
+):
+    """
+    Assign documents to a topic
+
+    Args:
+        topic_id: Topic's unique identifier
+        documents: DocumentIdList schema with the documents to assign
+        db: Database session dependency
+
+    Returns:
+        Number of new assignments
+
+    Raises:
+        HTTPException: If topic is not found
+    """
+    _require_topic(db, topic_id)
+    return {"assigned": topic_service.assign_documents(db, topic_id, documents.DocumentIds)}
+
+@router.delete("/{topic_id}/documents")
+def remove_topic_documents(
+    topic_id: int,
+    documents: DocumentIdList,
+    db: Session = Depends(get_db)
+):
+    """
+    Remove documents from a topic
+
+    Args:
+        topic_id: Topic's unique identifier
+        documents: DocumentIdList schema with the documents to remove
+        db: Database session dependency
+
+    Returns:
+        Number of assignments removed
+
+    Raises:
+        HTTPException: If topic is not found
+    """
+    _require_topic(db, topic_id)
+    return {"removed": topic_service.remove_documents(db, topic_id, documents.DocumentIds)}
@@ -0,0 +1,130 @@
+"""
+Resumable Uploads API Router
+
+This module handles tus-style resumable uploads for large files: creating an
+upload session, sending the file in chunks at explicit offsets, querying the
+current offset after a dropped connection, and finalizing the upload into a
+document.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+from starlette.requests import ClientDisconnect
+
+from app.db.database import get_db
+from app.schemas.schemas import Document, UploadSession, UploadSessionCreate
+from app.services.upload_service import upload_sessions
+
+# Initialize router
+router = APIRouter()
+
+@router.post("/", response_model=UploadSession, status_code=201)
+def create_upload(upload: UploadSessionCreate, request: Request, response: Response):
+    """
+    Start a resumable upload
+
+    Args:
+        upload: UploadSessionCreate schema with document details, file name and total length
+        request: Incoming request, used to build the session URL
+        response: Response, used to set the Location header
+
+    Returns:
+        Upload session with its UploadId and an Offset of 0
+    """
+    session = upload_sessions.create(upload)
+    response.headers["Location"] = str(request.url_for("get_upload", upload_id=session["UploadId"]))
+    response.headers["Upload-Offset"] = "0"
+    return session
+
+@router.get("/{upload_id}", response_model=UploadSession)
+def get_upload(upload_id: str):
+    """
+    Retrieve an upload session, including the number of bytes received
+
+    Args:
+        upload_id: Upload session identifier
+
+    Returns:
+        Upload session object
+    """
+    return upload_sessions.get(upload_id)
+
+@router.head("/{upload_id}")
+def get_upload_offset(upload_id: str):
+    """
+    Report the current offset of an upload, tus style
+
+    Args:
+        upload_id: Upload session identifier
+
+    Returns:
+        Empty response with Upload-Offset and Upload-Length headers
+    """
+    session = upload_sessions.get(upload_id)
+    return Response(headers={
+        "Upload-Offset": str(session["Offset"]),
+        "Upload-Length": str(session["Length"]),
+        "Cache-Control": "no-store"
+    })
+
+@router.api_route("/{upload_id}", methods=["PATCH", "PUT"], status_code=204)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., ge=0)
+):
+    """
+    Append a chunk of the file
+
+    The raw request body is the chunk. It must start at the session's current
+    offset; after a failed request, query the offset and resend from there.
+
+    Args:
+        upload_id: Upload session identifier
+        request: Incoming request whose body is streamed to staging
+        upload_offset: Upload-Offset header, the offset the chunk starts at
+
+    Returns:
+        Empty response with the new Upload-Offset header
+    """
+    try:
+        offset = await upload_sessions.append(upload_id, upload_offset, request.stream())
+    except ClientDisconnect:
+        # Bytes received before the disconnect are kept; nobody reads this response
+        return Response(status_code=400)
+    return Response(status_code=204, headers={"Upload-Offset": str(offset)})
+
+@router.post("/{upload_id}/complete", response_model=Document)
+async def complete_upload(upload_id: str, db: Session = Depends(get_db)):
+    """
+    Finalize a fully received upload into a document
+
+    Args:
+        upload_id: Upload session identifier
+        db: Database session dependency
+
+    Returns:
+        Created document object
+    """
+    return await upload_sessions.complete(db, upload_id)
+
+@router.delete("/{upload_id}")
+async def abort_upload(upload_id: str):
+    """
+    Abandon an upload and discard the bytes received so far
+
+    Args:
+        upload_id: Upload session identifier
+
+    Returns:
+        Success message
+
+    Raises:
+        HTTPException: If the upload is not found
+    """
+    if not await upload_sessions.abort(upload_id):
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return {"status": "success", "message": "Upload aborted successfully"}
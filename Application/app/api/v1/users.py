@@ -12,15 +12,18 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.db.database import get_db
-from app.schemas.schemas import UserCreate, User, UserUpdate
+from app.core.config import settings
+from app.core.serialization import FastJSONResponse
+from app.db.batching import in_request_order
+from app.db.database import get_db, get_read_db
+from app.schemas.schemas import BatchGetItem, BatchGetRequest, UserCreate, User, UserUpdate
 from app.services import user_service
 
 # Initialize router
 router = APIRouter()
 
 @router.post("/", response_model=User)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: Session = Depends(get_db)):
     """
     Create a new user endpoint
     
@@ -31,13 +34,13 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     Returns:
         Created user object
     """
-    return user_service.create_user(db=db, user=user)
+    return await user_service.create_user(db=db, user=user)
 
 @router.get("/", response_model=List[User])
 def get_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Retrieve all users with pagination
@@ -50,10 +53,27 @@ def get_users(
     Returns:
         List of user objects
     """
+    if settings.FAST_LIST_RESPONSES:
+        return FastJSONResponse(user_service.get_user_rows(db, skip=skip, limit=limit))
     return user_service.get_users(db, skip=skip, limit=limit)
 
+@router.post("/batch-get", response_model=List[BatchGetItem[User]])
+def batch_get_users(request: BatchGetRequest, db: Session = Depends(get_read_db)):
+    """
+    Retrieve many users by ID in one request
+    
+    Args:
+        request: BatchGetRequest schema with the user IDs
+        db: Database session dependency
+    
+    Returns:
+        One entry per requested ID, in request order, marking IDs that were not found
+    """
+    found = user_service.get_users_by_ids(db, request.Ids)
+    return in_request_order(request.Ids, found)
+
 @router.get("/{user_id}", response_model=User)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, db: Session = Depends(get_read_db)):
     """
     Retrieve a specific user by ID
     
@@ -73,7 +93,7 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
     return db_user
 
 @router.put("/{user_id}", response_model=User)
-def update_user(
+async def update_user(
     user_id: int,
     user: UserUpdate,
     db: Session = Depends(get_db)
@@ -92,7 +112,7 @@ def update_user(
     Raises:
         HTTPException: If user is not found
     """
-    db_user = user_service.update_user(db, user_id=user_id, user=user)
+    db_user = await user_service.update_user(db, user_id=user_id, user=user)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
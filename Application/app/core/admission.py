@@ -0,0 +1,295 @@
+"""
+Admission Control
+
+This module bounds how much work each process accepts at once, including:
+- Separate concurrency budgets for uploads, reads, writes and admin jobs,
+  so a burst of one kind of request cannot starve the others
+- A bounded wait queue per budget; requests that cannot be queued, or wait
+  too long, are shed with 503 and a Retry-After based on the queue depth
+- Per-client token-bucket rate limiting answered with 429 and Retry-After
+- Admitted, shed, in-flight and queued counts exported at /metrics
+
+Requests are admitted before their body is read, so a shed upload costs
+nothing beyond its headers. Long-lived streams (/events, /changes) are not
+budgeted; they hold no database connection while they wait.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Pattern, Set, Tuple
+import asyncio
+import logging
+import math
+import re
+import time
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger('app')
+
+# Request classes, each with its own budget
+UPLOAD = "upload"
+READ = "read"
+WRITE = "write"
+ADMIN = "admin"
+
+ALL_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+# First matching rule wins; paths are relative to API_V1_STR, None means not budgeted
+ADMISSION_RULES: List[Tuple[Optional[str], Set[str], Pattern]] = [
+    (None, ALL_METHODS, re.compile(r"^/(events|changes)(/.*)?$")),
+    (UPLOAD, {"POST"}, re.compile(r"^/documents/?$")),
+    (UPLOAD, {"POST", "PUT", "PATCH"}, re.compile(r"^/uploads(/.*)?$")),
+    (ADMIN, {"GET"}, re.compile(r"^/documents/(export|duplicates)$")),
+    (ADMIN, {"POST", "DELETE"}, re.compile(r"^/tags/assignments$")),
+    (ADMIN, {"POST", "DELETE"}, re.compile(r"^/topics/\d+/documents$")),
+    (ADMIN, {"POST"}, re.compile(r"^/topics/\d+/move$")),
+    (READ, {"GET", "HEAD", "OPTIONS"}, re.compile(r"")),
+    (READ, {"POST"}, re.compile(r"/(batch-get|neighbors)$")),
+    (WRITE, ALL_METHODS, re.compile(r"")),
+]
+
+def classify(method: str, path: str) -> Optional[str]:
+    """
+    Find the budget a request is admitted against
+
+    Args:
+        method: HTTP method
+        path: Request path
+
+    Returns:
+        str: Request class, or None for requests that are not budgeted
+    """
+    if not path.startswith(settings.API_V1_STR):
+        return None
+    path = path[len(settings.API_V1_STR):]
+    for request_class, methods, pattern in ADMISSION_RULES:
+        if method in methods and pattern.search(path):
+            return request_class
+    return None
+
+class Shed(Exception):
+    """Raised when a request is refused; carries the reason and a retry hint"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+class Budget:
+    """
+    Concurrency limit with a bounded FIFO wait queue
+
+    Slots are handed directly to the oldest waiter on release, so queued
+    requests are admitted in arrival order and never overtaken.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Moving average of how long admitted requests hold a slot
+        self._service_seconds = 0.1
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until a new request could expect a slot at the current queue depth"""
+        return max(1, math.ceil(self._service_seconds * (self.queued + 1) / self.limit))
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting in the queue if none is free
+
+        Raises:
+            Shed: If the queue is full or the wait exceeds the queue timeout
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            raise Shed("queue_full", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # Shielded so a timeout never cancels a slot that is being handed over
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                return
+            self._waiters.remove(waiter)
+            waiter.cancel()
+            raise Shed("timeout", self.retry_after())
+        except asyncio.CancelledError:
+            # The client went away while queued
+            if waiter.done():
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+                waiter.cancel()
+            raise
+
+    def release(self, held_seconds: Optional[float] = None) -> None:
+        """
+        Return a slot, handing it to the oldest waiter if there is one
+
+        Args:
+            held_seconds: How long the slot was held, for Retry-After estimates
+        """
+        if held_seconds is not None:
+            self._service_seconds += (held_seconds - self._service_seconds) * 0.1
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+class RateLimiter:
+    """Token bucket per client, refilled at a steady rate up to a burst size"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def take(self, client: str) -> float:
+        """
+        Spend one token for a client
+
+        Args:
+            client: Client identity
+
+        Returns:
+            float: 0 if the request may proceed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = [float(self.burst), now]
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+class AdmissionController:
+    """Budgets, rate limiter and metrics for one process"""
+
+    def __init__(self, budgets: Dict[str, Budget], rate_limiter: Optional[RateLimiter]):
+        self.budgets = budgets
+        self.rate_limiter = rate_limiter
+        self.admitted = metrics.register(metrics.Counter(
+            "dms_admission_admitted_total", "Requests admitted", ["class"]
+        ))
+        self.shed = metrics.register(metrics.Counter(
+            "dms_admission_shed_total", "Requests refused by admission control", ["class", "reason"]
+        ))
+        metrics.register(metrics.Gauge(
+            "dms_admission_in_flight", "Requests holding a slot", ["class"],
+            lambda: {(name,): budget.in_flight for name, budget in self.budgets.items()}
+        ))
+        metrics.register(metrics.Gauge(
+            "dms_admission_queued", "Requests waiting for a slot", ["class"],
+            lambda: {(name,): budget.queued for name, budget in self.budgets.items()}
+        ))
+        metrics.register(metrics.Gauge(
+            "dms_admission_limit", "Concurrent requests allowed", ["class"],
+            lambda: {(name,): budget.limit for name, budget in self.budgets.items()}
+        ))
+
+def _client_key(scope: Scope) -> str:
+    if settings.RATE_LIMIT_CLIENT_HEADER:
+        header = settings.RATE_LIMIT_CLIENT_HEADER.lower().encode()
+        for name, value in scope.get("headers", []):
+            if name == header:
+                # Proxies append; the first address is the original client
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+def _refuse(status_code: int, detail: str, retry_after: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": detail},
+        headers={"Retry-After": str(retry_after)}
+    )
+
+class AdmissionControlMiddleware:
+    """ASGI middleware admitting each HTTP request against its class's budget"""
+
+    def __init__(self, app: ASGIApp, controller: "AdmissionController"):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_class = classify(scope["method"], scope["path"])
+        if request_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        if controller.rate_limiter is not None:
+            wait = controller.rate_limiter.take(_client_key(scope))
+            if wait:
+                controller.shed.inc(request_class, "rate_limited")
+                response = _refuse(429, "Rate limit exceeded", math.ceil(wait))
+                await response(scope, receive, send)
+                return
+
+        budget = controller.budgets[request_class]
+        try:
+            await budget.acquire()
+        except Shed as e:
+            controller.shed.inc(request_class, e.reason)
+            logger.warning(f"Shed {request_class} request ({e.reason}): {scope['method']} {scope['path']}")
+            response = _refuse(503, "Server busy, retry later", e.retry_after)
+            await response(scope, receive, send)
+            return
+
+        controller.admitted.inc(request_class)
+        started = time.monotonic()
+        try:
+            # The slot is held until the response, including any streamed body, is sent
+            await self.app(scope, receive, send)
+        finally:
+            budget.release(time.monotonic() - started)
+
+def build_controller() -> AdmissionController:
+    """Create the controller from the ADMISSION_* and RATE_LIMIT_* settings"""
+    timeout = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+    budgets = {
+        UPLOAD: Budget(UPLOAD, settings.ADMISSION_UPLOAD_CONCURRENCY, settings.ADMISSION_UPLOAD_QUEUE, timeout),
+        READ: Budget(READ, settings.ADMISSION_READ_CONCURRENCY, settings.ADMISSION_READ_QUEUE, timeout),
+        WRITE: Budget(WRITE, settings.ADMISSION_WRITE_CONCURRENCY, settings.ADMISSION_WRITE_QUEUE, timeout),
+        ADMIN: Budget(ADMIN, settings.ADMISSION_ADMIN_CONCURRENCY, settings.ADMISSION_ADMIN_QUEUE, timeout),
+    }
+    rate_limiter = None
+    if settings.RATE_LIMIT_PER_SECOND > 0:
+        rate_limiter = RateLimiter(
+            settings.RATE_LIMIT_PER_SECOND,
+            settings.RATE_LIMIT_BURST,
+            settings.RATE_LIMIT_MAX_CLIENTS
+        )
+    return AdmissionController(budgets, rate_limiter)
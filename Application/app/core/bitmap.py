@@ -0,0 +1,222 @@
+"""
+Compressed Integer Bitmaps
+
+This module implements a roaring-style bitmap for sets of document IDs, including:
+- 65536-value chunks keyed by the high 16 bits of each ID
+- Sorted 16-bit arrays for sparse chunks and dense bitsets for full ones
+- Set algebra (AND, OR, AND NOT) evaluated chunk by chunk
+- Ordered iteration for paging through results
+
+Dense chunks are Python integers used as 65536-bit sets, so intersections
+and unions of large tags run in C rather than per document.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from array import array
+from bisect import bisect_left
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Union
+
+# Chunks with more values than this are stored as bitsets (the roaring cut-over)
+ARRAY_MAX = 4096
+CHUNK_BYTES = 65536 // 8
+
+Container = Union[array, int]
+
+# Bit positions set in each byte value, used to expand bitsets quickly
+_BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+def _popcount(bits: int) -> int:
+    return bits.bit_count() if hasattr(bits, "bit_count") else bin(bits).count("1")
+
+def _array_to_bits(values: array) -> int:
+    buffer = bytearray(CHUNK_BYTES)
+    for value in values:
+        buffer[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(buffer, "little")
+
+def _bits_to_values(bits: int) -> Iterator[int]:
+    for index, byte in enumerate(bits.to_bytes(CHUNK_BYTES, "little")):
+        if byte:
+            base = index << 3
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+def _size(container: Container) -> int:
+    return _popcount(container) if isinstance(container, int) else len(container)
+
+def _normalize(container: Container):
+    """Pick the cheaper representation; None for an empty chunk"""
+    if isinstance(container, int):
+        if not container:
+            return None
+        if _popcount(container) <= ARRAY_MAX:
+            return array("H", _bits_to_values(container))
+        return container
+    if not container:
+        return None
+    if len(container) > ARRAY_MAX:
+        return _array_to_bits(container)
+    return container
+
+def _filter(values: array, bits: int, keep: bool) -> array:
+    """Values whose bit in a bitset is set (keep=True) or clear (keep=False)"""
+    data = bits.to_bytes(CHUNK_BYTES, "little")
+    return array("H", [
+        value for value in values
+        if bool(data[value >> 3] >> (value & 7) & 1) is keep
+    ])
+
+def _and(a: Container, b: Container):
+    if isinstance(a, int) and isinstance(b, int):
+        return _normalize(a & b)
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return _normalize(_filter(a, b, True))
+    return _normalize(array("H", sorted(set(a).intersection(b))))
+
+def _or(a: Container, b: Container):
+    if isinstance(a, int) or isinstance(b, int):
+        a_bits = a if isinstance(a, int) else _array_to_bits(a)
+        b_bits = b if isinstance(b, int) else _array_to_bits(b)
+        return a_bits | b_bits
+    return _normalize(array("H", sorted(set(a).union(b))))
+
+def _andnot(a: Container, b: Container):
+    if isinstance(a, int):
+        return _normalize(a & ~(b if isinstance(b, int) else _array_to_bits(b)))
+    if isinstance(b, int):
+        return _normalize(_filter(a, b, False))
+    return _normalize(array("H", sorted(set(a).difference(b))))
+
+class RoaringBitmap:
+    """Set of non-negative integers stored as compressed 16-bit chunks"""
+
+    __slots__ = ("_containers",)
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._containers: Dict[int, Container] = {}
+        self.update(values)
+
+    @classmethod
+    def _from_containers(cls, containers: Dict[int, Container]) -> "RoaringBitmap":
+        bitmap = cls()
+        bitmap._containers = containers
+        return bitmap
+
+    def update(self, values: Iterable[int]) -> None:
+        """Add many values, grouping them by chunk first"""
+        groups: Dict[int, List[int]] = {}
+        for value in values:
+            groups.setdefault(value >> 16, []).append(value & 0xFFFF)
+        for key, lows in groups.items():
+            incoming = _normalize(array("H", sorted(set(lows))))
+            existing = self._containers.get(key)
+            self._containers[key] = incoming if existing is None else _or(existing, incoming)
+
+    def add(self, value: int) -> None:
+        key, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(key)
+        if container is None:
+            self._containers[key] = array("H", [low])
+        elif isinstance(container, int):
+            self._containers[key] = container | (1 << low)
+        else:
+            position = bisect_left(container, low)
+            if position == len(container) or container[position] != low:
+                container.insert(position, low)
+                if len(container) > ARRAY_MAX:
+                    self._containers[key] = _array_to_bits(container)
+
+    def discard(self, value: int) -> None:
+        key, low = value >> 16, value & 0xFFFF
+        container = self._containers.get(key)
+        if container is None:
+            return
+        if isinstance(container, int):
+            container = _normalize(container & ~(1 << low))
+        else:
+            position = bisect_left(container, low)
+            if position < len(container) and container[position] == low:
+                del container[position]
+            container = _normalize(container)
+        if container is None:
+            del self._containers[key]
+        else:
+            self._containers[key] = container
+
+    def difference_update(self, values: Iterable[int]) -> None:
+        """Remove many values"""
+        for value in values:
+            self.discard(value)
+
+    def __contains__(self, value: int) -> bool:
+        container = self._containers.get(value >> 16)
+        if container is None:
+            return False
+        low = value & 0xFFFF
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        position = bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def __len__(self) -> int:
+        return sum(_size(container) for container in self._containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._containers)
+
+    def __iter__(self) -> Iterator[int]:
+        for key in sorted(self._containers):
+            base = key << 16
+            container = self._containers[key]
+            values = _bits_to_values(container) if isinstance(container, int) else container
+            for low in values:
+                yield base + low
+
+    def __and__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        result = {}
+        for key in self._containers.keys() & other._containers.keys():
+            container = _and(self._containers[key], other._containers[key])
+            if container is not None:
+                result[key] = container
+        return self._from_containers(result)
+
+    def __or__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        result = self.copy()._containers
+        for key, container in other._containers.items():
+            existing = result.get(key)
+            result[key] = container if existing is None else _or(existing, container)
+        return self._from_containers(result)
+
+    def __sub__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        result = {}
+        for key, container in self._containers.items():
+            if key in other._containers:
+                container = _andnot(container, other._containers[key])
+            if container is not None:
+                result[key] = container
+        return self._from_containers(result)
+
+    def copy(self) -> "RoaringBitmap":
+        # Arrays are mutated in place by add/discard; ints are immutable
+        return self._from_containers({
+            key: container if isinstance(container, int) else array("H", container)
+            for key, container in self._containers.items()
+        })
+
+    def page(self, skip: int, limit: int) -> List[int]:
+        """
+        Return a slice of the values in ascending order
+
+        Args:
+            skip: Number of values to skip
+            limit: Maximum number of values to return
+
+        Returns:
+            List[int]: The requested values
+        """
+        return list(islice(iter(self), skip, skip + limit))
@@ -5,7 +5,7 @@ This module configures the application's logging system, including:
 - File and console logging handlers
 - Log rotation settings
 - Log formatting
-- Directory structure setup
+- Directory structure setup on first configuration
 
 Author: Marco Alejandro Santiago
 Created: February 7, 2025
@@ -15,27 +15,34 @@ import logging
 import os
 from logging.handlers import RotatingFileHandler
 
-# Create logs directory if it doesn't exist
-os.makedirs('logs', exist_ok=True)
-
 def setup_logging():
     """
     Configure and initialize the application logging system.
     
+    Called from the application lifespan rather than at import, so importing
+    the application creates no files. Safe to call more than once.
+    
     Returns:
         logger: Configured logging instance with both file and console handlers
     """
     # Initialize application logger
     logger = logging.getLogger('app')
     logger.setLevel(logging.INFO)
+    if getattr(logger, "_dms_configured", False):
+        return logger
+
+    # Create logs directory if it doesn't exist
+    os.makedirs('logs', exist_ok=True)
 
     # Configure rotating file handler
     # - Rotates log files when size reaches 1MB
     # - Keeps up to 5 backup files
+    # - Opens the file on the first record
     file_handler = RotatingFileHandler(
         'logs/app.log', 
         maxBytes=1024 * 1024,  # 1MB
-        backupCount=5
+        backupCount=5,
+        delay=True
     )
     
     # Configure console handler for terminal output
@@ -54,5 +61,6 @@ def setup_logging():
     # Attach both handlers to logger
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
+    logger._dms_configured = True
 
     return logger
\ No newline at end of file
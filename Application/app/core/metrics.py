@@ -0,0 +1,96 @@
+"""
+Process Metrics
+
+This module keeps in-process counters and gauges and renders them in the
+Prometheus text exposition format served at /metrics, including:
+- Counters with labels, incremented from request handlers and middleware
+- Gauges whose value is read from a callback when metrics are scraped
+
+Each worker process reports its own values; the scraper sums across them.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from threading import Lock
+from typing import Callable, Dict, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: LabelValues) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+class Counter:
+    """Monotonically increasing value per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self) -> List[Tuple[LabelValues, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+class Gauge:
+    """Current value per label combination, read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Dict[LabelValues, float]]
+    ):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def samples(self) -> List[Tuple[LabelValues, float]]:
+        return list(self.collect().items())
+
+_registry: Dict[str, object] = {}
+
+def register(metric):
+    """
+    Add a metric to /metrics; registering the same name again replaces it
+
+    Args:
+        metric: Counter or Gauge
+
+    Returns:
+        The metric, so modules can register at definition time
+    """
+    _registry[metric.name] = metric
+    return metric
+
+def render() -> str:
+    """
+    Render every registered metric
+
+    Returns:
+        str: Prometheus text exposition format (version 0.0.4)
+    """
+    lines = []
+    for metric in _registry.values():
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for labelvalues, value in metric.samples():
+            lines.append(f"{metric.name}{_labels(metric.labelnames, labelvalues)} {value:g}")
+    return "\n".join(lines) + "\n"
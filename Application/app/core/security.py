@@ -0,0 +1,203 @@
+"""
+Password Hashing and Access Tokens
+
+This module keeps bcrypt work off the request handlers and issues signed tokens, including:
+- A bounded process pool running bcrypt hash and verify
+- A concurrency limit so provisioning bursts queue instead of piling up
+- Detection of hashes that need upgrading after BCRYPT_ROUNDS changes
+- A short-lived cache of recently verified credentials (HMAC digests only)
+- Signed JWT access tokens so authenticated requests skip bcrypt entirely
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import atexit
+import hashlib
+import hmac
+import os
+import time
+
+from app.core.config import settings
+
+@lru_cache()
+def _crypt_context(rounds: int):
+    """Build the passlib context inside the process that uses it"""
+    # Imported here so bcrypt is only loaded by the hashing workers
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+def _hash_password(password: str, rounds: int) -> str:
+    return _crypt_context(rounds).hash(password)
+
+def _verify_password(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    # verify_and_update returns a replacement hash when the stored one uses outdated settings
+    return _crypt_context(rounds).verify_and_update(password, hashed_password)
+
+class PasswordHasher:
+    """Runs bcrypt in worker processes with a cap on admitted calls"""
+
+    def __init__(self, workers: int, concurrency: int, rounds: int):
+        self.workers = workers
+        self.rounds = rounds
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = Lock()
+        self._dummy_hash: Optional[str] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            # A pool inherited across fork belongs to the parent process
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                self._pid = os.getpid()
+            return self._executor
+
+    async def _run(self, func, *args):
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password using bcrypt
+
+        Args:
+            password: Plain text password to hash
+
+        Returns:
+            str: Hashed password
+        """
+        return await self._run(_hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password against a stored hash
+
+        Args:
+            password: Plain text password
+            hashed_password: Stored bcrypt hash
+
+        Returns:
+            tuple: (matches, replacement hash when the stored hash needs upgrading)
+        """
+        return await self._run(_verify_password, password, hashed_password, self.rounds)
+
+    async def verify_dummy(self, password: str) -> None:
+        """Spend the same time as a real verify, for unknown usernames"""
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash("dummy-password")
+        await self.verify(password, self._dummy_hash)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+class VerifiedCredentialCache:
+    """
+    Remembers credentials that recently passed bcrypt verification
+
+    Entries are keyed by an HMAC of username, password and stored hash, so
+    no password is kept in memory and a password change invalidates entries.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(username: str, password: str, hashed_password: str) -> bytes:
+        message = "\0".join((username, password, hashed_password)).encode()
+        return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).digest()
+
+    def check(self, username: str, password: str, hashed_password: str) -> bool:
+        """Return True if these credentials were verified within the TTL"""
+        if self.ttl_seconds <= 0:
+            return False
+        key = self._key(username, password, hashed_password)
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, username: str, password: str, hashed_password: str) -> None:
+        """Record credentials that just passed verification"""
+        if self.ttl_seconds <= 0:
+            return
+        key = self._key(username, password, hashed_password)
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl_seconds
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+def create_access_token(subject: Any, expires_delta: Optional[timedelta] = None) -> str:
+    """
+    Issue a signed access token
+
+    Args:
+        subject: Token subject (the user ID)
+        expires_delta: Lifetime, defaults to ACCESS_TOKEN_EXPIRE_MINUTES
+
+    Returns:
+        str: Encoded JWT
+    """
+    # Imported on first use: python-jose pulls in the cryptography backends
+    from jose import jwt
+
+    expires = datetime.utcnow() + (
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return jwt.encode(
+        {"sub": str(subject), "exp": expires},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM
+    )
+
+def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Validate a token's signature and expiry
+
+    Args:
+        token: Encoded JWT
+
+    Returns:
+        dict: Token claims, or None if the token is invalid or expired
+    """
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+
+# Process-wide instances
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    concurrency=settings.PASSWORD_HASH_CONCURRENCY,
+    rounds=settings.BCRYPT_ROUNDS
+)
+credential_cache = VerifiedCredentialCache(
+    ttl_seconds=settings.CREDENTIAL_CACHE_TTL_SECONDS,
+    max_entries=settings.CREDENTIAL_CACHE_SIZE
+)
+atexit.register(password_hasher.shutdown)
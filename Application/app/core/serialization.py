@@ -0,0 +1,69 @@
+"""
+Fast Response Serialization
+
+This module provides the encoding side of the fast list response path, including:
+- A JSON encoder that uses orjson when installed and the standard library otherwise
+- A response class for bodies that are already encoded
+- Derivation of the database columns behind a response schema
+
+Rows fetched as plain tuples and encoded here skip per-row Pydantic model
+construction and validation, while producing the same JSON the schemas do.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from datetime import date, datetime
+from typing import Any, List, Type
+import json
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode a JSON-compatible structure (datetimes allowed) to bytes
+
+    Args:
+        content: Lists, dicts and scalars to encode
+
+    Returns:
+        bytes: Compact UTF-8 JSON
+    """
+    if orjson is not None:
+        # Naive datetimes encode as isoformat(), matching Pydantic's output
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+class FastJSONResponse(Response):
+    """JSON response that accepts pre-encoded bytes or encodes with dumps()"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+def schema_columns(schema: Type[BaseModel], model: Any) -> List[str]:
+    """
+    List the schema fields that are plain columns of a model, in schema order
+
+    Args:
+        schema: Response schema
+        model: SQLAlchemy model class backing the schema
+
+    Returns:
+        List[str]: Field names that can be selected directly
+    """
+    columns = model.__table__.columns.keys()
+    return [name for name in schema.model_fields if name in columns]
@@ -0,0 +1,168 @@
+"""
+Production Server
+
+This module runs the application in several worker processes, including:
+- Worker count sized to the CPUs available to this process
+- One listening socket bound before forking and shared by every worker
+- Preloading the application in the parent so workers share its memory
+  copy-on-write
+- Supervision: workers that exit unexpectedly are replaced, and SIGTERM or
+  SIGINT stops every worker gracefully
+- A worker channel directory so per-worker caches stay coherent
+
+Each worker runs its own uvicorn server and application lifespan, so
+database pools, background tasks and worker pools are created after the
+fork. Platforms without os.fork (Windows) run a single process.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+import gc
+import logging
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger('app')
+
+def default_workers() -> int:
+    """One worker per CPU this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+def _bind(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+class Supervisor:
+    """Forks the workers, replaces those that die and stops them all on a signal"""
+
+    def __init__(self, sock: socket.socket, workers: int, app, restart_delay: float, channel_dir: Path):
+        self.sock = sock
+        self.workers = workers
+        self.app = app
+        self.restart_delay = restart_delay
+        self.channel_dir = channel_dir
+        self.children: Dict[int, float] = {}  # pid -> start time
+        self.stopping = False
+
+    def _run_worker(self) -> None:
+        import uvicorn
+
+        # uvicorn installs its own handlers for a graceful shutdown
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        config = uvicorn.Config(self.app)
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                self._run_worker()
+            except BaseException:
+                logger.exception("Worker crashed")
+                status = 1
+            finally:
+                os._exit(status)
+        self.children[pid] = time.monotonic()
+
+    def stop(self, signum=None, frame=None) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.workers):
+            self.spawn()
+        logger.info(f"Serving with {self.workers} workers (pids {', '.join(map(str, self.children))})")
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self.children.pop(pid, None)
+            # A killed worker leaves its channel socket behind
+            try:
+                (self.channel_dir / f"{pid}.sock").unlink()
+            except FileNotFoundError:
+                pass
+            if started is None or self.stopping:
+                continue
+            logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; replacing it")
+            # Do not fork in a tight loop when workers die at startup
+            if time.monotonic() - started < self.restart_delay:
+                time.sleep(self.restart_delay)
+            if not self.stopping:
+                self.spawn()
+
+def serve(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    preload: Optional[bool] = None
+) -> None:
+    """
+    Serve the application until SIGTERM or SIGINT
+
+    Args:
+        host: Address to listen on (defaults to WEB_HOST)
+        port: Port to listen on (defaults to WEB_PORT)
+        workers: Worker processes (defaults to WEB_WORKERS, 0 meaning one per CPU)
+        preload: Import the application before forking (defaults to WEB_PRELOAD)
+    """
+    from app.core.logging import setup_logging
+    from app.core.worker_channel import worker_channel
+
+    setup_logging()
+    host = host or settings.WEB_HOST
+    port = port if port is not None else settings.WEB_PORT
+    workers = workers or settings.WEB_WORKERS or default_workers()
+    preload = settings.WEB_PRELOAD if preload is None else preload
+
+    if workers == 1 or not hasattr(os, "fork"):
+        import uvicorn
+
+        uvicorn.run("app.main:app", host=host, port=port, backlog=settings.WEB_BACKLOG)
+        return
+
+    created = None
+    if not settings.WORKER_CHANNEL_DIR:
+        created = tempfile.mkdtemp(prefix="dms-workers-")
+        settings.WORKER_CHANNEL_DIR = created
+    worker_channel.directory = Path(settings.WORKER_CHANNEL_DIR)
+
+    sock = _bind(host, port, settings.WEB_BACKLOG)
+    try:
+        if preload:
+            from app.main import app
+            # Keep the collector from touching (and so copying) the preloaded objects in every worker
+            gc.freeze()
+        else:
+            app = "app.main:app"
+        Supervisor(sock, workers, app, settings.WEB_RESTART_DELAY_SECONDS, worker_channel.directory).run()
+    finally:
+        sock.close()
+        if created:
+            shutil.rmtree(created, ignore_errors=True)
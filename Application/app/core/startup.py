@@ -0,0 +1,95 @@
+"""
+Startup Profiling and Deferred Imports
+
+This module keeps process start cheap and measurable, including:
+- defer_import, declaring heavy libraries that a few code paths import on
+  first use, so prewarming can load them before the first request
+- A startup profile timing the import of the application and each phase
+  of the lifespan, logged once ready and exported at /metrics
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+import importlib.util
+import logging
+import sys
+import time
+
+from app.core import metrics
+
+logger = logging.getLogger('app')
+
+# Heavy modules their users import on first use, loaded or not
+_deferred: List[str] = []
+
+def defer_import(name: str) -> None:
+    """
+    Declare a heavy module that is imported inside the functions using it
+
+    The module is not imported now. Prewarming imports it ahead of the
+    first request. A plain import statement is thread-safe; a lazy module
+    object (importlib.util.LazyLoader) is not, so modules used from worker
+    threads are never handed out half-loaded.
+
+    Args:
+        name: Absolute module name, e.g. "numpy"
+
+    Raises:
+        ModuleNotFoundError: If the module is not installed (checked now, not on first use)
+    """
+    if name not in sys.modules and importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    if name not in _deferred:
+        _deferred.append(name)
+
+def load_deferred() -> List[str]:
+    """
+    Import every module declared with defer_import
+
+    Returns:
+        list: Names of the deferred modules
+    """
+    for name in _deferred:
+        importlib.import_module(name)
+    return list(_deferred)
+
+class StartupProfile:
+    """Durations of the steps between process start and serving the first request"""
+
+    def __init__(self):
+        # Phase name -> seconds, in the order first recorded
+        self.phases: Dict[str, float] = {}
+        self._gauge = metrics.register(metrics.Gauge(
+            "dms_startup_seconds", "Time spent in each startup phase", ["phase"],
+            lambda: {(name,): seconds for name, seconds in self.phases.items()}
+        ))
+
+    def record(self, name: str, seconds: float) -> None:
+        """Set a phase's duration; a repeated phase (e.g. a restarted lifespan) replaces the last"""
+        self.phases[name] = seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def report(self) -> Dict[str, float]:
+        """Seconds per phase, plus the total"""
+        report = dict(self.phases)
+        report["total"] = sum(self.phases.values())
+        return report
+
+    def log(self) -> None:
+        report = self.report()
+        phases = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items())
+        logger.info(f"Ready in {report['total'] * 1000:.0f} ms ({phases})")
+
+# Process-wide profile
+startup_profile = StartupProfile()
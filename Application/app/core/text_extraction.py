@@ -0,0 +1,241 @@
+"""
+Text Extraction
+
+This module turns stored document content into plain text, including:
+- Format detection from leading bytes, falling back on the declared FileType
+- Extractors for PDF (PyPDF2), DOCX (python-docx), HTML and plain text
+- The loop run by each extraction worker process, which reads the file
+  itself and reports text, "unsupported" or an error back over a pipe
+
+Workers are separate processes so a pathological file can be killed on a
+timeout and cannot take the API process down with it. This module imports
+nothing heavy at module level; parsers load on first use in the worker.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+import codecs
+import io
+import os
+import zipfile
+
+# Extraction formats
+PDF = "pdf"
+DOCX = "docx"
+HTML = "html"
+TEXT = "text"
+
+# Result statuses sent back by a worker
+STATUS_OK = "ok"
+STATUS_UNSUPPORTED = "unsupported"
+STATUS_ERROR = "error"
+STATUS_MISSING = "missing"
+
+_PDF_TYPES = {"pdf", "application/pdf"}
+_DOCX_TYPES = {"docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+_HTML_TYPES = {"html", "htm", "xhtml", "text/html", "application/xhtml+xml"}
+_TEXT_TYPES = {"txt", "text", "csv", "md", "json", "xml", "log", "text/plain", "text/csv", "text/markdown"}
+
+# Elements whose content is never visible text
+_HTML_SKIPPED = {"script", "style", "template", "noscript", "head"}
+# Elements that start a new line of text
+_HTML_BLOCKS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+    "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}
+
+class UnsupportedFormat(Exception):
+    """Raised for content none of the extractors can read"""
+
+def _declared_type(file_type: Optional[str]) -> str:
+    return (file_type or "").strip().lower().lstrip(".")
+
+def detect_format(data: bytes, file_type: Optional[str] = None) -> Optional[str]:
+    """
+    Work out which extractor can read some content
+
+    Args:
+        data: Content, or at least its first few kilobytes
+        file_type: Declared FileType (extension or MIME type)
+
+    Returns:
+        str: One of PDF, DOCX, HTML or TEXT, or None if none applies
+    """
+    declared = _declared_type(file_type)
+    if data.startswith(b"%PDF-") or (declared in _PDF_TYPES and b"%PDF-" in data[:1024]):
+        return PDF
+    if data.startswith(b"PK\x03\x04"):
+        # Any zip could be declared .docx; the extractor checks for word/document.xml
+        return DOCX if declared in _DOCX_TYPES or b"word/" in data[:4096] else None
+    head = data[:1024].lstrip(codecs.BOM_UTF8).lstrip().lower()
+    if declared in _HTML_TYPES or head.startswith((b"<!doctype html", b"<html")):
+        return HTML
+    if declared in _TEXT_TYPES or _decode(data[:8192], strict=True) is not None:
+        return TEXT
+    return None
+
+def _decode(data: bytes, strict: bool = False) -> Optional[str]:
+    """Decode UTF-8 (with or without BOM); non-strict falls back to Windows-1252"""
+    if b"\x00" in data[:8192]:
+        return None if strict else data.decode("utf-8", errors="replace").replace("\x00", "")
+    try:
+        # Incremental, so a character cut off at the end of a prefix is not an error
+        return codecs.getincrementaldecoder("utf-8-sig")().decode(data, final=False)
+    except UnicodeDecodeError:
+        return None if strict else data.decode("cp1252", errors="replace")
+
+class _TextCollector(HTMLParser):
+    """Collects the visible text of an HTML document"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _HTML_SKIPPED:
+            self._skipping += 1
+        elif tag in _HTML_BLOCKS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _HTML_SKIPPED:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in _HTML_BLOCKS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+def extract_html(data: bytes) -> str:
+    collector = _TextCollector()
+    collector.feed(_decode(data))
+    collector.close()
+    lines = (" ".join(line.split()) for line in "".join(collector.parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+def extract_pdf(data: bytes) -> str:
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    if reader.is_encrypted:
+        # Many PDFs are "encrypted" with an empty user password
+        reader.decrypt("")
+    return "\n\n".join((page.extract_text() or "").strip() for page in reader.pages).strip()
+
+def extract_docx(data: bytes) -> str:
+    import docx
+
+    try:
+        document = docx.Document(io.BytesIO(data))
+    except (KeyError, ValueError, zipfile.BadZipFile):
+        raise UnsupportedFormat("not a Word document")
+    parts = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            parts.append("\t".join(cell.text for cell in row.cells))
+    return "\n".join(part for part in parts if part.strip())
+
+def extract_plain(data: bytes) -> str:
+    return _decode(data)
+
+_EXTRACTORS = {
+    PDF: extract_pdf,
+    DOCX: extract_docx,
+    HTML: extract_html,
+    TEXT: extract_plain,
+}
+
+def extract_text(data: bytes, file_type: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Extract the plain text of some content
+
+    Args:
+        data: Whole file content
+        file_type: Declared FileType
+
+    Returns:
+        tuple: (format, text)
+
+    Raises:
+        UnsupportedFormat: If no extractor applies
+    """
+    content_format = detect_format(data, file_type)
+    if content_format is None:
+        raise UnsupportedFormat(f"unrecognised content (FileType {file_type!r})")
+    return content_format, _EXTRACTORS[content_format](data)
+
+def limit_memory(extra_bytes: int) -> None:
+    """
+    Cap this process's address space at its current size plus extra_bytes
+
+    Relative to the current size because a spawned worker already maps the
+    interpreter and its imports. Only available where the resource module
+    exists (not Windows); elsewhere the timeout is the only guard.
+    """
+    try:
+        import resource
+    except ImportError:
+        return
+    try:
+        with open("/proc/self/statm") as statm:
+            current = int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Without a baseline a limit could sit below what is already mapped
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + extra_bytes
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+def _read(location: str, max_bytes: int) -> bytes:
+    from app.storage import resolve
+
+    backend, key = resolve(location)
+    size = backend.size(key)
+    if size > max_bytes:
+        raise ValueError(f"file is {size} bytes, over the {max_bytes} byte extraction limit")
+    return b"".join(backend.read(key))
+
+def worker_main(conn, memory_bytes: int, max_input_bytes: int) -> None:
+    """
+    Serve extraction requests until told to stop
+
+    Each request is a (location, file_type) tuple; None ends the loop. Each
+    reply is (status, format, text_or_error).
+
+    Args:
+        conn: Worker end of a multiprocessing pipe
+        memory_bytes: Address space the worker may grow by (0 for no limit)
+        max_input_bytes: Largest file the worker will read
+    """
+    if memory_bytes:
+        limit_memory(memory_bytes)
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if task is None:
+            return
+        location, file_type = task
+        try:
+            content_format, text = extract_text(_read(location, max_input_bytes), file_type)
+            reply = (STATUS_OK, content_format, text.replace("\x00", ""))
+        except UnsupportedFormat as e:
+            reply = (STATUS_UNSUPPORTED, None, str(e))
+        except FileNotFoundError:
+            reply = (STATUS_MISSING, None, "stored file not found")
+        except MemoryError:
+            reply = (STATUS_ERROR, None, "memory limit exceeded")
+        except ImportError as e:
+            reply = (STATUS_ERROR, None, f"extractor not installed: {e.name}")
+        except Exception as e:
+            reply = (STATUS_ERROR, None, f"{type(e).__name__}: {e}")
+        conn.send(reply)
@@ -0,0 +1,177 @@
+"""
+Worker Invalidation Channel
+
+This module keeps per-process caches coherent when several worker processes
+serve the application, including:
+- One Unix datagram socket per worker under WORKER_CHANNEL_DIR
+- Publishing a small message to every other worker on the same host
+- Dispatching received messages to the handler subscribed to their topic
+
+Delivery is best effort: a message for a worker whose receive buffer is
+full is dropped and counted. Every subscribed cache also expires or
+rebuilds on its own interval, which bounds how long a lost message
+matters. Without WORKER_CHANNEL_DIR (a single process) publishing does
+nothing. Set by manage.py serve; set it yourself when running several
+workers under another process manager.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import json
+import logging
+import os
+import socket
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger('app')
+
+# Larger messages are rejected; publishers split their payloads below this
+MAX_MESSAGE_BYTES = 32 * 1024
+
+_SUFFIX = ".sock"
+
+class WorkerChannel:
+    """Broadcasts cache invalidations between worker processes of one host"""
+
+    def __init__(self, directory: Optional[str]):
+        self.directory = Path(directory) if directory else None
+        self._handlers: Dict[str, Callable[..., None]] = {}
+        self._lock = Lock()
+        self._sender: Optional[socket.socket] = None
+        self._receiver: Optional[socket.socket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+        self.messages = metrics.register(metrics.Counter(
+            "dms_worker_messages_total", "Invalidation messages between worker processes", ["result"]
+        ))
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None and hasattr(socket, "AF_UNIX")
+
+    def _path(self, pid: int) -> Path:
+        return self.directory / f"{pid}{_SUFFIX}"
+
+    def subscribe(self, topic: str, handler: Callable[..., None]) -> None:
+        """
+        Call handler(*args) for every message published on a topic by another worker
+
+        Handlers run on the event loop and must be quick.
+        """
+        self._handlers[topic] = handler
+
+    def start(self) -> None:
+        """Bind this worker's socket and start receiving on the running event loop"""
+        if not self.enabled or self._receiver is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(os.getpid())
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        receiver.bind(str(path))
+        receiver.setblocking(False)
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(receiver.fileno(), self._receive)
+        self._receiver = receiver
+
+    def stop(self) -> None:
+        """Stop receiving and remove this worker's socket"""
+        receiver, self._receiver = self._receiver, None
+        if receiver is None:
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.remove_reader(receiver.fileno())
+        receiver.close()
+        try:
+            self._path(os.getpid()).unlink()
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            sender, self._sender = self._sender, None
+        if sender is not None:
+            sender.close()
+
+    def _receive(self) -> None:
+        while self._receiver is not None:
+            try:
+                data = self._receiver.recv(MAX_MESSAGE_BYTES)
+            except (BlockingIOError, InterruptedError):
+                return
+            self.messages.inc("received")
+            try:
+                topic, args = json.loads(data)
+                handler = self._handlers.get(topic)
+                if handler is not None:
+                    handler(*args)
+            except Exception as e:
+                logger.error(f"Worker message could not be applied: {e}")
+
+    def _get_sender(self) -> socket.socket:
+        # Sockets inherited across fork are not shared with the parent; make our own
+        if self._sender is None or self._pid != os.getpid():
+            self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._sender.setblocking(False)
+            self._pid = os.getpid()
+        return self._sender
+
+    def publish(self, topic: str, *args: Any) -> int:
+        """
+        Send a message to every other worker; safe to call from any thread
+
+        Args:
+            topic: Subscribed topic
+            *args: JSON-serialisable arguments for the handler
+
+        Returns:
+            int: Number of workers the message was delivered to
+
+        Raises:
+            ValueError: If the encoded message exceeds MAX_MESSAGE_BYTES
+        """
+        if not self.enabled:
+            return 0
+        data = json.dumps([topic, args], separators=(",", ":")).encode()
+        if len(data) > MAX_MESSAGE_BYTES:
+            raise ValueError(f"Worker message of {len(data)} bytes exceeds {MAX_MESSAGE_BYTES}")
+        own = f"{os.getpid()}{_SUFFIX}"
+        try:
+            peers = [entry.path for entry in os.scandir(self.directory) if entry.name.endswith(_SUFFIX)]
+        except FileNotFoundError:
+            return 0
+        delivered = 0
+        with self._lock:
+            sender = self._get_sender()
+            for peer in peers:
+                if os.path.basename(peer) == own:
+                    continue
+                try:
+                    sender.sendto(data, peer)
+                    delivered += 1
+                except ConnectionRefusedError:
+                    # Left behind by a worker that exited without cleaning up
+                    try:
+                        os.unlink(peer)
+                    except FileNotFoundError:
+                        pass
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    # Receive buffer full (or, off Linux, a message over the datagram limit)
+                    self.messages.inc("dropped")
+                    logger.warning(f"Worker message on {topic!r} dropped for {peer}: {e}")
+        if delivered:
+            self.messages.inc("sent", amount=delivered)
+        return delivered
+
+# Process-wide channel
+worker_channel = WorkerChannel(settings.WORKER_CHANNEL_DIR)
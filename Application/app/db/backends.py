@@ -0,0 +1,467 @@
+"""
+Database Backend Abstraction
+
+This module isolates everything that differs between the supported database
+engines so the rest of the application can stay backend-neutral, including:
+- Backend selection from the configured database URL
+- Engine and connection pool options per backend
+- Schema mapping for the "dbo" schema used by the ORM models
+- Per-connection tuning (SQLite WAL and pragmas)
+- Bulk loading (PostgreSQL COPY, executemany elsewhere)
+- Counter upserts (ON CONFLICT, MERGE, or update-then-insert elsewhere)
+- Set-based row upserts (ON CONFLICT or multi-row MERGE, update-then-insert elsewhere)
+- Row locks held to the end of the transaction (FOR UPDATE or UPDLOCK)
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+import io
+
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.schema import Table
+
+from app.core.config import settings
+
+# Schema name used by the ORM models and migration scripts
+MODEL_SCHEMA = "dbo"
+
+class DatabaseBackend:
+    """Base backend with settings shared by every database engine"""
+    name = "generic"
+    default_schema: Optional[str] = None
+
+    def __init__(self, url: str):
+        self.url = make_url(url)
+
+    @property
+    def schema(self) -> Optional[str]:
+        """Schema the model schema is mapped to on this backend"""
+        return settings.DB_SCHEMA or self.default_schema
+
+    def schema_translate_map(self) -> Dict[str, Optional[str]]:
+        """
+        Map the "dbo" schema declared on the models to the backend schema
+
+        Returns:
+            dict: Translation map suitable for the schema_translate_map execution option
+        """
+        if self.schema == MODEL_SCHEMA:
+            return {}
+        return {MODEL_SCHEMA: self.schema}
+
+    def engine_options(self) -> Dict[str, Any]:
+        """
+        Keyword arguments passed to sqlalchemy.create_engine
+
+        Returns:
+            dict: Engine options for this backend
+        """
+        return {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+            "pool_pre_ping": True,
+        }
+
+    def configure_engine(self, engine: Engine) -> None:
+        """Attach backend specific event listeners to a newly created engine"""
+
+    def create_engine(self, url: Optional[str] = None) -> Engine:
+        """
+        Create an engine for this backend
+
+        Args:
+            url: Optional URL override (used for replicas of the same backend)
+
+        Returns:
+            Engine: Configured engine with the schema translation applied
+        """
+        engine = create_engine(
+            url or self.url,
+            echo=settings.DB_ECHO,
+            **self.engine_options()
+        )
+        self.configure_engine(engine)
+
+        translate_map = self.schema_translate_map()
+        if translate_map:
+            engine = engine.execution_options(schema_translate_map=translate_map)
+        return engine
+
+    def bulk_insert(self, connection: Connection, table: Table, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert many rows into a table as efficiently as the backend allows
+
+        Args:
+            connection: Open connection (inside the caller's transaction)
+            table: Target table
+            rows: Column/value dictionaries; every row must have the same keys
+
+        Returns:
+            int: Number of rows inserted
+        """
+        if not rows:
+            return 0
+        connection.execute(table.insert(), rows)
+        return len(rows)
+
+    def lock_rows(self, connection: Connection, table: Table, key_column: str, keys: List[Any]) -> None:
+        """
+        Lock rows until the end of the caller's transaction
+
+        Keys are locked in ascending order so concurrent transactions
+        asking for overlapping rows queue instead of deadlocking.
+
+        Args:
+            connection: Open connection (inside the caller's transaction)
+            table: Table holding the rows
+            key_column: Column the keys refer to
+            keys: Key values of the rows to lock
+        """
+        if not keys:
+            return
+        column = table.c[key_column]
+        connection.execute(
+            select(column).where(column.in_(keys)).order_by(column).with_for_update()
+        )
+
+    def add_to_counters(
+        self,
+        connection: Connection,
+        table: Table,
+        key_columns: List[str],
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Add to counter columns, creating rows that do not exist yet
+
+        Rows are applied in key order so concurrent transactions lock them
+        in the same order.
+
+        Args:
+            connection: Open connection (inside the caller's transaction)
+            table: Counter table
+            key_columns: Columns identifying a counter row
+            rows: Key values plus the amount to add to each other column
+        """
+        for row in sorted(rows, key=lambda row: [row[column] for column in key_columns]):
+            counters = [column for column in row if column not in key_columns]
+            result = connection.execute(
+                table.update()
+                .where(*(table.c[column] == row[column] for column in key_columns))
+                .values({column: table.c[column] + row[column] for column in counters})
+            )
+            if result.rowcount == 0:
+                connection.execute(table.insert(), [row])
+
+    def upsert_rows(
+        self,
+        connection: Connection,
+        table: Table,
+        key_columns: List[str],
+        rows: List[Dict[str, Any]],
+        update_columns: List[str]
+    ) -> int:
+        """
+        Insert rows, or update update_columns of the rows whose key already exists
+
+        Keys must be unique within rows. Rows are applied in key order so
+        concurrent transactions lock them in the same order.
+
+        Args:
+            connection: Open connection (inside the caller's transaction)
+            table: Target table, with a unique constraint on key_columns
+            key_columns: Columns identifying a row
+            rows: Column/value dictionaries; every row must have the same keys
+            update_columns: Columns overwritten when the row exists
+
+        Returns:
+            int: Number of rows written
+        """
+        for row in sorted(rows, key=lambda row: [row[column] for column in key_columns]):
+            result = connection.execute(
+                table.update()
+                .where(*(table.c[column] == row[column] for column in key_columns))
+                .values({column: row[column] for column in update_columns})
+            )
+            if result.rowcount == 0:
+                connection.execute(table.insert(), [row])
+        return len(rows)
+
+class MSSQLBackend(DatabaseBackend):
+    """Microsoft SQL Server through pyodbc"""
+    name = "mssql"
+    default_schema = MODEL_SCHEMA
+    # SQL Server rejects statements with more than 2100 parameters
+    max_bind_parameters = 2000
+
+    def engine_options(self) -> Dict[str, Any]:
+        options = super().engine_options()
+        # Send executemany batches as a single parameter array
+        options["fast_executemany"] = True
+        return options
+
+    def lock_rows(self, connection: Connection, table: Table, key_column: str, keys: List[Any]) -> None:
+        """SQL Server ignores FOR UPDATE; take update locks through a table hint"""
+        if not keys:
+            return
+        column = table.c[key_column]
+        connection.execute(
+            select(column).with_hint(table, "WITH (UPDLOCK, ROWLOCK)")
+            .where(column.in_(keys)).order_by(column)
+        )
+
+    def add_to_counters(
+        self,
+        connection: Connection,
+        table: Table,
+        key_columns: List[str],
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """MERGE with HOLDLOCK, so two first increments cannot both insert"""
+        schema = self.schema
+        target = f"[{schema}].[{table.name}]" if schema else f"[{table.name}]"
+        for row in sorted(rows, key=lambda row: [row[column] for column in key_columns]):
+            columns = list(row)
+            column_list = ", ".join(f"[{column}]" for column in columns)
+            parameters = ", ".join(f":{column}" for column in columns)
+            match = " AND ".join(f"t.[{column}] = s.[{column}]" for column in key_columns)
+            increments = ", ".join(
+                f"t.[{column}] = t.[{column}] + s.[{column}]" for column in columns if column not in key_columns
+            )
+            sources = ", ".join(f"s.[{column}]" for column in columns)
+            connection.execute(text(
+                f"MERGE {target} WITH (HOLDLOCK) AS t "
+                f"USING (VALUES ({parameters})) AS s ({column_list}) ON {match} "
+                f"WHEN MATCHED THEN UPDATE SET {increments} "
+                f"WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({sources});"
+            ), row)
+
+    def upsert_rows(
+        self,
+        connection: Connection,
+        table: Table,
+        key_columns: List[str],
+        rows: List[Dict[str, Any]],
+        update_columns: List[str]
+    ) -> int:
+        """One MERGE WITH (HOLDLOCK) per batch, its source a multi-row VALUES list"""
+        schema = self.schema
+        target = f"[{schema}].[{table.name}]" if schema else f"[{table.name}]"
+        rows = sorted(rows, key=lambda row: [row[column] for column in key_columns])
+        per_statement = max(1, self.max_bind_parameters // len(rows[0])) if rows else 1
+        for start in range(0, len(rows), per_statement):
+            batch = rows[start:start + per_statement]
+            columns = list(batch[0])
+            column_list = ", ".join(f"[{column}]" for column in columns)
+            values = ", ".join(
+                "(" + ", ".join(f":{column}_{index}" for column in columns) + ")"
+                for index in range(len(batch))
+            )
+            parameters = {
+                f"{column}_{index}": row[column]
+                for index, row in enumerate(batch)
+                for column in columns
+            }
+            match = " AND ".join(f"t.[{column}] = s.[{column}]" for column in key_columns)
+            updates = ", ".join(f"t.[{column}] = s.[{column}]" for column in update_columns)
+            sources = ", ".join(f"s.[{column}]" for column in columns)
+            connection.execute(text(
+                f"MERGE {target} WITH (HOLDLOCK) AS t "
+                f"USING (VALUES {values}) AS s ({column_list}) ON {match} "
+                f"WHEN MATCHED THEN UPDATE SET {updates} "
+                f"WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({sources});"
+            ), parameters)
+        return len(rows)
+
+class PostgreSQLBackend(DatabaseBackend):
+    """PostgreSQL through psycopg2"""
+    name = "postgresql"
+
+    def engine_options(self) -> Dict[str, Any]:
+        options = super().engine_options()
+        options["executemany_mode"] = "values_plus_batch"
+        return options
+
+    def bulk_insert(self, connection: Connection, table: Table, rows: List[Dict[str, Any]]) -> int:
+        """Stream rows through COPY ... FROM STDIN instead of INSERT statements"""
+        if not rows:
+            return 0
+
+        columns = list(rows[0].keys())
+        schema = self.schema
+        target = f'"{schema}"."{table.name}"' if schema else f'"{table.name}"'
+        column_list = ", ".join(f'"{column}"' for column in columns)
+
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(",".join(_copy_value(row[column]) for column in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        cursor = connection.connection.driver_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {target} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer
+            )
+        finally:
+            cursor.close()
+        return len(rows)
+
+    def add_to_counters(
+        self,
+        connection: Connection,
+        table: Table,
+        key_columns: List[str],
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """INSERT ... ON CONFLICT DO UPDATE in one statement"""
+        from sqlalchemy.dialects.postgresql import insert
+
+        _upsert_counters(connection, insert, table, key_columns, rows)
+
+    def upsert_rows(
+        self,
+        connection: Connection,
+        table: Table,
+        key_columns: List[str],
+        rows: List[Dict[str, Any]],
+        update_columns: List[str]
+    ) -> int:
+        """INSERT ... ON CONFLICT DO UPDATE, sent as multi-row VALUES pages"""
+        from sqlalchemy.dialects.postgresql import insert
+
+        return _upsert_rows(connection, insert, table, key_columns, rows, update_columns)
+
+class SQLiteBackend(DatabaseBackend):
+    """SQLite, used for local development, load tests and cheap read replicas"""
+    name = "sqlite"
+
+    def engine_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        if self.url.database in (None, "", ":memory:"):
+            # An in-memory database only exists on its own connection
+            options["poolclass"] = StaticPool
+        return options
+
+    def configure_engine(self, engine: Engine) -> None:
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+            cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_BYTES}")
+            cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+    def add_to_counters(
+        self,
+        connection: Connection,
+        table: Table,
+        key_columns: List[str],
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """INSERT ... ON CONFLICT DO UPDATE (SQLite 3.24+) in one statement"""
+        from sqlalchemy.dialects.sqlite import insert
+
+        _upsert_counters(connection, insert, table, key_columns, rows)
+
+    def upsert_rows(
+        self,
+        connection: Connection,
+        table: Table,
+        key_columns: List[str],
+        rows: List[Dict[str, Any]],
+        update_columns: List[str]
+    ) -> int:
+        """INSERT ... ON CONFLICT DO UPDATE (SQLite 3.24+), one prepared statement for every row"""
+        from sqlalchemy.dialects.sqlite import insert
+
+        return _upsert_rows(connection, insert, table, key_columns, rows, update_columns)
+
+# Registry of supported backends keyed by SQLAlchemy backend name
+BACKENDS = {
+    MSSQLBackend.name: MSSQLBackend,
+    PostgreSQLBackend.name: PostgreSQLBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+
+def get_backend(url: str) -> DatabaseBackend:
+    """
+    Select the backend implementation for a database URL
+
+    Args:
+        url: SQLAlchemy database URL
+
+    Returns:
+        DatabaseBackend: Backend instance for the URL
+
+    Raises:
+        ValueError: If the URL targets an unsupported database
+    """
+    backend_name = make_url(url).get_backend_name()
+    try:
+        return BACKENDS[backend_name](url)
+    except KeyError:
+        raise ValueError(f"Unsupported database backend: {backend_name}")
+
+def _upsert_counters(
+    connection: Connection,
+    insert,
+    table: Table,
+    key_columns: List[str],
+    rows: List[Dict[str, Any]]
+) -> None:
+    """Counter upsert for dialects with INSERT ... ON CONFLICT"""
+    for row in sorted(rows, key=lambda row: [row[column] for column in key_columns]):
+        statement = insert(table).values(row)
+        statement = statement.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={
+                column: table.c[column] + statement.excluded[column]
+                for column in row if column not in key_columns
+            }
+        )
+        connection.execute(statement)
+
+def _upsert_rows(
+    connection: Connection,
+    insert,
+    table: Table,
+    key_columns: List[str],
+    rows: List[Dict[str, Any]],
+    update_columns: List[str]
+) -> int:
+    """Row upsert for dialects with INSERT ... ON CONFLICT"""
+    if not rows:
+        return 0
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: statement.excluded[column] for column in update_columns}
+    )
+    # One compiled (and cached) statement run over every row; psycopg2's
+    # values_plus_batch mode sends it as multi-row VALUES pages
+    connection.execute(statement, sorted(rows, key=lambda row: [row[column] for column in key_columns]))
+    return len(rows)
+
+def _copy_value(value: Any) -> str:
+    """Format a single value for PostgreSQL COPY in CSV mode"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (int, float)):
+        return str(value)
+    return '"' + str(value).replace('"', '""') + '"'
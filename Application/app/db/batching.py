@@ -0,0 +1,74 @@
+"""
+Query Batching Helpers
+
+This module splits large ID lists for IN clauses and resolves batches of IDs.
+SQL Server caps a statement at 2100 parameters, and very long IN lists plan
+poorly on every backend.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, TypeVar
+
+from sqlalchemy.orm import Query
+
+T = TypeVar("T")
+
+# IDs bound per IN clause
+IN_CHUNK_SIZE = 1000
+
+def chunked(values: Iterable[T], size: int = IN_CHUNK_SIZE) -> Iterator[List[T]]:
+    """
+    Split values into lists of at most size items
+
+    Args:
+        values: Values to split
+        size: Maximum items per chunk
+
+    Yields:
+        list: Consecutive chunks in input order
+    """
+    chunk: List[T] = []
+    for value in values:
+        chunk.append(value)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def load_by_ids(query: Query, id_column: Any, ids: Iterable[int]) -> Dict[int, Any]:
+    """
+    Resolve many IDs with one IN query per chunk of distinct IDs
+
+    Args:
+        query: Base query, including any filters and eager-loading options
+        id_column: Mapped primary key column of the queried model
+        ids: IDs to look up (duplicates are fetched once)
+
+    Returns:
+        dict: Found instances keyed by ID
+    """
+    key = id_column.key
+    found = {}
+    for chunk in chunked(sorted(set(ids))):
+        for instance in query.filter(id_column.in_(chunk)):
+            found[getattr(instance, key)] = instance
+    return found
+
+def in_request_order(ids: Iterable[int], found: Dict[int, Any]) -> List[Dict[str, Any]]:
+    """
+    Arrange batch lookup results in the order the IDs were requested
+
+    Args:
+        ids: Requested IDs, possibly with duplicates
+        found: Instances keyed by ID, as returned by load_by_ids
+
+    Returns:
+        List[dict]: One entry per requested ID with Id, Found and Item (None when not found)
+    """
+    return [
+        {"Id": item_id, "Found": item_id in found, "Item": found.get(item_id)}
+        for item_id in ids
+    ]
@@ -2,8 +2,10 @@
 Database Configuration and Session Management
 
 This module configures the SQLAlchemy database connection and session handling, including:
-- Database engine creation
+- Database engine creation for the configured backend, deferred to first use
+- Fresh connection pools in forked worker processes
 - Session factory setup
+- Read replica routing
 - Base model class definition
 - Database dependency injection
 
@@ -11,32 +13,200 @@ Author: Marco Alejandro Santiago
 Created: February 7, 2025
 """
 
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from threading import Lock
+from typing import Iterator, List, Optional
+import os
+
+from fastapi import Request
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.worker_channel import worker_channel
+from app.db import query_log
+from app.db.backends import get_backend
+from app.db.routing import SessionRouter, client_key_from_request
+
+# Resolve the backend (SQL Server, PostgreSQL or SQLite) from the configured URL
+backend = get_backend(settings.SQLALCHEMY_DATABASE_URL)
+
+# Engines and the replica router are created on first use rather than at
+# import, so importing the application (migrations, manage.py, tests) does
+# not load database drivers or build connection pools
+_engine: Optional[Engine] = None
+_replica_engines: List[Engine] = []
+_router: Optional[SessionRouter] = None
+_engine_lock = Lock()
 
-# Create database engine with debugging enabled
-engine = create_engine(settings.DATABASE_URL, echo=True)
+class _LazySessionmaker(sessionmaker):
+    """Session factory that binds to the primary engine when first called"""
+
+    def __call__(self, **local_kw) -> Session:
+        if self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
 
 # Configure session factory for database operations
 # - autocommit=False: Transactions must be explicitly committed
 # - autoflush=False: Changes won't be automatically flushed to DB
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+
+def get_engine() -> Engine:
+    """
+    Primary database engine, created on first call
+    
+    Returns:
+        Engine: Engine with backend specific pooling and tuning
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = backend.create_engine()
+                # Record statement statistics for the index advisor when enabled
+                if settings.QUERY_LOG_ENABLED:
+                    query_log.install(engine)
+                SessionLocal.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+def get_router() -> SessionRouter:
+    """
+    Session router over the primary and read replicas, created on first call
+    
+    Each replica may use a different backend.
+    
+    Returns:
+        SessionRouter: Router shared by every request in this process
+    """
+    global _router
+    if _router is None:
+        get_engine()
+        with _engine_lock:
+            if _router is None:
+                replica_engines = [
+                    get_backend(url).create_engine() for url in settings.DATABASE_REPLICA_URLS
+                ]
+                if settings.QUERY_LOG_ENABLED:
+                    for replica_engine in replica_engines:
+                        query_log.install(replica_engine)
+                _replica_engines[:] = replica_engines
+                _router = SessionRouter(SessionLocal, replica_engines)
+    return _router
+
+def _receive_write(client_key: str) -> None:
+    """Start a read-your-writes window for a write committed by another worker"""
+    if settings.DATABASE_REPLICA_URLS:
+        get_router().record_write(client_key, broadcast=False)
+
+worker_channel.subscribe("read_your_writes", _receive_write)
+
+def _after_fork() -> None:
+    """Give a forked worker empty pools; connections it inherited belong to the parent"""
+    global _engine_lock
+    _engine_lock = Lock()
+    for inherited in [_engine, *_replica_engines]:
+        if inherited is not None:
+            # close=False leaves the parent's connections open for the parent
+            inherited.dispose(close=False)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+def __getattr__(name: str):
+    # Module attributes kept for callers written before engines became lazy
+    if name == "engine":
+        return get_engine()
+    if name == "replica_engines":
+        get_router()
+        return _replica_engines
+    if name == "router":
+        return get_router()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def warm_pools() -> int:
+    """
+    Open the primary's pooled connections and one per replica ahead of traffic
+    
+    Returns:
+        int: Number of connections opened and returned to their pools
+    """
+    router = get_router()
+    connections = []
+    try:
+        for _ in range(max(1, settings.DB_POOL_SIZE)):
+            connections.append(get_engine().connect())
+        for replica_engine in _replica_engines:
+            try:
+                connections.append(replica_engine.connect())
+            except OperationalError:
+                router.replicas.mark_unhealthy(replica_engine)
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
 
 # Create base class for declarative models
 Base = declarative_base()
 
-def get_db():
+def get_db(request: Request):
     """
     Dependency function to handle database session lifecycle.
     
+    Sessions are bound to the primary. Committed writes start the client's
+    read-your-writes window so its following reads stay on the primary.
+    
+    Args:
+        request: Incoming request used to identify the client
+    
     Yields:
         Session: Database session that will be automatically closed after use
     """
-    db = SessionLocal()
+    db = get_router().writer(client_key_from_request(request))
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@contextmanager
+def read_session(client_key: Optional[str] = None) -> Iterator[Session]:
+    """
+    Open a read-only session outside of request dependencies.
+    
+    Used by streaming responses, whose body is produced after request
+    dependencies have already been cleaned up.
+    
+    Args:
+        client_key: Client identity for read-your-writes routing
+    
+    Yields:
+        Session: Replica (or primary) session closed on exit
+    """
+    router = get_router()
+    db = router.reader(client_key)
+    try:
+        yield db
+    except OperationalError:
+        router.mark_failed(db)
+        raise
+    finally:
+        db.close()
+
+def get_read_db(request: Request):
+    """
+    Dependency function for read-only endpoints.
+    
+    Yields a replica session when replicas are configured and healthy, and a
+    primary session otherwise.
+    
+    Args:
+        request: Incoming request used to identify the client
+    
+    Yields:
+        Session: Read-only database session closed after use
+    """
+    with read_session(client_key_from_request(request)) as db:
+        yield db
\ No newline at end of file
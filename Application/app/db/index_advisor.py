@@ -0,0 +1,266 @@
+"""
+Index Usage Report and Missing-Index Advisor
+
+This module analyses how the service queries use the database indexes, including:
+- Per-backend index usage statistics (SQL Server DMVs, pg_stat_user_indexes,
+  SQLite query plans of logged statements)
+- SQL Server missing-index DMV suggestions
+- Missing-index suggestions derived from the query log and the model indexes
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from sqlalchemy import Boolean, MetaData, UniqueConstraint, text
+from sqlalchemy.engine import Engine
+
+_IDENTIFIER_QUOTES = re.compile(r'[\[\]"`]')
+_SCHEMA_PREFIX = re.compile(r"\b(?:dbo|main|public)\.")
+_CLAUSE_END = r"(?=\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|\bOFFSET\b|\bFETCH\b|\bFOR UPDATE\b|\)|$)"
+_WHERE_CLAUSE = re.compile(r"\bWHERE\b(.*?)" + _CLAUSE_END, re.IGNORECASE | re.DOTALL)
+_ORDER_CLAUSE = re.compile(r"\bORDER BY\b(.*?)(?=\bLIMIT\b|\bOFFSET\b|\bFETCH\b|\)|$)", re.IGNORECASE | re.DOTALL)
+_PREDICATE = re.compile(
+    r"(\w+)\.(\w+)\s*(=|!=|<>|>=|<=|>|<|\bIN\b|\bIS\b|\bBETWEEN\b|\bLIKE\b)",
+    re.IGNORECASE
+)
+_COLUMN_REF = re.compile(r"(\w+)\.(\w+)")
+_EQUALITY_OPERATORS = {"=", "IN", "IS"}
+
+_MSSQL_USAGE = """
+SELECT OBJECT_NAME(i.object_id) AS table_name, i.name AS index_name,
+       ISNULL(s.user_seeks, 0) AS seeks, ISNULL(s.user_scans, 0) AS scans,
+       ISNULL(s.user_lookups, 0) AS lookups, ISNULL(s.user_updates, 0) AS updates
+FROM sys.indexes i
+LEFT JOIN sys.dm_db_index_usage_stats s
+    ON s.object_id = i.object_id AND s.index_id = i.index_id AND s.database_id = DB_ID()
+WHERE OBJECTPROPERTY(i.object_id, 'IsUserTable') = 1 AND i.name IS NOT NULL
+ORDER BY table_name, index_name
+"""
+
+_MSSQL_MISSING = """
+SELECT d.statement AS table_name, d.equality_columns, d.inequality_columns,
+       d.included_columns, gs.user_seeks, gs.avg_user_impact
+FROM sys.dm_db_missing_index_details d
+JOIN sys.dm_db_missing_index_groups g ON g.index_handle = d.index_handle
+JOIN sys.dm_db_missing_index_group_stats gs ON gs.group_handle = g.index_group_handle
+WHERE d.database_id = DB_ID()
+ORDER BY gs.user_seeks * gs.avg_user_impact DESC
+"""
+
+_POSTGRESQL_USAGE = """
+SELECT relname AS table_name, indexrelname AS index_name,
+       idx_scan AS scans, idx_tup_read AS tuples_read, idx_tup_fetch AS tuples_fetched
+FROM pg_stat_user_indexes
+ORDER BY relname, indexrelname
+"""
+
+def parse_statement(statement: str) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Extract the filtered and ordered columns of each table in a statement
+
+    Args:
+        statement: SQL text as recorded in the query log
+
+    Returns:
+        dict: Table name mapped to its "equality", "range" and "order" columns
+    """
+    sql = _SCHEMA_PREFIX.sub("", _IDENTIFIER_QUOTES.sub("", statement))
+    usage: Dict[str, Dict[str, List[str]]] = {}
+
+    def columns_for(table: str) -> Dict[str, List[str]]:
+        return usage.setdefault(table, {"equality": [], "range": [], "order": []})
+
+    for where in _WHERE_CLAUSE.findall(sql):
+        for table, column, operator in _PREDICATE.findall(where):
+            kind = "equality" if operator.upper() in _EQUALITY_OPERATORS else "range"
+            if column not in columns_for(table)[kind]:
+                columns_for(table)[kind].append(column)
+
+    for order in _ORDER_CLAUSE.findall(sql):
+        for table, column in _COLUMN_REF.findall(order):
+            if column not in columns_for(table)["order"]:
+                columns_for(table)["order"].append(column)
+
+    return usage
+
+def declared_indexes(metadata: MetaData) -> Dict[str, List[Tuple[str, List[str]]]]:
+    """
+    Collect key columns of every primary key, unique constraint and index
+
+    Args:
+        metadata: Model metadata
+
+    Returns:
+        dict: Table name mapped to (index name, key columns) pairs
+    """
+    indexes: Dict[str, List[Tuple[str, List[str]]]] = {}
+    for table in metadata.tables.values():
+        entries = indexes.setdefault(table.name, [])
+        entries.append(("PRIMARY KEY", [column.name for column in table.primary_key.columns]))
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                entries.append((constraint.name or "UNIQUE", [column.name for column in constraint.columns]))
+        for column in table.columns:
+            if column.unique:
+                entries.append(("UNIQUE", [column.name]))
+        for index in table.indexes:
+            entries.append((index.name, [column.name for column in index.columns]))
+    return indexes
+
+def candidate_key(columns: Dict[str, List[str]]) -> List[str]:
+    """
+    Build the ideal index key for one table's usage in a statement
+
+    Equality columns lead, followed by the first range column, or by the
+    ORDER BY columns when there is no range predicate.
+    """
+    key = list(columns["equality"])
+    if columns["range"]:
+        key.append(columns["range"][0])
+    else:
+        key.extend(column for column in columns["order"] if column not in key)
+    return key
+
+def is_served(key: List[str], equality_count: int, indexes: List[Tuple[str, List[str]]]) -> bool:
+    """
+    Check whether an existing index can seek on the candidate key
+
+    Args:
+        key: Candidate key from candidate_key()
+        equality_count: Number of leading equality columns in the key
+        indexes: (index name, key columns) pairs for the table
+
+    Returns:
+        bool: True if an index starts with the equality columns (in any
+        order) followed by the remaining key columns in order
+    """
+    for _, index_columns in indexes:
+        if len(index_columns) < len(key):
+            continue
+        if (set(index_columns[:equality_count]) == set(key[:equality_count])
+                and index_columns[equality_count:len(key)] == key[equality_count:]):
+            return True
+    return False
+
+def suggest_indexes(
+    query_stats: Dict[str, Dict[str, float]],
+    metadata: MetaData
+) -> List[Dict[str, Any]]:
+    """
+    Suggest indexes for logged statements that no declared index serves
+
+    Args:
+        query_stats: Merged query log (statement -> count/total_seconds/max_seconds)
+        metadata: Model metadata holding the declared indexes
+
+    Returns:
+        list: Suggestions ordered by total time spent in the affected statements
+    """
+    indexes = declared_indexes(metadata)
+    tables = {table.name: table for table in metadata.tables.values()}
+    suggestions: Dict[Tuple[str, Tuple[str, ...]], Dict[str, Any]] = {}
+
+    for statement, stats in query_stats.items():
+        if not statement.lstrip().upper().startswith("SELECT"):
+            continue
+        for table_name, columns in parse_statement(statement).items():
+            table = tables.get(table_name)
+            key = candidate_key(columns)
+            if table is None or not key or is_served(key, len(columns["equality"]), indexes.get(table_name, [])):
+                continue
+            # Indexes on boolean flags alone are too unselective to be worth maintaining
+            if all(isinstance(table.columns[column].type, Boolean) for column in key if column in table.columns):
+                continue
+
+            suggestion = suggestions.setdefault((table_name, tuple(key)), {
+                "table": table_name,
+                "columns": key,
+                "ddl": f"CREATE INDEX IX_{table_name}_{'_'.join(key)} ON {table_name} ({', '.join(key)})",
+                "statements": 0,
+                "executions": 0,
+                "total_seconds": 0.0,
+            })
+            suggestion["statements"] += 1
+            suggestion["executions"] += stats["count"]
+            suggestion["total_seconds"] += stats["total_seconds"]
+
+    return sorted(suggestions.values(), key=lambda item: item["total_seconds"], reverse=True)
+
+def index_usage(
+    engine: Engine,
+    query_stats: Optional[Dict[str, Dict[str, float]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Report how often each index has been used
+
+    SQL Server and PostgreSQL report server-side counters. SQLite has none,
+    so the logged statements are run through EXPLAIN QUERY PLAN and index use
+    is weighted by execution count.
+
+    Args:
+        engine: Engine to inspect
+        query_stats: Merged query log (required for SQLite)
+
+    Returns:
+        list: One dictionary per index
+    """
+    backend_name = engine.url.get_backend_name()
+    with engine.connect() as connection:
+        if backend_name == "mssql":
+            return [dict(row._mapping) for row in connection.execute(text(_MSSQL_USAGE))]
+        if backend_name == "postgresql":
+            return [dict(row._mapping) for row in connection.execute(text(_POSTGRESQL_USAGE))]
+        if backend_name == "sqlite":
+            return _sqlite_plan_usage(connection, query_stats or {})
+    return []
+
+def missing_index_hints(engine: Engine) -> List[Dict[str, Any]]:
+    """
+    Read the optimizer's own missing-index suggestions (SQL Server only)
+
+    Args:
+        engine: Engine to inspect
+
+    Returns:
+        list: One dictionary per suggestion, most impactful first
+    """
+    if engine.url.get_backend_name() != "mssql":
+        return []
+    with engine.connect() as connection:
+        return [dict(row._mapping) for row in connection.execute(text(_MSSQL_MISSING))]
+
+def _sqlite_plan_usage(connection, query_stats: Dict[str, Dict[str, float]]) -> List[Dict[str, Any]]:
+    usage: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    index_pattern = re.compile(r"(SCAN|SEARCH) (?:\w+\.)?(\w+)(?: USING (?:COVERING )?INDEX (\w+)| USING INTEGER PRIMARY KEY)?")
+
+    for statement, stats in query_stats.items():
+        if not statement.lstrip().upper().startswith("SELECT"):
+            continue
+        cursor = connection.connection.driver_connection.cursor()
+        try:
+            # Parameters do not change the chosen index; bind NULL for each placeholder
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", [None] * statement.count("?"))
+            plan = cursor.fetchall()
+        except Exception:
+            continue
+        finally:
+            cursor.close()
+
+        for row in plan:
+            match = index_pattern.search(row[-1])
+            if not match:
+                continue
+            operation, table_name, index_name = match.groups()
+            index_name = index_name or ("PRIMARY KEY" if "PRIMARY KEY" in row[-1] else "(table scan)")
+            entry = usage.setdefault((table_name, index_name), {
+                "table_name": table_name,
+                "index_name": index_name,
+                "searches": 0,
+                "scans": 0,
+            })
+            entry["searches" if operation == "SEARCH" else "scans"] += stats["count"]
+
+    return sorted(usage.values(), key=lambda item: (item["table_name"], item["index_name"]))
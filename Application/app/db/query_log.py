@@ -0,0 +1,118 @@
+"""
+SQL Query Log
+
+This module records executed SQL statements for offline index analysis, including:
+- Engine event hooks that time every statement
+- Aggregation by statement text (parameters are bound, so text is a fingerprint)
+- Periodic per-process snapshots written as JSON under QUERY_LOG_DIR
+- Loading and merging snapshots from every worker process
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, Optional
+import atexit
+import json
+import os
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+class QueryLog:
+    """Aggregated execution statistics keyed by normalised statement text"""
+
+    def __init__(self, directory: Path, flush_every: int):
+        self.directory = directory
+        self.flush_every = flush_every
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self._pending = 0
+        self._lock = Lock()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """Add one execution of a statement to the aggregate"""
+        key = _WHITESPACE.sub(" ", statement).strip()
+        with self._lock:
+            entry = self.stats.get(key)
+            if entry is None:
+                entry = self.stats[key] = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            entry["count"] += 1
+            entry["total_seconds"] += elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+            self._pending += 1
+            flush = self._pending >= self.flush_every
+        if flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write this process's aggregate to its snapshot file"""
+        with self._lock:
+            if not self.stats:
+                return
+            snapshot = json.dumps(self.stats)
+            self._pending = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"query_log.{os.getpid()}.json"
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(snapshot)
+        os.replace(temp_path, path)
+
+    def install(self, engine: Engine) -> None:
+        """Time every statement executed through an engine"""
+        @event.listens_for(engine, "before_cursor_execute")
+        def _start(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_log_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _stop(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info["query_log_start"].pop()
+            self.record(statement, time.perf_counter() - started)
+
+_query_log: Optional[QueryLog] = None
+
+def install(engine: Engine) -> None:
+    """
+    Attach the process-wide query log to an engine
+
+    Args:
+        engine: Engine whose statements should be recorded
+    """
+    global _query_log
+    if _query_log is None:
+        _query_log = QueryLog(settings.QUERY_LOG_DIR, settings.QUERY_LOG_FLUSH_EVERY)
+        atexit.register(_query_log.flush)
+    _query_log.install(engine)
+
+def load(paths: Optional[Iterable[Path]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Merge query log snapshots from all processes
+
+    Args:
+        paths: Snapshot files to read; defaults to every file in QUERY_LOG_DIR
+
+    Returns:
+        dict: Statement text mapped to count, total_seconds and max_seconds
+    """
+    if paths is None:
+        paths = sorted(Path(settings.QUERY_LOG_DIR).glob("query_log.*.json"))
+
+    merged: Dict[str, Dict[str, float]] = {}
+    for path in paths:
+        for statement, entry in json.loads(Path(path).read_text()).items():
+            total = merged.setdefault(
+                statement,
+                {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            total["count"] += entry["count"]
+            total["total_seconds"] += entry["total_seconds"]
+            total["max_seconds"] = max(total["max_seconds"], entry["max_seconds"])
+    return merged
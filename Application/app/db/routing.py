@@ -0,0 +1,213 @@
+"""
+Read Replica Session Routing
+
+This module routes database sessions between the primary and read replicas, including:
+- Round-robin replica selection with passive and active health checks
+- Read-only session enforcement
+- Read-your-writes stickiness per client after a write, shared with the
+  other worker processes of the host through the worker channel
+- Client identification from the incoming request
+
+Stickiness is kept per host: a client whose requests are balanced across
+several hosts can still read a lagging replica right after a write.
+Balance such clients by READ_CLIENT_HEADER (or address) onto one host, or
+disable replicas for them.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from threading import Lock
+from typing import Dict, List, Optional
+import logging
+import time
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.worker_channel import worker_channel
+
+logger = logging.getLogger('app')
+
+# Prune the write-tracking table once it grows past this many clients
+_MAX_TRACKED_CLIENTS = 100000
+
+class ReadOnlySessionError(RuntimeError):
+    """Raised when a replica-bound session attempts to flush changes"""
+
+class ReplicaPool:
+    """Round-robin pool of replica engines that skips unhealthy members"""
+
+    def __init__(self, engines: List[Engine], healthcheck_interval: float):
+        self.engines = engines
+        self.healthcheck_interval = healthcheck_interval
+        self._next = 0
+        self._retry_at: Dict[int, float] = {}  # engine index -> time of next probe
+        self._lock = Lock()
+
+    def choose(self) -> Optional[Engine]:
+        """
+        Pick the next healthy replica
+
+        Returns:
+            Engine: Replica engine, or None if every replica is unhealthy
+        """
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = self._next
+                self._next = (self._next + 1) % len(self.engines)
+                retry_at = self._retry_at.get(index)
+
+            if retry_at is None:
+                return self.engines[index]
+            if time.monotonic() >= retry_at and self._probe(index):
+                return self.engines[index]
+        return None
+
+    def mark_unhealthy(self, engine: Engine) -> None:
+        """Take a replica out of rotation until its next health check"""
+        index = self.engines.index(engine)
+        with self._lock:
+            if index not in self._retry_at:
+                logger.warning(f"Read replica {engine.url!r} marked unhealthy")
+            self._retry_at[index] = time.monotonic() + self.healthcheck_interval
+
+    def _probe(self, index: int) -> bool:
+        """Run a trivial query against a replica and restore it if it answers"""
+        engine = self.engines[index]
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except Exception:
+            self.mark_unhealthy(engine)
+            return False
+
+        with self._lock:
+            self._retry_at.pop(index, None)
+        logger.info(f"Read replica {engine.url!r} back in rotation")
+        return True
+
+class SessionRouter:
+    """Hands out primary sessions for writes and replica sessions for reads"""
+
+    def __init__(self, primary_factory: sessionmaker, replica_engines: List[Engine]):
+        self.primary_factory = primary_factory
+        self.replicas = ReplicaPool(
+            replica_engines,
+            settings.REPLICA_HEALTHCHECK_INTERVAL_SECONDS
+        )
+        self.replica_factories = {
+            engine: sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            for engine in replica_engines
+        }
+        self._last_write: Dict[str, float] = {}
+        self._lock = Lock()
+
+        event.listen(primary_factory, "after_flush", _flag_write)
+        event.listen(primary_factory, "after_commit", self._after_commit)
+        for factory in self.replica_factories.values():
+            event.listen(factory, "before_flush", _reject_flush)
+
+    def writer(self, client_key: Optional[str] = None) -> Session:
+        """
+        Open a session on the primary
+
+        Args:
+            client_key: Identifier of the calling client for write tracking
+
+        Returns:
+            Session: Primary database session
+        """
+        db = self.primary_factory()
+        db.info["client_key"] = client_key
+        return db
+
+    def reader(self, client_key: Optional[str] = None) -> Session:
+        """
+        Open a session for read-only work
+
+        Falls back to the primary when no replica is configured or healthy, or
+        when the client wrote recently and must see its own changes.
+
+        Args:
+            client_key: Identifier of the calling client
+
+        Returns:
+            Session: Replica session (or primary session on fallback)
+        """
+        if not self.replica_factories or self.recently_wrote(client_key):
+            return self.writer(client_key)
+
+        engine = self.replicas.choose()
+        if engine is None:
+            return self.writer(client_key)
+
+        db = self.replica_factories[engine]()
+        db.info["client_key"] = client_key
+        db.info["replica_engine"] = engine
+        return db
+
+    def recently_wrote(self, client_key: Optional[str]) -> bool:
+        """Check whether a client is inside its read-your-writes window"""
+        if client_key is None or settings.READ_YOUR_WRITES_SECONDS <= 0:
+            return False
+        last_write = self._last_write.get(client_key)
+        return last_write is not None and time.monotonic() - last_write < settings.READ_YOUR_WRITES_SECONDS
+
+    def record_write(self, client_key: Optional[str], broadcast: bool = True) -> None:
+        """
+        Start the read-your-writes window for a client
+
+        Args:
+            client_key: Client that committed a write
+            broadcast: Also start it in the other worker processes
+        """
+        if client_key is None or settings.READ_YOUR_WRITES_SECONDS <= 0:
+            return
+        if broadcast and self.replica_factories:
+            # The client's next read may reach another worker; the window starts there on receipt
+            worker_channel.publish("read_your_writes", client_key)
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[client_key] = now
+            if len(self._last_write) > _MAX_TRACKED_CLIENTS:
+                cutoff = now - settings.READ_YOUR_WRITES_SECONDS
+                self._last_write = {
+                    key: written for key, written in self._last_write.items()
+                    if written >= cutoff
+                }
+
+    def mark_failed(self, db: Session) -> None:
+        """Report a connection failure on a replica session"""
+        engine = db.info.get("replica_engine")
+        if engine is not None:
+            self.replicas.mark_unhealthy(engine)
+
+    def _after_commit(self, db: Session) -> None:
+        if db.info.pop("has_writes", False):
+            self.record_write(db.info.get("client_key"))
+
+def client_key_from_request(request: Request) -> Optional[str]:
+    """
+    Identify the calling client for read-your-writes tracking
+
+    Args:
+        request: Incoming HTTP request
+
+    Returns:
+        str: Client identifier header value or client address, if known
+    """
+    client_key = request.headers.get(settings.READ_CLIENT_HEADER)
+    if client_key:
+        return client_key
+    return request.client.host if request.client else None
+
+def _flag_write(db: Session, flush_context) -> None:
+    db.info["has_writes"] = True
+
+def _reject_flush(db: Session, flush_context, instances) -> None:
+    if db.new or db.dirty or db.deleted:
+        raise ReadOnlySessionError("Attempted to write through a read replica session")
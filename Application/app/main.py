@@ -3,33 +3,113 @@ FastAPI Application Entry Point
 
 This module initializes and configures the FastAPI application, including:
 - CORS middleware setup
+- Admission control (concurrency budgets and rate limiting) and /metrics
 - API router integration
 - Global exception handling
 - Logging configuration
+- Startup and shutdown hooks (activity flushing, tag index, upload expiry, event broker,
+  worker channel, worker pools)
+- Optional prewarming and a startup profile logged once ready
 - Root endpoint definition
 
+Importing this module does no I/O: logging is configured, and database
+engines and worker processes are created, during startup or on first use.
+
 Author: Marco Alejandro Santiago
 Created: February 7, 2025
 """
 
+import time
+
+# Measures how long importing the application takes
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app.core import metrics
+from app.core.admission import AdmissionControlMiddleware, build_controller
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.security import password_hasher
+from app.core.startup import load_deferred, startup_profile
+from app.core.worker_channel import worker_channel
 from app.api.v1.api import api_router
+from app.services.activity_service import activity_buffer
+from app.services.duplicate_service import near_duplicates
+from app.services.event_service import event_broker
+from app.services.tag_service import tag_index
+from app.services.text_service import text_extractor
+from app.services.upload_service import upload_sessions
+
+# Handlers are attached by setup_logging() during startup
+logger = logging.getLogger('app')
 
-# Initialize logger
-logger = setup_logging()
+async def prewarm() -> None:
+    """Do the work the first requests would otherwise wait for"""
+    from app.db.database import warm_pools
+
+    connections = await asyncio.to_thread(warm_pools)
+    modules = load_deferred()
+    # Starts the bcrypt workers and computes the hash used for unknown usernames
+    await password_hasher.verify_dummy("")
+    deadline = time.monotonic() + settings.STARTUP_PREWARM_TIMEOUT_SECONDS
+    while not tag_index.ready and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    logger.info(
+        f"Prewarmed {connections} database connections and {len(modules)} modules"
+        f"{'' if tag_index.ready else '; tag index still building'}"
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background workers on startup and drain them on shutdown"""
+    with startup_profile.phase("logging"):
+        setup_logging()
+    with startup_profile.phase("background workers"):
+        activity_buffer.start()
+        tag_index.start()
+        upload_sessions.start()
+        event_broker.start()
+        worker_channel.start()
+    if settings.STARTUP_PREWARM:
+        with startup_profile.phase("prewarm"):
+            try:
+                await prewarm()
+            except Exception as e:
+                # Serving cold is better than not serving
+                logger.warning(f"Prewarm failed: {e}")
+    startup_profile.log()
+    yield
+    worker_channel.stop()
+    # Ends open event streams so shutdown does not wait on them
+    await event_broker.stop()
+    await upload_sessions.stop()
+    await tag_index.stop()
+    # Write buffered login/access timestamps before the process exits
+    await activity_buffer.stop()
+    password_hasher.shutdown()
+    near_duplicates.shutdown()
+    text_extractor.shutdown()
 
 # Create FastAPI application instance with configuration
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
+# Bound concurrent work per request class; added first so CORS headers
+# still reach clients on 429/503 responses
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware, controller=build_controller())
+
 # Configure CORS middleware for cross-origin requests
 app.add_middleware(
     CORSMiddleware,
@@ -58,4 +138,11 @@ async def root():
     return {
         "message": "Document Management System API",
         "version": settings.VERSION
-    }
\ No newline at end of file
+    }
+
+# Prometheus scrape endpoint; values are per worker process
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+startup_profile.record("import", time.perf_counter() - _import_started)
@@ -0,0 +1,15 @@
+from .models import (
+    User,
+    DocumentType,
+    Document,
+    DocumentVersion,
+    DocumentMetadata,
+    Tag,
+    Topic,
+    TopicClosure,
+    DocumentTopic,
+    DocumentTag,
+    DocumentRelationship,
+    ChangeLog,
+    DocumentStat
+)
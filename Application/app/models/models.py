@@ -12,78 +12,122 @@ Author: Marco Alejandro Santiago
 Created: February 7, 2025
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Boolean, Text, Index, UniqueConstraint, PrimaryKeyConstraint, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from app.db.database import Base
 
+# Filter predicates for partial indexes, spelled per backend
+LIVE_DOCUMENT_FILTER = {
+    "mssql_where": text("[IsDeleted] = 0"),
+    "postgresql_where": text('"IsDeleted" = false'),
+    "sqlite_where": text('"IsDeleted" = 0'),
+}
+
+# Filter predicates for indexes over active relationship edges
+ACTIVE_RELATIONSHIP_FILTER = {
+    "mssql_where": text("[IsActive] = 1"),
+    "postgresql_where": text('"IsActive" = true'),
+    "sqlite_where": text('"IsActive" = 1'),
+}
+
 # User Management
 class User(Base):
     """User model for authentication and tracking document operations"""
     __tablename__ = "Users"
-    __table_args__ = {"schema": "dbo"}
+    __table_args__ = (
+        # get_users: IsActive filter paged by UserId
+        Index(
+            "IX_Users_Active", "IsActive", "UserId",
+            mssql_include=["Username", "Email"],
+            postgresql_include=["Username", "Email"]
+        ),
+        {"schema": "dbo"}
+    )
 
     UserId = Column(Integer, primary_key=True)
     Username = Column(String(100), unique=True, nullable=False)
     Email = Column(String(255), unique=True, nullable=False)
     PasswordHash = Column(String(255), nullable=False)
-    IsActive = Column(Boolean, default=True)
-    CreatedDate = Column(DateTime, default=datetime.utcnow)
+    IsActive = Column(Boolean, default=True, nullable=False)
+    CreatedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
     LastLoginDate = Column(DateTime, nullable=True)
 
 # Document Classification
 class DocumentType(Base):
     """Document type definition with schema support"""
     __tablename__ = "DocumentTypes"
-    __table_args__ = {"schema": "dbo"}
+    __table_args__ = (
+        # get_document_types: IsActive filter paged by DocumentTypeId
+        Index("IX_DocumentTypes_Active", "IsActive", "DocumentTypeId"),
+        {"schema": "dbo"}
+    )
 
     DocumentTypeId = Column(Integer, primary_key=True)
-    TypeName = Column(String(100), nullable=False)
+    TypeName = Column(String(100), unique=True, nullable=False)
     Description = Column(String(500))
     SchemaDefinition = Column(Text)  # JSON schema for document validation
-    IsActive = Column(Boolean, default=True)
-    CreatedDate = Column(DateTime, default=datetime.utcnow)
-    LastModifiedDate = Column(DateTime, default=datetime.utcnow)
+    IsActive = Column(Boolean, default=True, nullable=False)
+    CreatedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
+    LastModifiedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 # Core Document Management
 class Document(Base):
     """Primary document model with version and metadata tracking"""
     __tablename__ = "Documents"
-    __table_args__ = {"schema": "dbo"}
+    __table_args__ = (
+        # get_documents: IsDeleted filter ordered by CreatedDate, covering the list columns
+        Index(
+            "IX_Documents_Live_CreatedDate", "IsDeleted", "CreatedDate", "DocumentId",
+            mssql_include=["DocumentName", "FileType", "FileSizeBytes", "DocumentTypeId"],
+            postgresql_include=["DocumentName", "FileType", "FileSizeBytes", "DocumentTypeId"]
+        ),
+        # Live documents of one type, newest first
+        Index(
+            "IX_Documents_Live_DocumentType", "DocumentTypeId", "CreatedDate",
+            **LIVE_DOCUMENT_FILTER
+        ),
+        {"schema": "dbo"}
+    )
 
     DocumentId = Column(Integer, primary_key=True)
     DocumentName = Column(String(255), nullable=False)
     FileLocation = Column(String(1000), nullable=False)
     FileType = Column(String(50), nullable=False)
-    FileSizeBytes = Column(Integer, nullable=False)
-    CreatedDate = Column(DateTime, default=datetime.utcnow)
-    CreatedById = Column(Integer, ForeignKey("dbo.Users.UserId"))
-    LastModifiedDate = Column(DateTime, default=datetime.utcnow)
-    LastModifiedById = Column(Integer, ForeignKey("dbo.Users.UserId"))
-    IsDeleted = Column(Boolean, default=False)
+    FileSizeBytes = Column(BigInteger, nullable=False)
+    CreatedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
+    CreatedById = Column(Integer, ForeignKey("dbo.Users.UserId"), nullable=False)
+    LastModifiedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
+    LastModifiedById = Column(Integer, ForeignKey("dbo.Users.UserId"), nullable=False)
+    IsDeleted = Column(Boolean, default=False, nullable=False)
     ContentHash = Column(String(255), nullable=False)  # For file integrity verification
     DocumentTypeId = Column(Integer, ForeignKey("dbo.DocumentTypes.DocumentTypeId"))
+    LastAccessedDate = Column(DateTime, nullable=True)  # Written in bulk by the activity buffer
 
     # Relationship definitions
     created_by = relationship("User", foreign_keys=[CreatedById])
     modified_by = relationship("User", foreign_keys=[LastModifiedById])
     document_type = relationship("DocumentType")
     versions = relationship("DocumentVersion", back_populates="document")
-    metadata = relationship("DocumentMetadata", back_populates="document")
+    # "metadata" is reserved by the declarative base; exposed as "metadata" by the schemas
+    metadata_entries = relationship("DocumentMetadata", back_populates="document")
 
 # Version Control
 class DocumentVersion(Base):
     """Version history tracking for documents"""
     __tablename__ = "DocumentVersions"
-    __table_args__ = {"schema": "dbo"}
+    __table_args__ = (
+        UniqueConstraint("DocumentId", "VersionNumber", name="UQ_DocumentVersion"),
+        {"schema": "dbo"}
+    )
 
     VersionId = Column(Integer, primary_key=True)
-    DocumentId = Column(Integer, ForeignKey("dbo.Documents.DocumentId"))
+    DocumentId = Column(Integer, ForeignKey("dbo.Documents.DocumentId"), nullable=False)
     VersionNumber = Column(Integer, nullable=False)
     FileLocation = Column(String(1000), nullable=False)
-    CreatedDate = Column(DateTime, default=datetime.utcnow)
-    CreatedById = Column(Integer, ForeignKey("dbo.Users.UserId"))
+    CreatedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
+    CreatedById = Column(Integer, ForeignKey("dbo.Users.UserId"), nullable=False)
     ContentHash = Column(String(255), nullable=False)
 
     document = relationship("Document", back_populates="versions")
@@ -93,17 +137,21 @@ class DocumentVersion(Base):
 class DocumentMetadata(Base):
     """Flexible metadata storage for documents"""
     __tablename__ = "DocumentMetadata"
-    __table_args__ = {"schema": "dbo"}
+    __table_args__ = (
+        UniqueConstraint("DocumentId", "MetadataKey", name="UQ_DocumentMetadata"),
+        Index("IX_DocumentMetadata_Key", "MetadataKey"),
+        {"schema": "dbo"}
+    )
 
     DocumentMetadataId = Column(Integer, primary_key=True)
-    DocumentId = Column(Integer, ForeignKey("dbo.Documents.DocumentId"))
+    DocumentId = Column(Integer, ForeignKey("dbo.Documents.DocumentId"), nullable=False)
     MetadataKey = Column(String(100), nullable=False)
     MetadataValue = Column(Text)
     DataType = Column(String(50), nullable=False)  # For type-safe metadata handling
-    CreatedDate = Column(DateTime, default=datetime.utcnow)
-    LastModifiedDate = Column(DateTime, default=datetime.utcnow)
+    CreatedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
+    LastModifiedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    document = relationship("Document", back_populates="metadata")
+    document = relationship("Document", back_populates="metadata_entries")
 
 # Classification and Organization
 class Tag(Base):
@@ -114,7 +162,7 @@ class Tag(Base):
     TagId = Column(Integer, primary_key=True)
     TagName = Column(String(100), unique=True, nullable=False)
     Description = Column(String(500))
-    IsActive = Column(Boolean, default=True)
+    IsActive = Column(Boolean, default=True, nullable=False)
 
 class Topic(Base):
     """Hierarchical topic organization system"""
@@ -124,8 +172,116 @@ class Topic(Base):
     TopicId = Column(Integer, primary_key=True)
     TopicName = Column(String(100), unique=True, nullable=False)
     Description = Column(String(500))
-    IsActive = Column(Boolean, default=True)
-    CreatedDate = Column(DateTime, default=datetime.utcnow)
+    IsActive = Column(Boolean, default=True, nullable=False)
+    CreatedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
     ParentTopicId = Column(Integer, ForeignKey("dbo.Topics.TopicId"))
 
-    parent_topic = relationship("Topic", remote_side=[TopicId])
\ No newline at end of file
+    parent_topic = relationship("Topic", remote_side=[TopicId])
+
+class TopicClosure(Base):
+    """
+    Transitive closure of the topic hierarchy
+
+    One row per (ancestor, descendant) pair including each topic paired with
+    itself at depth 0, so subtree and ancestor lookups are a single indexed
+    query instead of a recursive walk over ParentTopicId.
+    """
+    __tablename__ = "TopicClosure"
+    __table_args__ = (
+        PrimaryKeyConstraint("AncestorTopicId", "DescendantTopicId", name="PK_TopicClosure"),
+        # Ancestor lookups: every row for one descendant
+        Index("IX_TopicClosure_Descendant", "DescendantTopicId", "Depth"),
+        {"schema": "dbo"}
+    )
+
+    AncestorTopicId = Column(Integer, ForeignKey("dbo.Topics.TopicId"), nullable=False)
+    DescendantTopicId = Column(Integer, ForeignKey("dbo.Topics.TopicId"), nullable=False)
+    Depth = Column(Integer, nullable=False)
+
+class DocumentTopic(Base):
+    """Assignment of documents to topics"""
+    __tablename__ = "DocumentTopics"
+    __table_args__ = (
+        PrimaryKeyConstraint("DocumentId", "TopicId", name="PK_DocumentTopics"),
+        # Documents under a topic (joined through TopicClosure for subtrees)
+        Index("IX_DocumentTopics_Topic", "TopicId", "DocumentId"),
+        {"schema": "dbo"}
+    )
+
+    DocumentId = Column(Integer, ForeignKey("dbo.Documents.DocumentId"), nullable=False)
+    TopicId = Column(Integer, ForeignKey("dbo.Topics.TopicId"), nullable=False)
+    CreatedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class DocumentTag(Base):
+    """Assignment of tags to documents"""
+    __tablename__ = "DocumentTags"
+    __table_args__ = (
+        PrimaryKeyConstraint("DocumentId", "TagId", name="PK_DocumentTags"),
+        # Tag index rebuilds stream this in (TagId, DocumentId) order
+        Index("IX_DocumentTags_Tag", "TagId", "DocumentId"),
+        {"schema": "dbo"}
+    )
+
+    DocumentId = Column(Integer, ForeignKey("dbo.Documents.DocumentId"), nullable=False)
+    TagId = Column(Integer, ForeignKey("dbo.Tags.TagId"), nullable=False)
+    CreatedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class DocumentRelationship(Base):
+    """Typed, directed edge between two documents"""
+    __tablename__ = "DocumentRelationships"
+    __table_args__ = (
+        # Graph traversal: one level of outgoing / incoming edges per query, covered
+        Index(
+            "IX_DocumentRelationships_Source", "SourceDocumentId", "TargetDocumentId",
+            mssql_include=["RelationshipType"],
+            postgresql_include=["RelationshipType"],
+            **ACTIVE_RELATIONSHIP_FILTER
+        ),
+        Index(
+            "IX_DocumentRelationships_Target", "TargetDocumentId", "SourceDocumentId",
+            mssql_include=["RelationshipType"],
+            postgresql_include=["RelationshipType"],
+            **ACTIVE_RELATIONSHIP_FILTER
+        ),
+        {"schema": "dbo"}
+    )
+
+    RelationshipId = Column(Integer, primary_key=True)
+    SourceDocumentId = Column(Integer, ForeignKey("dbo.Documents.DocumentId"), nullable=False)
+    TargetDocumentId = Column(Integer, ForeignKey("dbo.Documents.DocumentId"), nullable=False)
+    RelationshipType = Column(String(50), nullable=False)
+    RelationshipMetadata = Column(Text)
+    CreatedDate = Column(DateTime, default=datetime.utcnow, nullable=False)
+    CreatedById = Column(Integer, ForeignKey("dbo.Users.UserId"), nullable=False)
+    IsActive = Column(Boolean, default=True, nullable=False)
+
+    source_document = relationship("Document", foreign_keys=[SourceDocumentId])
+    target_document = relationship("Document", foreign_keys=[TargetDocumentId])
+
+class ChangeLog(Base):
+    """Append-only feed of document, user and document type changes"""
+    __tablename__ = "ChangeLog"
+    __table_args__ = (
+        # Compaction: is there a newer change for the same entity?
+        Index("IX_ChangeLog_Entity", "EntityType", "EntityId", "ChangeId"),
+        {"schema": "dbo"}
+    )
+
+    # SQLite only autoincrements INTEGER primary keys
+    ChangeId = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    EntityType = Column(String(50), nullable=False)
+    EntityId = Column(Integer, nullable=False)
+    Operation = Column(String(10), nullable=False)
+    ChangedDate = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class DocumentStat(Base):
+    """Live document count and bytes per facet value, kept current by document writes"""
+    __tablename__ = "DocumentStats"
+    __table_args__ = {"schema": "dbo"}
+
+    Facet = Column(String(20), primary_key=True)
+    FacetKey = Column(String(100), primary_key=True)
+    # Each value is spread over shards so concurrent writers rarely wait on the same row
+    Shard = Column(Integer, primary_key=True)
+    DocumentCount = Column(BigInteger, nullable=False, default=0)
+    TotalBytes = Column(BigInteger, nullable=False, default=0)
@@ -7,6 +7,7 @@ from .schemas import (
     DocumentMetadataBase,
     TagBase,
     TopicBase,
+    DocumentRelationshipBase,
     
     # Create schemas
     UserCreate,
@@ -16,6 +17,7 @@ from .schemas import (
     DocumentMetadataCreate,
     TagCreate,
     TopicCreate,
+    DocumentRelationshipCreate,
     
     # Response schemas
     User,
@@ -25,6 +27,31 @@ from .schemas import (
     DocumentMetadata,
     Tag,
     Topic,
+    TopicMove,
+    DocumentIdList,
+    TagAssignment,
+    TagQueryResult,
+    BatchGetRequest,
+    BatchGetItem,
+    UploadSessionCreate,
+    UploadSession,
+    ChangeLogEntry,
+    ChangeFeed,
+    DuplicateCandidate,
+    DuplicateGroup,
+    FacetBucket,
+    DocumentStatistics,
+    MetadataEntry,
+    DocumentMetadataSet,
+    MetadataUpsertRequest,
+    MetadataUpsertResult,
+    MetadataBatchGetRequest,
+    MetadataValue,
+    DocumentRelationship,
+    GraphEdge,
+    GraphNode,
+    RelationshipGraph,
+    Token,
     
     # Update schemas
     UserUpdate,
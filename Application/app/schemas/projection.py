@@ -0,0 +1,57 @@
+"""
+Sparse Fieldset Schemas
+
+This module builds response schemas for projections of a full schema, including:
+- Dynamic Pydantic models holding only the requested fields of a schema
+- List adapters for validating and encoding projected rows
+- Caching, so each distinct projection is only built once per process
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from functools import lru_cache
+from typing import List, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, create_model
+
+@lru_cache(maxsize=256)
+def projection_model(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Build a model with a subset of a schema's fields
+
+    Field types, defaults and aliases are copied from the schema, so the
+    projection serializes each field exactly as the full schema does.
+
+    Args:
+        schema: Full response schema
+        fields: Names of the fields to keep, in output order
+
+    Returns:
+        Type[BaseModel]: Projection model named after the schema
+    """
+    definitions = {
+        name: (schema.model_fields[name].annotation, schema.model_fields[name])
+        for name in fields
+    }
+    return create_model(
+        f"{schema.__name__}Projection",
+        __config__=schema.model_config,
+        # Resolve forward references such as List['DocumentVersion'] like the schema does
+        __module__=schema.__module__,
+        **definitions
+    )
+
+@lru_cache(maxsize=256)
+def projection_adapter(schema: Type[BaseModel], fields: Tuple[str, ...]) -> TypeAdapter:
+    """
+    Return a list adapter for a projection of a schema
+
+    Args:
+        schema: Full response schema
+        fields: Names of the fields to keep, in output order
+
+    Returns:
+        TypeAdapter: Adapter validating and encoding lists of projected rows
+    """
+    return TypeAdapter(List[projection_model(schema, fields)])
@@ -12,8 +12,8 @@ Author: Marco Alejandro Santiago
 Created: February 7, 2025
 """
 
-from pydantic import BaseModel, EmailStr, constr
-from typing import Optional, List
+from pydantic import AliasChoices, BaseModel, EmailStr, Field, constr
+from typing import Any, Generic, Literal, Optional, List, TypeVar
 from datetime import datetime
 
 # Base Schemas - Define core attributes for each resource type
@@ -57,6 +57,12 @@ class TopicBase(BaseModel):
     ParentTopicId: Optional[int] = None
     IsActive: bool = True
 
+class DocumentRelationshipBase(BaseModel):
+    SourceDocumentId: int
+    TargetDocumentId: int
+    RelationshipType: constr(min_length=1, max_length=50)
+    RelationshipMetadata: Optional[str] = None
+
 # Create Schemas - Used for validating new resource creation requests
 class UserCreate(UserBase):
     """Extends UserBase to include password for user creation"""
@@ -84,6 +90,9 @@ class TagCreate(TagBase):
 class TopicCreate(TopicBase):
     pass
 
+class DocumentRelationshipCreate(DocumentRelationshipBase):
+    pass
+
 # Response Schemas - Define API response structures
 class User(UserBase):
     """Complete user representation including system-generated fields"""
@@ -113,8 +122,12 @@ class Document(DocumentBase):
     LastModifiedById: int
     IsDeleted: bool
     ContentHash: str
+    LastAccessedDate: Optional[datetime] = None
     versions: List['DocumentVersion'] = []
-    metadata: List['DocumentMetadata'] = []
+    metadata: List['DocumentMetadata'] = Field(
+        default=[],
+        validation_alias=AliasChoices("metadata_entries", "metadata")
+    )
 
     class Config:
         from_attributes = True
@@ -151,6 +164,153 @@ class Topic(TopicBase):
     class Config:
         from_attributes = True
 
+class DocumentRelationship(DocumentRelationshipBase):
+    RelationshipId: int
+    CreatedDate: datetime
+    CreatedById: int
+    IsActive: bool
+
+    class Config:
+        from_attributes = True
+
+class GraphEdge(BaseModel):
+    """Relationship edge as returned by neighbour and graph queries"""
+    RelationshipId: int
+    SourceDocumentId: int
+    TargetDocumentId: int
+    RelationshipType: str
+
+class GraphNode(BaseModel):
+    """Document reached by a traversal and its distance from the start"""
+    DocumentId: int
+    Depth: int
+
+class RelationshipGraph(BaseModel):
+    """Bounded traversal result; Truncated is set when a limit cut the walk short"""
+    Nodes: List[GraphNode]
+    Edges: List[GraphEdge]
+    Truncated: bool
+
+class TopicMove(BaseModel):
+    """New parent for a topic subtree (None moves it to the root)"""
+    ParentTopicId: Optional[int] = None
+
+class DocumentIdList(BaseModel):
+    """Document IDs for bulk assignment operations"""
+    DocumentIds: List[int] = Field(min_length=1, max_length=10000)
+
+class TagAssignment(BaseModel):
+    """Tags applied to (or removed from) every listed document"""
+    TagIds: List[int] = Field(min_length=1, max_length=100)
+    DocumentIds: List[int] = Field(min_length=1, max_length=10000)
+
+class TagQueryResult(BaseModel):
+    """One page of documents matching a tag expression"""
+    Total: int
+    DocumentIds: List[int]
+
+class BatchGetRequest(BaseModel):
+    """IDs to resolve in one batch lookup, answered in the same order"""
+    Ids: List[int] = Field(min_length=1, max_length=10000)
+
+ItemT = TypeVar("ItemT")
+
+class BatchGetItem(BaseModel, Generic[ItemT]):
+    """Result of one requested ID; Item is None when Found is False"""
+    Id: int
+    Found: bool
+    Item: Optional[ItemT] = None
+
+class UploadSessionCreate(DocumentBase):
+    """Resumable upload announced before any file bytes are sent"""
+    FileName: str
+    Length: int = Field(gt=0)
+
+class UploadSession(UploadSessionCreate):
+    """State of a resumable upload; Offset is the number of bytes received"""
+    UploadId: str
+    Offset: int
+    CreatedDate: datetime
+    ExpiresAt: datetime
+
+class ChangeLogEntry(BaseModel):
+    """One recorded change; Operation is create, update or delete"""
+    ChangeId: int
+    EntityType: str
+    EntityId: int
+    Operation: str
+    ChangedDate: datetime
+
+    class Config:
+        from_attributes = True
+
+class ChangeFeed(BaseModel):
+    """Changes after the requested position; pass NextSince as since to continue"""
+    Changes: List[ChangeLogEntry]
+    NextSince: int
+
+class DuplicateCandidate(BaseModel):
+    """Document whose content is probably a near copy; Similarity estimates Jaccard similarity"""
+    DocumentId: int
+    Similarity: float
+
+class DuplicateGroup(BaseModel):
+    """Documents linked as near duplicates; Similarity is the weakest link in the group"""
+    DocumentIds: List[int]
+    Similarity: float
+
+class FacetBucket(BaseModel):
+    """Live documents sharing one facet value; Key is None where the value is unset"""
+    Key: Optional[str] = None
+    Label: Optional[str] = None
+    DocumentCount: int
+    TotalBytes: int
+
+class DocumentStatistics(BaseModel):
+    """Live document counts and sizes, overall and per facet"""
+    DocumentCount: int
+    TotalBytes: int
+    DocumentTypes: List[FacetBucket]
+    CreatedMonths: List[FacetBucket]
+    FileTypes: List[FacetBucket]
+
+# The values allowed by the CHK_DataType constraint
+MetadataDataType = Literal["string", "number", "date", "boolean", "json"]
+
+class MetadataEntry(BaseModel):
+    """One typed metadata value; Value is coerced to DataType before it is stored"""
+    MetadataKey: constr(min_length=1, max_length=100)
+    Value: Any = None
+    DataType: MetadataDataType = "string"
+
+class DocumentMetadataSet(BaseModel):
+    """Metadata written to one document; keys not listed are left unchanged"""
+    DocumentId: int
+    Entries: List[MetadataEntry] = Field(min_length=1, max_length=500)
+
+class MetadataUpsertRequest(BaseModel):
+    """Metadata for many documents, inserted or overwritten key by key"""
+    Documents: List[DocumentMetadataSet] = Field(min_length=1, max_length=1000)
+
+class MetadataUpsertResult(BaseModel):
+    """Entries written, and documents skipped because they are missing or deleted"""
+    Upserted: int
+    SkippedDocumentIds: List[int]
+
+class MetadataBatchGetRequest(BatchGetRequest):
+    """Documents whose metadata to read, optionally only some keys"""
+    Keys: Optional[List[constr(min_length=1, max_length=100)]] = Field(None, min_length=1, max_length=500)
+
+class MetadataValue(BaseModel):
+    """Stored metadata value converted back to its DataType"""
+    Value: Any = None
+    DataType: str
+
+class Token(BaseModel):
+    """Bearer access token issued on login"""
+    access_token: str
+    token_type: str = "bearer"
+
 # Update Schemas - Define allowed fields for resource updates
 class UserUpdate(BaseModel):
     """Optional fields that can be updated for a user"""
@@ -0,0 +1,159 @@
+"""
+Activity Tracking Service
+
+This module records login and document access times without a write per request, including:
+- An in-memory write-behind buffer keyed by UserId and DocumentId
+- Coalescing of repeated activity to the latest timestamp per row
+- Bulk UPDATE flushes on an interval, at a size threshold and at shutdown
+- Monotonic updates so a late flush never moves a timestamp backwards
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Optional, Tuple
+import asyncio
+import logging
+
+import sqlalchemy as sa
+
+from app import models
+from app.core.config import settings
+
+logger = logging.getLogger('app')
+
+def _timestamp_update(model, key_column: str, timestamp_column: str):
+    """Executemany UPDATE that only ever moves a timestamp forward"""
+    table = model.__table__
+    column = table.c[timestamp_column]
+    return sa.update(table).where(
+        table.c[key_column] == sa.bindparam("row_id"),
+        sa.or_(column.is_(None), column < sa.bindparam("seen"))
+    ).values({timestamp_column: sa.bindparam("seen")})
+
+class ActivityBuffer:
+    """Coalesces activity timestamps in memory and writes them in bulk"""
+
+    def __init__(self, flush_interval: float, flush_threshold: int):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._logins: Dict[int, datetime] = {}
+        self._accesses: Dict[int, datetime] = {}
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _record(self, pending: Dict[int, datetime], key: int, seen: Optional[datetime]) -> None:
+        seen = seen or datetime.utcnow()
+        with self._lock:
+            previous = pending.get(key)
+            if previous is None or previous < seen:
+                pending[key] = seen
+            size = len(self._logins) + len(self._accesses)
+        wakeup, loop = self._wakeup, self._loop
+        if size >= self.flush_threshold and wakeup is not None:
+            # Callers may be sync endpoints running in the threadpool
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def record_login(self, user_id: int, seen: Optional[datetime] = None) -> None:
+        """
+        Record a successful login
+        
+        Args:
+            user_id: ID of the user that logged in
+            seen: Login time, defaults to now
+        """
+        self._record(self._logins, user_id, seen)
+
+    def record_access(self, document_id: int, seen: Optional[datetime] = None) -> None:
+        """
+        Record a document being read
+        
+        Args:
+            document_id: ID of the document accessed
+            seen: Access time, defaults to now
+        """
+        self._record(self._accesses, document_id, seen)
+
+    def _take(self) -> Tuple[Dict[int, datetime], Dict[int, datetime]]:
+        with self._lock:
+            logins, self._logins = self._logins, {}
+            accesses, self._accesses = self._accesses, {}
+        return logins, accesses
+
+    def _restore(self, logins: Dict[int, datetime], accesses: Dict[int, datetime]) -> None:
+        """Put back entries from a failed flush without overwriting newer ones"""
+        with self._lock:
+            for pending, failed in ((self._logins, logins), (self._accesses, accesses)):
+                for key, seen in failed.items():
+                    if key not in pending or pending[key] < seen:
+                        pending[key] = seen
+
+    def flush(self) -> int:
+        """
+        Write pending timestamps to the primary database
+        
+        Returns:
+            int: Number of buffered entries written
+        """
+        # Imported here so the buffer can be created before the engine
+        from app.db.database import get_engine
+
+        with self._flush_lock:
+            logins, accesses = self._take()
+            if not logins and not accesses:
+                return 0
+            try:
+                with get_engine().begin() as connection:
+                    for model, key, column, pending in (
+                        (models.User, "UserId", "LastLoginDate", logins),
+                        (models.Document, "DocumentId", "LastAccessedDate", accesses),
+                    ):
+                        if pending:
+                            connection.execute(
+                                _timestamp_update(model, key, column),
+                                [{"row_id": row_id, "seen": seen} for row_id, seen in pending.items()]
+                            )
+            except Exception as e:
+                logger.error(f"Activity flush failed, will retry: {e}")
+                self._restore(logins, accesses)
+                return 0
+            return len(logins) + len(accesses)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await asyncio.to_thread(self.flush)
+
+    def start(self) -> None:
+        """Start the background flusher on the running event loop"""
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background flusher and write whatever is still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        await asyncio.to_thread(self.flush)
+
+# Process-wide buffer shared by the services
+activity_buffer = ActivityBuffer(
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    flush_threshold=settings.ACTIVITY_FLUSH_THRESHOLD
+)
@@ -0,0 +1,118 @@
+"""
+Authentication Service Layer
+
+This module handles user authentication business logic, including:
+- Credential verification through the password hashing pool
+- Reuse of recently verified credentials without re-running bcrypt
+- Transparent rehashing when the bcrypt cost factor changes
+- Buffered LastLoginDate tracking
+- Access token issuance and resolution of the current user
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from typing import Optional
+import asyncio
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.security import (
+    create_access_token,
+    credential_cache,
+    decode_access_token,
+    password_hasher
+)
+from app.services.activity_service import activity_buffer
+
+async def authenticate_user(db: Session, username: str, password: str) -> Optional[models.User]:
+    """
+    Verify a username and password
+    
+    bcrypt runs in the password hashing pool and the database work in a
+    worker thread, so neither blocks the event loop.
+    
+    Args:
+        db: Database session
+        username: Login name
+        password: Plain text password
+    
+    Returns:
+        models.User: Authenticated user, or None if the credentials are invalid
+    """
+    db_user = await asyncio.to_thread(_active_user, db, username)
+    if not db_user:
+        # Keep response times the same for unknown usernames
+        await password_hasher.verify_dummy(password)
+        return None
+
+    if credential_cache.check(username, password, db_user.PasswordHash):
+        return db_user
+
+    verified, new_hash = await password_hasher.verify(password, db_user.PasswordHash)
+    if not verified:
+        return None
+
+    if new_hash:
+        # Stored hash used an outdated cost factor; upgrade it while we have the password
+        await asyncio.to_thread(_save_rehash, db, db_user, new_hash)
+
+    credential_cache.add(username, password, db_user.PasswordHash)
+    return db_user
+
+def _active_user(db: Session, username: str) -> Optional[models.User]:
+    return db.query(models.User).filter(
+        models.User.Username == username,
+        models.User.IsActive == True
+    ).first()
+
+def _save_rehash(db: Session, db_user: models.User, new_hash: str) -> None:
+    db_user.PasswordHash = new_hash
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+    # Reload here: the commit expired the attributes and the caller reads them on the event loop
+    db.refresh(db_user)
+
+async def login(db: Session, username: str, password: str) -> Optional[dict]:
+    """
+    Authenticate a user and issue an access token
+    
+    Args:
+        db: Database session
+        username: Login name
+        password: Plain text password
+    
+    Returns:
+        dict: Bearer token response, or None if the credentials are invalid
+    """
+    db_user = await authenticate_user(db, username, password)
+    if not db_user:
+        return None
+    # LastLoginDate is written by the next bulk flush, not by this request
+    activity_buffer.record_login(db_user.UserId)
+    return {
+        "access_token": create_access_token(db_user.UserId),
+        "token_type": "bearer"
+    }
+
+def get_user_from_token(db: Session, token: str) -> Optional[models.User]:
+    """
+    Resolve the active user a token was issued to
+    
+    Args:
+        db: Database session
+        token: Encoded access token
+    
+    Returns:
+        models.User: Token owner, or None if the token or user is not valid
+    """
+    claims = decode_access_token(token)
+    if not claims or "sub" not in claims:
+        return None
+    return db.query(models.User).filter(
+        models.User.UserId == int(claims["sub"]),
+        models.User.IsActive == True
+    ).first()
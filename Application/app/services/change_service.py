@@ -0,0 +1,218 @@
+"""
+Change Feed Service
+
+This module maintains the change log that downstream mirrors sync from, including:
+- Recording create, update and delete changes in the caller's transaction
+- Reading changes after a sequence number without skipping late commits
+- Waking long-polling readers when a worker on this host commits a change
+- Compaction of changes superseded by a newer change to the same entity
+
+Sequence numbers are identity values, assigned when a row is inserted rather
+than when its transaction commits, so a lower number can become visible after
+a higher one. Readers therefore stop at a gap in the sequence until the rows
+after it are older than CHANGE_FEED_SETTLE_SECONDS.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, List, Optional
+import asyncio
+
+from sqlalchemy import event, exists, func
+from sqlalchemy.orm import Session, aliased
+
+from app import models
+from app.core.config import settings
+from app.core.worker_channel import worker_channel
+
+# Entity types recorded in ChangeLog.EntityType
+ENTITY_DOCUMENT = "document"
+ENTITY_USER = "user"
+ENTITY_DOCUMENT_TYPE = "document_type"
+ENTITY_TYPES = [ENTITY_DOCUMENT, ENTITY_USER, ENTITY_DOCUMENT_TYPE]
+
+# Operations recorded in ChangeLog.Operation
+OPERATION_CREATE = "create"
+OPERATION_UPDATE = "update"
+OPERATION_DELETE = "delete"
+
+# Session.info flag set when a transaction recorded changes
+_PENDING_KEY = "change_log_pending"
+
+class ChangeNotifier:
+    """
+    Wakes long-polling readers after changes are committed
+
+    Commits in other workers on the same host arrive through the worker
+    channel; elsewhere readers fall back on CHANGE_FEED_POLL_SECONDS.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self._lock = Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+
+    def notify(self, broadcast: bool = True) -> None:
+        """Signal committed changes, here and (if broadcast) in other workers; safe to call from any thread"""
+        with self._lock:
+            self.generation += 1
+            loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake)
+        if broadcast:
+            worker_channel.publish("changes")
+
+    def _wake(self) -> None:
+        if self._event is not None:
+            self._event.set()
+            self._event = None
+
+    async def wait(self, generation: int, timeout: float) -> None:
+        """
+        Wait until a change is committed after a generation was observed
+
+        Args:
+            generation: Value of self.generation read before checking for changes
+            timeout: Maximum seconds to wait
+        """
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            if self.generation != generation:
+                return
+        if self._event is None:
+            self._event = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+# Process-wide notifier
+change_notifier = ChangeNotifier()
+worker_channel.subscribe("changes", lambda: change_notifier.notify(broadcast=False))
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        change_notifier.notify()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+def record_change(db: Session, entity_type: str, entity_id: int, operation: str) -> None:
+    """
+    Add a change to the caller's transaction
+
+    The row is written by the caller's commit, so the change is recorded if
+    and only if the change itself is. New entities must be flushed first so
+    their ID is known.
+
+    Args:
+        db: Database session holding the change
+        entity_type: One of ENTITY_TYPES
+        entity_id: ID of the changed entity
+        operation: OPERATION_CREATE, OPERATION_UPDATE or OPERATION_DELETE
+    """
+    db.add(models.ChangeLog(
+        EntityType=entity_type,
+        EntityId=entity_id,
+        Operation=operation,
+        ChangedDate=datetime.utcnow()
+    ))
+    db.info[_PENDING_KEY] = True
+
+def latest_change_id(db: Session) -> int:
+    """Highest ChangeId recorded so far (0 when the log is empty)"""
+    return db.query(func.max(models.ChangeLog.ChangeId)).scalar() or 0
+
+def get_changes(
+    db: Session,
+    since: int,
+    limit: int,
+    entity_types: Optional[List[str]] = None
+) -> Dict:
+    """
+    Read changes recorded after a sequence number
+
+    Args:
+        db: Database session
+        since: Return changes with a higher ChangeId (0 reads from the start)
+        limit: Maximum sequence numbers scanned
+        entity_types: Only return changes to these entity types
+
+    Returns:
+        dict: Changes in sequence order, and NextSince to pass on the next call
+    """
+    rows = db.query(models.ChangeLog).filter(
+        models.ChangeLog.ChangeId > since
+    ).order_by(models.ChangeLog.ChangeId).limit(limit).all()
+
+    # Gaps are scanned on the unfiltered sequence, so entity filtering happens afterwards
+    settled_before = datetime.utcnow() - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+    changes = []
+    next_since = since
+    for row in rows:
+        if row.ChangeId != next_since + 1 and row.ChangedDate > settled_before:
+            # The missing numbers may belong to transactions that have not committed yet
+            break
+        next_since = row.ChangeId
+        if entity_types is None or row.EntityType in entity_types:
+            changes.append(row)
+
+    return {"Changes": changes, "NextSince": next_since}
+
+def compact_changes(
+    db: Session,
+    older_than: Optional[timedelta] = None,
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    Delete changes superseded by a newer change to the same entity
+
+    A reader at any position still sees the latest change of every entity
+    changed after that position; only intermediate changes old enough that
+    live mirrors have read them are removed. Deletes are never superseded
+    unless the entity changed again.
+
+    Args:
+        db: Database session
+        older_than: Only compact changes older than this (defaults to CHANGE_LOG_COMPACT_AFTER_HOURS)
+        batch_size: Changes deleted per transaction (defaults to CHANGE_LOG_COMPACT_BATCH_SIZE)
+
+    Returns:
+        int: Number of changes removed
+    """
+    if older_than is None:
+        older_than = timedelta(hours=settings.CHANGE_LOG_COMPACT_AFTER_HOURS)
+    batch_size = batch_size or settings.CHANGE_LOG_COMPACT_BATCH_SIZE
+    cutoff = datetime.utcnow() - older_than
+
+    change = models.ChangeLog
+    newer = aliased(models.ChangeLog)
+    superseded = exists().where(
+        newer.EntityType == change.EntityType,
+        newer.EntityId == change.EntityId,
+        newer.ChangeId > change.ChangeId
+    )
+
+    removed = 0
+    last_id = 0
+    while True:
+        change_ids = [
+            change_id for (change_id,) in db.query(change.ChangeId).filter(
+                change.ChangeId > last_id,
+                change.ChangedDate < cutoff,
+                superseded
+            ).order_by(change.ChangeId).limit(batch_size)
+        ]
+        if not change_ids:
+            break
+        db.query(change).filter(change.ChangeId.in_(change_ids)).delete(synchronize_session=False)
+        db.commit()
+        removed += len(change_ids)
+        last_id = change_ids[-1]
+    return removed
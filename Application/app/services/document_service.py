@@ -2,30 +2,112 @@
 Document Service Layer
 
 This module handles document management business logic, including:
-- File upload and storage
+- File upload to the configured storage backend
 - Document creation and metadata management
 - Document retrieval and updates
 - Soft deletion functionality
 - Content hash verification
+- Background near-duplicate signing of new documents
+- Streaming catalogue export (NDJSON / CSV)
 
 Author: Marco Alejandro Santiago
 Created: February 7, 2025
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 from fastapi import UploadFile, HTTPException
-import hashlib
-import os
+from typing import Iterator, List, Optional, Sequence
+import asyncio
+import csv
+import io
+import json
+import logging
+import zlib
 from datetime import datetime
+from pathlib import Path
 
-from app.schemas.schemas import DocumentCreate, DocumentUpdate
+import sqlalchemy as sa
+
+from app.schemas.schemas import DocumentBase, DocumentCreate, DocumentUpdate
+from app.schemas.schemas import Document as DocumentSchema
+from app.schemas.schemas import DocumentMetadata as DocumentMetadataSchema
+from app.schemas.schemas import DocumentVersion as DocumentVersionSchema
 from app import models
 from app.core.config import settings
+from app.core.serialization import schema_columns
+from app.db.batching import chunked, load_by_ids
+from app.services import stats_service
+from app.services.change_service import ENTITY_DOCUMENT, OPERATION_CREATE, OPERATION_DELETE, OPERATION_UPDATE, record_change
+from app.services.duplicate_service import near_duplicates
+from app.services.tag_service import tag_index
+from app.services.text_service import text_extractor
+from app.storage import HashingReader, default_backend
+
+logger = logging.getLogger('app')
+
+def _insert_document(
+    db: Session,
+    document: DocumentBase,
+    backend,
+    key: str,
+    location: str,
+    size: int,
+    content_hash: str
+):
+    """
+    Write the Document row for a stored file
+
+    The stored file is deleted if the row is not committed. Once it is,
+    the file belongs to the row: indexing and background work that fail
+    afterwards are logged, not raised.
+    """
+    db_document = models.Document(
+        DocumentName=document.DocumentName,
+        FileLocation=location,
+        FileType=document.FileType,
+        FileSizeBytes=size,
+        ContentHash=content_hash,
+        DocumentTypeId=document.DocumentTypeId,
+        CreatedById=1,  # TODO: Replace with actual user ID from auth
+        LastModifiedById=1  # TODO: Replace with actual user ID from auth
+    )
+    
+    try:
+        db.add(db_document)
+        db.flush()
+        record_change(db, ENTITY_DOCUMENT, db_document.DocumentId, OPERATION_CREATE)
+        stats_service.record_document_change(db, None, stats_service.facets_of(db_document))
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        backend.delete(key)
+        # The only constraints a new row can violate are its foreign keys; don't echo the SQL
+        raise HTTPException(status_code=400, detail="Document type or user does not exist")
+    except Exception:
+        db.rollback()
+        backend.delete(key)
+        raise
+    db.refresh(db_document)
+    try:
+        tag_index.document_live(db_document.DocumentId, True)
+        # When both run, one extraction is shared: signing waits for it and reads the cached text
+        if settings.TEXT_EXTRACTION_ON_INGEST:
+            text_extractor.schedule(location, document.FileType, content_hash)
+        if settings.NEAR_DUPLICATE_INDEXING:
+            near_duplicates.schedule(db_document.DocumentId, location, document.FileType, content_hash)
+    except Exception as e:
+        # The tag index rebuilds periodically; manage.py backfills cover missed extraction and signing
+        logger.error(f"Post-commit indexing failed for document {db_document.DocumentId}: {e}")
+    return db_document
 
 async def create_document(db: Session, document: DocumentCreate, file: UploadFile):
     """
     Create a new document with file upload
     
+    The upload is streamed to the storage backend and hashed as it is
+    written, so memory use does not grow with the file size.
+    
     Args:
         db: Database session
         document: Document metadata and type information
@@ -35,44 +117,57 @@ async def create_document(db: Session, document: DocumentCreate, file: UploadFil
         models.Document: Created document instance
     
     Raises:
-        HTTPException: If file saving fails
+        HTTPException: If file saving fails or the document type or user does not exist
     """
-    # Create storage directory if it doesn't exist
-    os.makedirs(settings.STORAGE_DIR, exist_ok=True)
+    backend = default_backend()
+    key = backend.new_key(file.filename)
+    await file.seek(0)
+    reader = HashingReader(file.file)
     
-    # Generate unique filename using timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    file_extension = os.path.splitext(file.filename)[1]
-    storage_filename = f"{timestamp}{file_extension}"
-    file_path = settings.STORAGE_DIR / storage_filename
-    
-    # Save file to storage directory
+    # Save file to storage, calculating the SHA-256 hash on the way
     try:
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        location = await asyncio.to_thread(backend.put, key, reader)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
     
-    # Calculate SHA-256 hash for file integrity
-    content_hash = hashlib.sha256(content).hexdigest()
+    return _insert_document(db, document, backend, key, location, reader.size, reader.hexdigest())
+
+async def create_document_from_file(
+    db: Session,
+    document: DocumentBase,
+    staged_path: Path,
+    filename: str,
+    size: int,
+    content_hash: str
+):
+    """
+    Create a document from a file that was already received and hashed
     
-    # Create document record in database
-    db_document = models.Document(
-        DocumentName=document.DocumentName,
-        FileLocation=str(file_path),
-        FileType=document.FileType,
-        FileSizeBytes=len(content),
-        ContentHash=content_hash,
-        DocumentTypeId=document.DocumentTypeId,
-        CreatedById=1,  # TODO: Replace with actual user ID from auth
-        LastModifiedById=1  # TODO: Replace with actual user ID from auth
-    )
+    Used to finalize resumable uploads. The staged file is left in place, so
+    the upload can be completed again if the database insert fails.
     
-    db.add(db_document)
-    db.commit()
-    db.refresh(db_document)
-    return db_document
+    Args:
+        db: Database session
+        document: Document metadata and type information
+        staged_path: Complete file in the upload staging directory
+        filename: Original file name, used for the stored file's extension
+        size: File size in bytes
+        content_hash: SHA-256 hex digest of the file
+    
+    Returns:
+        models.Document: Created document instance
+    
+    Raises:
+        HTTPException: If the file cannot be stored or the document type or user does not exist
+    """
+    backend = default_backend()
+    key = backend.new_key(filename)
+    try:
+        location = await asyncio.to_thread(backend.put_file, key, staged_path)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
+    
+    return _insert_document(db, document, backend, key, location, size, content_hash)
 
 def get_documents(db: Session, skip: int = 0, limit: int = 100):
     """
@@ -86,10 +181,132 @@ def get_documents(db: Session, skip: int = 0, limit: int = 100):
     Returns:
         List[models.Document]: List of document instances
     """
-    return db.query(models.Document).filter(
+    # Ordered to match IX_Documents_Live_CreatedDate (and give OFFSET a stable order)
+    return db.query(models.Document).options(
+        selectinload(models.Document.versions),
+        selectinload(models.Document.metadata_entries)
+    ).filter(
         models.Document.IsDeleted == False
+    ).order_by(
+        models.Document.CreatedDate,
+        models.Document.DocumentId
     ).offset(skip).limit(limit).all()
 
+def _child_rows(db: Session, model, schema, document_ids):
+    """Rows of a per-document child table as schema-shaped dicts, grouped by DocumentId"""
+    fields = schema_columns(schema, model)
+    primary_key = model.__table__.primary_key.columns[0]
+    grouped = {}
+    for chunk in chunked(document_ids):
+        rows = db.query(*[getattr(model, field) for field in fields]).filter(
+            model.DocumentId.in_(chunk)
+        ).order_by(primary_key)
+        for row in rows:
+            record = dict(zip(fields, row))
+            grouped.setdefault(record["DocumentId"], []).append(record)
+    return grouped
+
+# Relations of schemas.Document that can be requested with include=
+DOCUMENT_RELATIONS = {
+    "versions": (models.DocumentVersion, DocumentVersionSchema),
+    "metadata": (models.DocumentMetadata, DocumentMetadataSchema),
+}
+
+def document_fields() -> List[str]:
+    """Scalar fields of schemas.Document that can be requested with fields="""
+    return schema_columns(DocumentSchema, models.Document)
+
+def parse_projection(fields: Optional[str], include: Optional[str]):
+    """
+    Validate the fields= and include= parameters of the document endpoints
+    
+    When only fields is given no relations are returned; when only include
+    is given every scalar field is returned alongside the listed relations.
+    
+    Args:
+        fields: Comma-separated scalar field names
+        include: Comma-separated relation names
+    
+    Returns:
+        tuple: (fields, include) in schema order, or None if neither was given
+    
+    Raises:
+        HTTPException: If a name is unknown or nothing would be returned
+    """
+    if fields is None and include is None:
+        return None
+
+    def split(value: Optional[str], allowed: List[str], parameter: str) -> List[str]:
+        names = {name.strip() for name in (value or "").split(",") if name.strip()}
+        unknown = names.difference(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown {parameter}: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}"
+            )
+        return [name for name in allowed if name in names]
+
+    all_fields = document_fields()
+    selected_fields = split(fields, all_fields, "fields") if fields is not None else all_fields
+    selected_include = split(include, list(DOCUMENT_RELATIONS), "include")
+    if not selected_fields and not selected_include:
+        raise HTTPException(status_code=400, detail="No fields requested")
+    return selected_fields, selected_include
+
+def get_document_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[Sequence[str]] = None,
+    include: Optional[Sequence[str]] = None,
+    document_id: Optional[int] = None
+):
+    """
+    Retrieve documents as plain dicts, selecting only the requested columns
+    
+    Produces the structure of schemas.Document (or the requested subset of
+    it) from column-only queries instead of ORM objects. Each requested
+    relation costs one batched query; unrequested relations are not loaded.
+    
+    Args:
+        db: Database session
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        fields: Scalar fields to return (defaults to all of them)
+        include: Relations to return, from DOCUMENT_RELATIONS (defaults to all of them)
+        document_id: Only return this document
+    
+    Returns:
+        List[dict]: Documents ordered like get_documents
+    """
+    fields = list(fields) if fields is not None else document_fields()
+    include = list(include) if include is not None else list(DOCUMENT_RELATIONS)
+    # Relations are joined back to their document by DocumentId
+    selected = fields if not include or "DocumentId" in fields else fields + ["DocumentId"]
+
+    query = db.query(*[getattr(models.Document, field) for field in selected]).filter(
+        models.Document.IsDeleted == False
+    )
+    if document_id is not None:
+        query = query.filter(models.Document.DocumentId == document_id)
+    rows = query.order_by(
+        models.Document.CreatedDate,
+        models.Document.DocumentId
+    ).offset(skip).limit(limit).all()
+
+    documents = [dict(zip(selected, row)) for row in rows]
+    if include:
+        document_ids = [document["DocumentId"] for document in documents]
+        for relation in include:
+            model, schema = DOCUMENT_RELATIONS[relation]
+            children = _child_rows(db, model, schema, document_ids)
+            for document in documents:
+                document[relation] = children.get(document["DocumentId"], [])
+        if selected is not fields:
+            for document in documents:
+                del document["DocumentId"]
+    return documents
+
 def get_document(db: Session, document_id: int):
     """
     Retrieve a specific non-deleted document by ID
@@ -106,6 +323,23 @@ def get_document(db: Session, document_id: int):
         models.Document.IsDeleted == False
     ).first()
 
+def get_documents_by_ids(db: Session, document_ids: List[int]):
+    """
+    Retrieve many non-deleted documents by ID, with versions and metadata
+    
+    Args:
+        db: Database session
+        document_ids: IDs of documents to retrieve
+    
+    Returns:
+        dict: models.Document instances keyed by DocumentId (missing IDs are absent)
+    """
+    query = db.query(models.Document).options(
+        selectinload(models.Document.versions),
+        selectinload(models.Document.metadata_entries)
+    ).filter(models.Document.IsDeleted == False)
+    return load_by_ids(query, models.Document.DocumentId, document_ids)
+
 def update_document(db: Session, document_id: int, document: DocumentUpdate):
     """
     Update a document's metadata
@@ -122,15 +356,25 @@ def update_document(db: Session, document_id: int, document: DocumentUpdate):
     if not db_document:
         return None
         
+    before = stats_service.facets_of(db_document)
     # Update only provided fields
     for field, value in document.dict(exclude_unset=True).items():
         setattr(db_document, field, value)
     
     db_document.LastModifiedDate = datetime.utcnow()
     db_document.LastModifiedById = 1  # TODO: Replace with actual user ID from auth
+    record_change(
+        db,
+        ENTITY_DOCUMENT,
+        document_id,
+        OPERATION_DELETE if db_document.IsDeleted else OPERATION_UPDATE
+    )
+    stats_service.record_document_change(db, before, stats_service.facets_of(db_document))
     
     db.commit()
     db.refresh(db_document)
+    if "IsDeleted" in document.dict(exclude_unset=True):
+        tag_index.document_live(document_id, not db_document.IsDeleted)
     return db_document
 
 def delete_document(db: Session, document_id: int) -> bool:
@@ -148,9 +392,122 @@ def delete_document(db: Session, document_id: int) -> bool:
     if not db_document:
         return False
         
+    before = stats_service.facets_of(db_document)
     db_document.IsDeleted = True
     db_document.LastModifiedDate = datetime.utcnow()
     db_document.LastModifiedById = 1  # TODO: Replace with actual user ID from auth
+    record_change(db, ENTITY_DOCUMENT, document_id, OPERATION_DELETE)
+    stats_service.record_document_change(db, before, None)
     
     db.commit()
-    return True
\ No newline at end of file
+    tag_index.document_live(document_id, False)
+    return True
+
+# Columns written by the catalogue export, in output order
+EXPORT_COLUMNS = [
+    "DocumentId",
+    "DocumentName",
+    "FileLocation",
+    "FileType",
+    "FileSizeBytes",
+    "ContentHash",
+    "DocumentTypeId",
+    "CreatedDate",
+    "CreatedById",
+    "LastModifiedDate",
+    "LastModifiedById",
+    "LastAccessedDate",
+    "IsDeleted",
+]
+
+def _ndjson_chunk(rows) -> bytes:
+    lines = []
+    for row in rows:
+        record = dict(zip(EXPORT_COLUMNS, row))
+        for name in ("CreatedDate", "LastModifiedDate", "LastAccessedDate"):
+            if record[name] is not None:
+                record[name] = record[name].isoformat()
+        lines.append(json.dumps(record, separators=(",", ":")))
+    lines.append("")
+    return "\n".join(lines).encode()
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+def export_documents(
+    db: Session,
+    export_format: str = "ndjson",
+    document_type_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    modified_since: Optional[datetime] = None,
+    include_deleted: bool = False,
+    compress: bool = False,
+    batch_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Stream the document catalogue with constant memory
+    
+    Rows are read through a server-side cursor in batches of batch_size and
+    encoded one batch at a time; nothing is accumulated across batches.
+    
+    Args:
+        db: Database session, kept open until the iterator is exhausted
+        export_format: "ndjson" or "csv" (with a header row)
+        document_type_id: Only export documents of this type
+        created_from: Only export documents created at or after this time
+        created_to: Only export documents created before this time
+        modified_since: Only export documents modified at or after this time
+        include_deleted: Also export soft-deleted documents
+        compress: Gzip the stream
+        batch_size: Rows per fetch (defaults to EXPORT_BATCH_SIZE)
+    
+    Yields:
+        bytes: Encoded (and optionally compressed) output chunks
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    query = sa.select(*[getattr(models.Document, name) for name in EXPORT_COLUMNS])
+    if not include_deleted:
+        query = query.where(models.Document.IsDeleted == False)
+    if document_type_id is not None:
+        query = query.where(models.Document.DocumentTypeId == document_type_id)
+    if created_from is not None:
+        query = query.where(models.Document.CreatedDate >= created_from)
+    if created_to is not None:
+        query = query.where(models.Document.CreatedDate < created_to)
+    if modified_since is not None:
+        query = query.where(models.Document.LastModifiedDate >= modified_since)
+    query = query.order_by(models.Document.DocumentId).execution_options(yield_per=batch_size)
+
+    encode = _csv_chunk if export_format == "csv" else _ndjson_chunk
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31: gzip framing
+
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    if export_format == "csv":
+        yield emit(_csv_chunk([EXPORT_COLUMNS]))
+
+    result = db.execute(query)
+    try:
+        for partition in result.partitions():
+            chunk = emit(encode(partition))
+            if chunk:
+                yield chunk
+    finally:
+        result.close()
+
+    if compressor:
+        yield compressor.flush()
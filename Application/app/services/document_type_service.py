@@ -15,9 +15,14 @@ Created: February 7, 2025
 from sqlalchemy.orm import Session
 from datetime import datetime
 from fastapi import HTTPException
+from typing import List
 
 from app import models
+from app.core.serialization import schema_columns
+from app.db.batching import load_by_ids
+from app.schemas.schemas import DocumentType as DocumentTypeSchema
 from app.schemas.schemas import DocumentTypeCreate, DocumentTypeUpdate
+from app.services.change_service import ENTITY_DOCUMENT_TYPE, OPERATION_CREATE, OPERATION_DELETE, OPERATION_UPDATE, record_change
 
 def create_document_type(db: Session, document_type: DocumentTypeCreate):
     """
@@ -43,6 +48,8 @@ def create_document_type(db: Session, document_type: DocumentTypeCreate):
     )
     try:
         db.add(db_type)
+        db.flush()
+        record_change(db, ENTITY_DOCUMENT_TYPE, db_type.DocumentTypeId, OPERATION_CREATE)
         db.commit()
         db.refresh(db_type)
         return db_type
@@ -64,7 +71,25 @@ def get_document_types(db: Session, skip: int = 0, limit: int = 100):
     """
     return db.query(models.DocumentType).filter(
         models.DocumentType.IsActive == True
-    ).offset(skip).limit(limit).all()
+    ).order_by(models.DocumentType.DocumentTypeId).offset(skip).limit(limit).all()
+
+def get_document_type_rows(db: Session, skip: int = 0, limit: int = 100):
+    """
+    Retrieve a page of active document types as plain dicts for the fast list response path
+    
+    Args:
+        db: Database session
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+    
+    Returns:
+        List[dict]: Document types shaped like schemas.DocumentType, ordered like get_document_types
+    """
+    fields = schema_columns(DocumentTypeSchema, models.DocumentType)
+    rows = db.query(*[getattr(models.DocumentType, field) for field in fields]).filter(
+        models.DocumentType.IsActive == True
+    ).order_by(models.DocumentType.DocumentTypeId).offset(skip).limit(limit).all()
+    return [dict(zip(fields, row)) for row in rows]
 
 def get_document_type(db: Session, type_id: int):
     """
@@ -82,6 +107,20 @@ def get_document_type(db: Session, type_id: int):
         models.DocumentType.IsActive == True
     ).first()
 
+def get_document_types_by_ids(db: Session, type_ids: List[int]):
+    """
+    Retrieve many active document types by ID
+    
+    Args:
+        db: Database session
+        type_ids: IDs of document types to retrieve
+    
+    Returns:
+        dict: models.DocumentType instances keyed by DocumentTypeId (missing IDs are absent)
+    """
+    query = db.query(models.DocumentType).filter(models.DocumentType.IsActive == True)
+    return load_by_ids(query, models.DocumentType.DocumentTypeId, type_ids)
+
 def update_document_type(db: Session, type_id: int, document_type: DocumentTypeUpdate):
     """
     Update a document type's attributes
@@ -106,6 +145,7 @@ def update_document_type(db: Session, type_id: int, document_type: DocumentTypeU
         setattr(db_type, field, value)
     
     db_type.LastModifiedDate = datetime.utcnow()
+    record_change(db, ENTITY_DOCUMENT_TYPE, type_id, OPERATION_UPDATE if db_type.IsActive else OPERATION_DELETE)
     
     try:
         db.commit()
@@ -132,6 +172,7 @@ def delete_document_type(db: Session, type_id: int) -> bool:
         
     db_type.IsActive = False
     db_type.LastModifiedDate = datetime.utcnow()
+    record_change(db, ENTITY_DOCUMENT_TYPE, type_id, OPERATION_DELETE)
     
     try:
         db.commit()
@@ -0,0 +1,609 @@
+"""
+Near-duplicate Detection Service
+
+This module finds documents whose content is nearly the same, including:
+- Vectorised MinHash signatures over word shingles (text, including text
+  extracted from PDF, DOCX and HTML) or sampled byte shingles (other
+  binary content), computed in the background at ingest
+- An append-only signature file under MINHASH_DIR, memory-mapped so every
+  worker process shares one copy through the page cache
+- LSH banding to find candidates, verified by signature agreement
+- Possible duplicates of one document and a corpus-wide duplicate report
+
+ContentHash still catches byte-identical files; this catches rescans,
+re-saved files and lightly edited copies. Similarity is the estimated
+Jaccard similarity of the two documents' shingle sets.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import codecs
+import logging
+import os
+import re
+import zlib
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.core.startup import defer_import
+from app.core.text_extraction import STATUS_OK
+from app.db.batching import chunked
+from app.services.text_service import text_extractor
+from app.storage import resolve
+
+logger = logging.getLogger('app')
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Imported by the functions below on first signature or query, not when the API starts
+defer_import("numpy")
+
+_WORD = re.compile(r"\w+")
+# uint64 constants; plain ints so defining them does not load numpy
+_MAX64 = 0xFFFFFFFFFFFFFFFF
+_SHIFT32 = 32
+_MIX = 0x9E3779B97F4A7C15
+_ROLL = 0x100000001B3
+# Shingles hashed against all permutations at once; bounds the (block x permutations) matrix
+_BLOCK = 4096
+# Runs of equal band hashes up to this size are verified pairwise, larger ones against their first member
+_PAIRWISE_LIMIT = 256
+
+def _rolling(values: "np.ndarray", width: int) -> "np.ndarray":
+    """Hash every window of `width` consecutive values to 32 bits"""
+    import numpy as np
+
+    count = len(values) - width + 1
+    combined = np.zeros(count, dtype=np.uint64)
+    for offset in range(width):
+        combined = combined * _ROLL + values[offset:offset + count]
+    combined *= _MIX
+    return combined >> _SHIFT32
+
+def _distinct(values: "np.ndarray") -> "np.ndarray":
+    """Sorted distinct values (a plain sort is much faster than np.unique here)"""
+    import numpy as np
+
+    values = np.sort(values)
+    if len(values):
+        values = values[np.r_[True, values[1:] != values[:-1]]]
+    return values
+
+def _grow(array: "np.ndarray", needed: int) -> "np.ndarray":
+    """Return an array with room for `needed` rows, doubling capacity to keep appends cheap"""
+    import numpy as np
+
+    if len(array) >= needed:
+        return array
+    grown = np.zeros((max(needed, 2 * len(array), 1024),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+def _decode_text(data: bytes) -> Optional[str]:
+    """Content as text if it is UTF-8 without NUL bytes, else None"""
+    if b"\x00" in data[:8192]:
+        return None
+    try:
+        # Incremental, so a character cut off at MINHASH_MAX_BYTES is not an error
+        return codecs.getincrementaldecoder("utf-8")().decode(data, final=False)
+    except UnicodeDecodeError:
+        return None
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures of every signed document, with LSH band hashes
+
+    Signatures are appended to one file of fixed-size records; a document
+    signed again supersedes its earlier record. Each process maps the file
+    and picks up records appended by other processes on its next query.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        permutations: int,
+        bands: int,
+        shingle_words: int,
+        shingle_bytes: int,
+        byte_sample: int,
+        max_bytes: int,
+        workers: int,
+        use_text: bool
+    ):
+        if permutations % bands:
+            raise ValueError("MINHASH_BANDS must divide MINHASH_PERMUTATIONS")
+        self.directory = Path(directory)
+        self.permutations = permutations
+        self.bands = bands
+        self.rows = permutations // bands
+        self.shingle_words = shingle_words
+        self.shingle_bytes = shingle_bytes
+        self.byte_sample = byte_sample
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.use_text = use_text
+
+        self._lock = Lock()
+        self._count = 0
+        self._records: Optional["np.ndarray"] = None
+        self._band_hashes: Optional["np.ndarray"] = None
+        self._current: Optional["np.ndarray"] = None
+        self._latest: Dict[int, int] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+
+    @cached_property
+    def dtype(self) -> "np.dtype":
+        import numpy as np
+
+        return np.dtype([("DocumentId", "<i8"), ("Signature", "<u4", (self.permutations,))])
+
+    @cached_property
+    def _hash_parameters(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        import numpy as np
+
+        # Fixed seed: signatures must stay comparable across processes and restarts.
+        # Each permutation is a multiply-shift hash: (a * x + b) mod 2**64 with odd a.
+        rng = np.random.default_rng(20261019)
+        a = rng.integers(0, 1 << 63, self.permutations, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        b = rng.integers(0, 1 << 63, self.permutations, dtype=np.uint64)
+        return a, b
+
+    @property
+    def path(self) -> Path:
+        # Parameters are part of the name: signatures made with other settings are not comparable
+        return self.directory / (
+            f"signatures-p{self.permutations}-w{self.shingle_words}"
+            f"-b{self.shingle_bytes}-s{self.byte_sample}{'-t' if self.use_text else ''}.bin"
+        )
+
+    def shingles(self, data: bytes) -> "np.ndarray":
+        """
+        Hash the shingles of some content
+
+        Args:
+            data: Document content (at most MINHASH_MAX_BYTES)
+
+        Returns:
+            np.ndarray: Distinct 32-bit shingle hashes
+        """
+        import numpy as np
+
+        text = _decode_text(data)
+        if text is not None:
+            words = _WORD.findall(text.lower())
+            if not words:
+                return np.zeros(0, dtype=np.uint64)
+            word_hashes = np.fromiter(
+                (zlib.crc32(word.encode()) for word in words), dtype=np.uint64, count=len(words)
+            )
+            return _distinct(_rolling(word_hashes, min(self.shingle_words, len(words))))
+
+        content = np.frombuffer(data, dtype=np.uint8).astype(np.uint64)
+        if len(content) < self.shingle_bytes:
+            return np.zeros(0, dtype=np.uint64)
+        hashes = _rolling(content, self.shingle_bytes)
+        if self.byte_sample > 1:
+            hashes = hashes[hashes % np.uint64(self.byte_sample) == 0]
+        return _distinct(hashes)
+
+    def signature(self, data: bytes) -> Optional["np.ndarray"]:
+        """
+        Compute the MinHash signature of some content
+
+        Args:
+            data: Document content
+
+        Returns:
+            np.ndarray: uint32 signature, or None if the content has no shingles
+        """
+        import numpy as np
+
+        hashes = self.shingles(data)
+        if not len(hashes):
+            return None
+        a, b = self._hash_parameters
+        minimum = np.full(self.permutations, _MAX64, dtype=np.uint64)
+        for start in range(0, len(hashes), _BLOCK):
+            # Wrapping uint64 arithmetic is the mod 2**64; in place to avoid temporaries
+            permuted = hashes[start:start + _BLOCK, None] * a
+            permuted += b
+            np.minimum(minimum, permuted.min(axis=0), out=minimum)
+        # The high bits are the well-mixed ones; shifting after the minimum keeps the order
+        return (minimum >> _SHIFT32).astype(np.uint32)
+
+    def _band_hash(self, signatures: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+
+        banded = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        combined = np.zeros(banded.shape[:2], dtype=np.uint64)
+        for row in range(self.rows):
+            combined = combined * _ROLL + banded[:, :, row]
+        return combined
+
+    def add(self, document_id: int, signature: "np.ndarray") -> None:
+        """
+        Append a document's signature to the index file
+
+        Args:
+            document_id: Signed document
+            signature: Its MinHash signature
+        """
+        import numpy as np
+
+        record = np.zeros(1, dtype=self.dtype)
+        record["DocumentId"] = document_id
+        record["Signature"] = signature
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # One write with O_APPEND, so records from several processes never interleave
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            os.write(fd, record.tobytes())
+        finally:
+            os.close(fd)
+
+    def _refresh(self) -> None:
+        """Map records appended since the last call; the caller holds the lock"""
+        import numpy as np
+
+        if self._band_hashes is None:
+            self._band_hashes = np.zeros((0, self.bands), dtype=np.uint64)
+            self._current = np.zeros(0, dtype=bool)
+        try:
+            count = self.path.stat().st_size // self.dtype.itemsize
+        except FileNotFoundError:
+            count = 0
+        if count <= self._count:
+            return
+        records = np.memmap(self.path, dtype=self.dtype, mode="r", shape=(count,))
+        added = records[self._count:]
+        self._band_hashes = _grow(self._band_hashes, count)
+        self._band_hashes[self._count:count] = self._band_hash(added["Signature"])
+        self._current = _grow(self._current, count)
+        self._current[self._count:count] = True
+        for row, document_id in enumerate(added["DocumentId"].tolist(), start=self._count):
+            previous = self._latest.get(document_id)
+            if previous is not None:
+                self._current[previous] = False
+            self._latest[document_id] = row
+        self._records = records
+        self._count = count
+
+    def _snapshot(self):
+        """Records, band hashes and current-row mask as of now; the caller holds the lock"""
+        self._refresh()
+        count = self._count
+        return self._records, self._band_hashes[:count], self._current[:count].copy()
+
+    def is_indexed(self, document_id: int) -> bool:
+        with self._lock:
+            self._refresh()
+            return document_id in self._latest
+
+    def similar(self, document_id: int, threshold: float) -> Optional[List[Tuple[int, float]]]:
+        """
+        Find documents whose signatures agree with a document's
+
+        Args:
+            document_id: Document to compare against the rest
+            threshold: Minimum estimated similarity
+
+        Returns:
+            list: (DocumentId, similarity) pairs, most similar first, or None
+            if the document has not been signed
+        """
+        import numpy as np
+
+        with self._lock:
+            records, band_hashes, current = self._snapshot()
+            row = self._latest.get(document_id)
+            if row is None:
+                return None
+
+        # Candidates share at least one whole band with the document
+        candidates = np.flatnonzero((band_hashes == band_hashes[row]).any(axis=1) & current)
+        candidates = candidates[candidates != row]
+        if not len(candidates):
+            return []
+        signatures = records["Signature"]
+        similarity = (signatures[candidates] == signatures[row]).mean(axis=1)
+        keep = similarity >= threshold
+        matches = sorted(
+            zip(records["DocumentId"][candidates[keep]].tolist(), similarity[keep].tolist()),
+            key=lambda match: -match[1]
+        )
+        return [(match_id, round(score, 4)) for match_id, score in matches]
+
+    def groups(self, threshold: float) -> List[Tuple[List[int], float]]:
+        """
+        Cluster every signed document with its near duplicates
+
+        Args:
+            threshold: Minimum estimated similarity for two documents to be linked
+
+        Returns:
+            list: (DocumentIds, lowest similarity of a link in the group) per group
+        """
+        import numpy as np
+
+        with self._lock:
+            records, band_hashes, current = self._snapshot()
+        if records is None:
+            return []
+        rows = np.flatnonzero(current)
+        signatures = records["Signature"]
+        parent = np.arange(len(current))
+        weakest: Dict[int, float] = {}
+
+        def find(row: int) -> int:
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        def link(left: int, right: int, score: float) -> None:
+            left, right = find(left), find(right)
+            if left != right:
+                parent[right] = left
+                weakest[left] = min(score, weakest.get(left, 1.0), weakest.pop(right, 1.0))
+
+        for band in range(self.bands):
+            hashes = band_hashes[rows, band]
+            order = np.argsort(hashes, kind="stable")
+            sorted_hashes = hashes[order]
+            # Runs of rows sharing this band's hash
+            starts = np.flatnonzero(np.r_[True, sorted_hashes[1:] != sorted_hashes[:-1]])
+            ends = np.r_[starts[1:], len(order)]
+            for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+                members = rows[order[start:end]]
+                member_signatures = signatures[members]
+                if len(members) <= _PAIRWISE_LIMIT:
+                    similarity = (member_signatures[:, None, :] == member_signatures[None, :, :]).mean(axis=2)
+                    left, right = np.nonzero(np.triu(similarity >= threshold, k=1))
+                    for i, j in zip(left.tolist(), right.tolist()):
+                        link(members[i], members[j], float(similarity[i, j]))
+                else:
+                    similarity = (member_signatures == member_signatures[0]).mean(axis=1)
+                    for i in np.flatnonzero(similarity >= threshold)[1:].tolist():
+                        link(members[0], members[i], float(similarity[i]))
+
+        clusters: Dict[int, List[int]] = {}
+        for row in rows.tolist():
+            root = find(row)
+            if root != row or root in weakest:
+                clusters.setdefault(root, []).append(row)
+        document_ids = records["DocumentId"]
+        return [
+            (sorted(document_ids[members].tolist()), round(weakest[root], 4))
+            for root, members in clusters.items()
+            if len(members) > 1
+        ]
+
+    def read_content(
+        self,
+        location: str,
+        file_type: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> bytes:
+        """
+        Content to sign: the extracted text if there is any, else up to MINHASH_MAX_BYTES of the file
+
+        Args:
+            location: FileLocation of the file
+            file_type: Declared FileType
+            content_hash: ContentHash, so cached text is reused
+
+        Returns:
+            bytes: Content to shingle
+        """
+        if self.use_text:
+            extracted = text_extractor.extract(location, file_type, content_hash)
+            if extracted.status == STATUS_OK and extracted.text.strip():
+                return extracted.text.encode("utf-8")[:self.max_bytes]
+        backend, key = resolve(location)
+        return b"".join(backend.read(key, 0, self.max_bytes))
+
+    def index_document(
+        self,
+        document_id: int,
+        location: str,
+        file_type: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> bool:
+        """
+        Sign a stored document and add it to the index
+
+        Args:
+            document_id: Document to sign
+            location: Its FileLocation
+            file_type: Its FileType
+            content_hash: Its ContentHash
+
+        Returns:
+            bool: True if a signature was stored, False if the content has no shingles
+        """
+        signature = self.signature(self.read_content(location, file_type, content_hash))
+        if signature is None:
+            return False
+        self.add(document_id, signature)
+        return True
+
+    def _index_logged(
+        self,
+        document_id: int,
+        location: str,
+        file_type: Optional[str],
+        content_hash: Optional[str]
+    ) -> None:
+        try:
+            self.index_document(document_id, location, file_type, content_hash)
+        except Exception as e:
+            logger.error(f"Near-duplicate signing failed for document {document_id}: {e}")
+
+    def schedule(
+        self,
+        document_id: int,
+        location: str,
+        file_type: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> None:
+        """Sign a newly stored document in the background"""
+        with self._lock:
+            # Threads do not survive fork, so an inherited executor is replaced
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor_pid = os.getpid()
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="minhash")
+            executor = self._executor
+        executor.submit(self._index_logged, document_id, location, file_type, content_hash)
+
+    def shutdown(self) -> None:
+        """Finish queued signing work and stop the background threads"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+# Process-wide index
+near_duplicates = NearDuplicateIndex(
+    directory=settings.MINHASH_DIR,
+    permutations=settings.MINHASH_PERMUTATIONS,
+    bands=settings.MINHASH_BANDS,
+    shingle_words=settings.MINHASH_SHINGLE_WORDS,
+    shingle_bytes=settings.MINHASH_SHINGLE_BYTES,
+    byte_sample=settings.MINHASH_BYTE_SAMPLE,
+    max_bytes=settings.MINHASH_MAX_BYTES,
+    workers=settings.MINHASH_WORKERS,
+    use_text=settings.NEAR_DUPLICATE_USE_TEXT
+)
+
+def _live_documents(db: Session, document_ids: List[int]) -> set:
+    live = set()
+    for chunk in chunked(sorted(set(document_ids))):
+        live.update(
+            document_id for (document_id,) in db.query(models.Document.DocumentId).filter(
+                models.Document.DocumentId.in_(chunk),
+                models.Document.IsDeleted == False
+            )
+        )
+    return live
+
+def get_possible_duplicates(
+    db: Session,
+    document_id: int,
+    threshold: Optional[float] = None,
+    limit: int = 50
+) -> Optional[List[Dict]]:
+    """
+    List documents that are probably near duplicates of a document
+
+    Documents not signed yet (e.g. stored before indexing was enabled) are
+    signed on the spot.
+
+    Args:
+        db: Database session
+        document_id: Document to find duplicates of
+        threshold: Minimum estimated similarity (defaults to NEAR_DUPLICATE_THRESHOLD)
+        limit: Maximum number of results
+
+    Returns:
+        list: DocumentId and Similarity per match, most similar first, or
+        None if the document does not exist
+    """
+    document = db.query(models.Document).filter(
+        models.Document.DocumentId == document_id,
+        models.Document.IsDeleted == False
+    ).first()
+    if document is None:
+        return None
+    if threshold is None:
+        threshold = settings.NEAR_DUPLICATE_THRESHOLD
+
+    matches = near_duplicates.similar(document_id, threshold)
+    if matches is None:
+        near_duplicates.index_document(document_id, document.FileLocation, document.FileType, document.ContentHash)
+        matches = near_duplicates.similar(document_id, threshold) or []
+
+    live = _live_documents(db, [match_id for match_id, _ in matches])
+    return [
+        {"DocumentId": match_id, "Similarity": score}
+        for match_id, score in matches
+        if match_id in live
+    ][:limit]
+
+def get_duplicate_report(db: Session, threshold: Optional[float] = None) -> List[Dict]:
+    """
+    Group every signed, live document with its near duplicates
+
+    Args:
+        db: Database session
+        threshold: Minimum estimated similarity (defaults to NEAR_DUPLICATE_THRESHOLD)
+
+    Returns:
+        list: Groups of DocumentIds with the lowest similarity linking each group, largest first
+    """
+    if threshold is None:
+        threshold = settings.NEAR_DUPLICATE_THRESHOLD
+    groups = near_duplicates.groups(threshold)
+    live = _live_documents(db, [document_id for members, _ in groups for document_id in members])
+
+    report = []
+    for members, similarity in groups:
+        members = [document_id for document_id in members if document_id in live]
+        if len(members) > 1:
+            report.append({"DocumentIds": members, "Similarity": similarity})
+    report.sort(key=lambda group: (-len(group["DocumentIds"]), group["DocumentIds"][0]))
+    return report
+
+def backfill_signatures(db: Session, batch_size: int = 500, progress=None) -> Dict[str, int]:
+    """
+    Sign live documents that are not in the index yet
+
+    Args:
+        db: Database session
+        batch_size: Documents read per query
+        progress: Optional callable receiving the running totals after each batch
+
+    Returns:
+        dict: Counts of signed, skipped (no shingles) and failed documents
+    """
+    totals = {"signed": 0, "empty": 0, "failed": 0}
+    last_id = 0
+    with ThreadPoolExecutor(max_workers=max(1, near_duplicates.workers)) as executor:
+        while True:
+            batch = db.query(
+                models.Document.DocumentId,
+                models.Document.FileLocation,
+                models.Document.FileType,
+                models.Document.ContentHash
+            ).filter(
+                models.Document.DocumentId > last_id,
+                models.Document.IsDeleted == False
+            ).order_by(models.Document.DocumentId).limit(batch_size).all()
+            if not batch:
+                break
+            last_id = batch[-1].DocumentId
+            pending = [row for row in batch if not near_duplicates.is_indexed(row.DocumentId)]
+            futures = [
+                executor.submit(
+                    near_duplicates.index_document, row.DocumentId, row.FileLocation, row.FileType, row.ContentHash
+                )
+                for row in pending
+            ]
+            for row, future in zip(pending, futures):
+                try:
+                    totals["signed" if future.result() else "empty"] += 1
+                except Exception as e:
+                    totals["failed"] += 1
+                    logger.error(f"Near-duplicate signing failed for document {row.DocumentId}: {e}")
+            if progress:
+                progress(totals)
+    return totals
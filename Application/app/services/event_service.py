@@ -0,0 +1,235 @@
+"""
+Real-time Event Service
+
+This module pushes document changes to connected clients, including:
+- One change log reader per process, shared by every connected client
+- Document create/update/delete events enriched with DocumentTypeId and TopicIds
+- Per-subscriber filters on document type and topic
+- Bounded per-subscriber queues; subscribers that fall behind are dropped
+
+Events come from the change log rather than from in-process hooks, so a
+client connected to one worker also sees changes committed by the others.
+The broker only reads the log while at least one client is connected.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+import asyncio
+import logging
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db.batching import chunked
+from app.db.database import read_session
+from app.services import change_service
+from app.services.change_service import change_notifier
+
+logger = logging.getLogger('app')
+
+# Event names sent to clients, by ChangeLog.Operation
+EVENT_NAMES = {
+    change_service.OPERATION_CREATE: "document.created",
+    change_service.OPERATION_UPDATE: "document.updated",
+    change_service.OPERATION_DELETE: "document.deleted",
+}
+
+class BrokerFull(Exception):
+    """Raised when a process already serves EVENTS_MAX_SUBSCRIBERS clients"""
+
+class Subscription:
+    """One connected client: its filters and its queue of undelivered events"""
+
+    def __init__(
+        self,
+        document_type_ids: Optional[FrozenSet[int]],
+        topic_ids: Optional[FrozenSet[int]],
+        queue_size: int
+    ):
+        self.document_type_ids = document_type_ids
+        self.topic_ids = topic_ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if self.document_type_ids is not None and event["DocumentTypeId"] not in self.document_type_ids:
+            return False
+        if self.topic_ids is not None and self.topic_ids.isdisjoint(event["TopicIds"]):
+            return False
+        return True
+
+    async def next(self) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event
+
+        Returns:
+            dict: Next event, or None once the subscriber has been dropped
+        """
+        return await self.queue.get()
+
+class EventBroker:
+    """
+    Fans document changes out to in-process subscribers
+
+    A single task tails the change log and delivers each event to every
+    subscriber whose filters match. Delivery never waits: a subscriber whose
+    queue is full is dropped, so one slow connection cannot hold up the rest.
+    """
+
+    def __init__(self, max_subscribers: int, queue_size: int, batch_size: int, poll_seconds: float):
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._subscribers: Set[Subscription] = set()
+        self._position: Optional[int] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self,
+        document_type_ids: Optional[List[int]] = None,
+        topic_ids: Optional[List[int]] = None
+    ) -> Subscription:
+        """
+        Register a client; called from the event loop
+
+        Args:
+            document_type_ids: Only deliver documents of these types
+            topic_ids: Only deliver documents assigned to one of these topics
+
+        Returns:
+            Subscription: Queue the client reads events from
+
+        Raises:
+            BrokerFull: If the process is at EVENTS_MAX_SUBSCRIBERS
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            raise BrokerFull()
+        subscription = Subscription(
+            frozenset(document_type_ids) if document_type_ids else None,
+            frozenset(topic_ids) if topic_ids is not None else None,
+            self.queue_size
+        )
+        self._subscribers.add(subscription)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a client; safe to call more than once"""
+        self._subscribers.discard(subscription)
+
+    def _drop(self, subscription: Subscription) -> None:
+        self.unsubscribe(subscription)
+        subscription.dropped = True
+        # Make room for the end-of-stream marker the client is waiting on
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def publish(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Deliver events to every matching subscriber without waiting
+
+        Args:
+            events: Events in change log order
+        """
+        if not events:
+            return
+        for subscription in list(self._subscribers):
+            for event in events:
+                if not subscription.matches(event):
+                    continue
+                try:
+                    subscription.queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    logger.warning("Dropped a slow event subscriber")
+                    self._drop(subscription)
+                    break
+
+    def _read(self, position: Optional[int]):
+        # Runs in a worker thread with its own short-lived session
+        with read_session() as db:
+            if position is None:
+                # Nobody was listening: start from the present, not from what was missed
+                return change_service.latest_change_id(db), []
+            feed = change_service.get_changes(db, position, self.batch_size, [change_service.ENTITY_DOCUMENT])
+            return feed["NextSince"], _document_events(db, feed["Changes"])
+
+    async def _run(self) -> None:
+        self._wakeup = asyncio.Event()
+        while True:
+            if not self._subscribers:
+                self._position = None
+                await self._wakeup.wait()
+            self._wakeup.clear()
+            generation = change_notifier.generation
+            try:
+                previous = self._position
+                self._position, events = await asyncio.to_thread(self._read, previous)
+                self.publish(events)
+                # A full batch means more changes may be waiting
+                if previous is not None and self._position - previous >= self.batch_size:
+                    continue
+            except Exception as e:
+                logger.error(f"Event broker poll failed: {e}")
+            await change_notifier.wait(generation, self.poll_seconds)
+
+    def start(self) -> None:
+        """Start tailing the change log"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the broker and end every open stream"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscription in list(self._subscribers):
+            self._drop(subscription)
+
+def _document_events(db: Session, changes: List[models.ChangeLog]) -> List[Dict[str, Any]]:
+    """Turn document changes into events, looking up type and topics in batches"""
+    document_ids = sorted({change.EntityId for change in changes})
+    type_ids: Dict[int, Optional[int]] = {}
+    topic_ids: Dict[int, List[int]] = {}
+    for chunk in chunked(document_ids):
+        type_ids.update(db.query(models.Document.DocumentId, models.Document.DocumentTypeId).filter(
+            models.Document.DocumentId.in_(chunk)
+        ).all())
+        for document_id, topic_id in db.query(models.DocumentTopic.DocumentId, models.DocumentTopic.TopicId).filter(
+            models.DocumentTopic.DocumentId.in_(chunk)
+        ):
+            topic_ids.setdefault(document_id, []).append(topic_id)
+
+    return [
+        {
+            "ChangeId": change.ChangeId,
+            "Event": EVENT_NAMES[change.Operation],
+            "DocumentId": change.EntityId,
+            "DocumentTypeId": type_ids.get(change.EntityId),
+            "TopicIds": topic_ids.get(change.EntityId, []),
+            "ChangedDate": change.ChangedDate,
+        }
+        for change in changes
+    ]
+
+# Process-wide broker
+event_broker = EventBroker(
+    max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    batch_size=settings.EVENTS_BATCH_SIZE,
+    poll_seconds=settings.CHANGE_FEED_POLL_SECONDS
+)
@@ -0,0 +1,260 @@
+"""
+Storage Garbage Collection Service
+
+This module reclaims storage that no live document needs, including:
+- Purging soft-deleted documents (rows and files) past the retention period
+- Mark-and-sweep removal of files no database row references
+- A grace window that protects uploads whose row is not committed yet
+- Dry-run reports of everything that would be removed
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import os
+import time
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db.batching import chunked
+from app.services.storage_inventory import (
+    iter_stored_objects,
+    location_forms,
+    normalize_location,
+    referenced_locations
+)
+from app.storage import resolve
+
+logger = logging.getLogger('app')
+
+# Rows that reference a document and must be removed before the document itself
+DOCUMENT_DEPENDENTS = [
+    (models.DocumentMetadata.__table__, "DocumentId"),
+    (models.DocumentVersion.__table__, "DocumentId"),
+    (models.DocumentTopic.__table__, "DocumentId"),
+    (models.DocumentTag.__table__, "DocumentId"),
+    (models.DocumentRelationship.__table__, "SourceDocumentId"),
+    (models.DocumentRelationship.__table__, "TargetDocumentId"),
+]
+
+def _remove_file(location: str) -> int:
+    """Delete a stored file and return the bytes freed (0 if it was already gone)"""
+    backend, key = resolve(location)
+    return backend.delete(key)
+
+def purge_expired_documents(
+    db: Session,
+    cutoff: datetime,
+    dry_run: bool,
+    batch_size: int
+) -> Dict[str, Any]:
+    """
+    Hard-delete documents soft-deleted before a cutoff, with their versions and files
+
+    Each batch is committed before its files are removed, so a failed commit
+    never leaves rows pointing at deleted files. A file whose removal fails
+    after the commit becomes an orphan and is collected by the next sweep.
+
+    Args:
+        db: Database session
+        cutoff: Documents last modified (deleted) before this time are purged
+        dry_run: Report without deleting anything
+        batch_size: Documents per batch
+
+    Returns:
+        dict: Counts, bytes reclaimed and the purged items
+    """
+    report = {"documents": 0, "versions": 0, "bytes": 0, "items": []}
+    last_id = 0
+
+    while True:
+        documents = db.query(
+            models.Document.DocumentId,
+            models.Document.FileLocation,
+            models.Document.FileSizeBytes
+        ).filter(
+            models.Document.IsDeleted == True,
+            models.Document.LastModifiedDate < cutoff,
+            models.Document.DocumentId > last_id
+        ).order_by(models.Document.DocumentId).limit(batch_size).all()
+        if not documents:
+            break
+        last_id = documents[-1].DocumentId
+        document_ids = [document.DocumentId for document in documents]
+
+        versions = db.query(
+            models.DocumentVersion.DocumentId,
+            models.DocumentVersion.FileLocation
+        ).filter(models.DocumentVersion.DocumentId.in_(document_ids)).all()
+
+        locations = [document.FileLocation for document in documents]
+        locations.extend(version.FileLocation for version in versions)
+        report["documents"] += len(documents)
+        report["versions"] += len(versions)
+        report["items"].extend(
+            {"document_id": document.DocumentId, "location": document.FileLocation}
+            for document in documents
+        )
+
+        if dry_run:
+            db.rollback()
+            report["bytes"] += sum(document.FileSizeBytes for document in documents)
+            continue
+
+        try:
+            for table, column in DOCUMENT_DEPENDENTS:
+                db.execute(sa.delete(table).where(table.c[column].in_(document_ids)))
+            db.execute(
+                sa.delete(models.Document.__table__).where(
+                    models.Document.__table__.c.DocumentId.in_(document_ids)
+                )
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        # Versions may share a file with their document; remove each path once
+        for location in set(locations):
+            report["bytes"] += _remove_file(location)
+
+    return report
+
+class OrphanMarks:
+    """First time each unreferenced file was seen, persisted between GC runs"""
+
+    def __init__(self, state_dir=None):
+        self.state_dir = state_dir or settings.GC_STATE_DIR
+        self.path = self.state_dir / "orphan_marks.json"
+
+    def load(self) -> Dict[str, float]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text())
+
+    def save(self, marks: Dict[str, float]) -> None:
+        os.makedirs(self.state_dir, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(marks))
+        os.replace(temp_path, self.path)
+
+def sweep_orphans(
+    db: Session,
+    grace_seconds: int,
+    dry_run: bool,
+    batch_size: int
+) -> Dict[str, Any]:
+    """
+    Mark unreferenced files and remove those that stayed unreferenced
+
+    A file is removed only when it is older than the grace window, was
+    already marked unreferenced by a run at least one grace window ago, and
+    is still unreferenced when re-checked just before removal. Uploads
+    written but not yet committed are therefore never touched.
+
+    Args:
+        db: Database session
+        grace_seconds: Minimum age and minimum time marked before removal
+        dry_run: Report without changing marks or deleting files
+        batch_size: Files re-checked against the database per query
+
+    Returns:
+        dict: Marked and removed counts, bytes reclaimed and the affected files
+    """
+    now = time.time()
+    marks_store = OrphanMarks()
+    previous_marks = marks_store.load()
+    referenced = referenced_locations(db)
+    db.rollback()
+
+    marks: Dict[str, float] = {}
+    sizes: Dict[str, int] = {}
+    candidates: List[str] = []
+    for stored in iter_stored_objects():
+        if normalize_location(stored.uri) in referenced:
+            continue
+        if stored.modified > now - grace_seconds:
+            continue
+        first_seen = previous_marks.get(stored.uri, now)
+        marks[stored.uri] = first_seen
+        if now - first_seen >= grace_seconds:
+            candidates.append(stored.uri)
+            sizes[stored.uri] = stored.size
+
+    report = {
+        "marked": len(marks) - len(candidates),
+        "removed": 0,
+        "bytes": 0,
+        "items": [{"location": path, "action": "remove"} for path in candidates],
+    }
+
+    if dry_run:
+        report["removed"] = len(candidates)
+        report["bytes"] = sum(sizes.values())
+        return report
+
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start:start + batch_size]
+        # Rows may record a local file by URI or, if older, by absolute path
+        spellings = [form for location in batch for form in location_forms(location)]
+        # Re-check right before removal in case a row started referencing the file
+        still_referenced = {
+            normalize_location(location)
+            for model in (models.Document, models.DocumentVersion)
+            for chunk in chunked(spellings)
+            for (location,) in db.query(model.FileLocation).filter(model.FileLocation.in_(chunk))
+        }
+        db.rollback()
+        for location in batch:
+            if normalize_location(location) in still_referenced:
+                marks.pop(location, None)
+                continue
+            report["bytes"] += _remove_file(location)
+            report["removed"] += 1
+            marks.pop(location, None)
+
+    marks_store.save(marks)
+    return report
+
+def collect_garbage(
+    db: Session,
+    dry_run: bool = True,
+    retention_days: Optional[int] = None,
+    grace_seconds: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run a full garbage collection pass
+
+    Args:
+        db: Database session
+        dry_run: Report what would be removed without removing it
+        retention_days: Override GC_RETENTION_DAYS
+        grace_seconds: Override GC_GRACE_SECONDS
+        batch_size: Override GC_BATCH_SIZE
+
+    Returns:
+        dict: Reports for the expired-document purge and the orphan sweep
+    """
+    retention_days = settings.GC_RETENTION_DAYS if retention_days is None else retention_days
+    grace_seconds = settings.GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    batch_size = batch_size or settings.GC_BATCH_SIZE
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    expired = purge_expired_documents(db, cutoff, dry_run, batch_size)
+    orphans = sweep_orphans(db, grace_seconds, dry_run, batch_size)
+
+    logger.info(
+        f"Garbage collection {'(dry run) ' if dry_run else ''}"
+        f"purged {expired['documents']} documents, {expired['versions']} versions, "
+        f"removed {orphans['removed']} orphan files, "
+        f"reclaimed {expired['bytes'] + orphans['bytes']} bytes"
+    )
+    return {"dry_run": dry_run, "expired": expired, "orphans": orphans}
@@ -0,0 +1,236 @@
+"""
+Document Metadata Service
+
+This module reads and writes typed key/value metadata for many documents at once, including:
+- Coercion of incoming values to their DataType, stored in a canonical text form
+- Bulk upserts written with one set-based MERGE / INSERT ... ON CONFLICT per batch
+- Multi-document reads returning metadata keyed by DocumentId, values converted
+  back to their DataType
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db.batching import chunked
+from app.db.database import backend
+from app.schemas.schemas import DocumentMetadataSet
+
+KEY_COLUMNS = ["DocumentId", "MetadataKey"]
+UPDATE_COLUMNS = ["MetadataValue", "DataType", "LastModifiedDate"]
+
+_TRUE = {"true", "1", "yes", "y", "on"}
+_FALSE = {"false", "0", "no", "n", "off"}
+
+def _reject(value: Any, data_type: str) -> ValueError:
+    return ValueError(f"{value!r} is not a valid {data_type}")
+
+def coerce_value(value: Any, data_type: str) -> Optional[str]:
+    """
+    Convert a value to the text stored for its DataType
+
+    Args:
+        value: Value from the request (JSON types)
+        data_type: One of string, number, date, boolean, json (the CHK_DataType values)
+
+    Returns:
+        str: Canonical text form, or None for a null value
+
+    Raises:
+        ValueError: If the value cannot represent the DataType
+    """
+    if value is None:
+        return None
+    if data_type == "json":
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    if isinstance(value, (dict, list)):
+        raise _reject(value, data_type)
+
+    if data_type == "string":
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return str(value)
+    if data_type == "boolean":
+        text = str(value).strip().lower()
+        if text in _TRUE:
+            return "true"
+        if text in _FALSE:
+            return "false"
+        raise _reject(value, data_type)
+    if isinstance(value, bool):
+        raise _reject(value, data_type)
+    if data_type == "number":
+        try:
+            number = Decimal(str(value).strip())
+        except InvalidOperation:
+            raise _reject(value, data_type)
+        if not number.is_finite():
+            raise _reject(value, data_type)
+        # Plain notation without trailing zeros, so equal numbers store equal text
+        return format(number.normalize(), "f")
+    if data_type == "date":
+        text = str(value).strip()
+        try:
+            if len(text) == 10:
+                return date.fromisoformat(text).isoformat()
+            moment = datetime.fromisoformat(text)
+        except ValueError:
+            raise _reject(value, data_type)
+        if moment.tzinfo is not None:
+            # Stored in UTC without an offset, like every other timestamp in the database
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment.isoformat()
+    raise ValueError(f"Unknown DataType {data_type!r}")
+
+def parse_value(text: Optional[str], data_type: str) -> Any:
+    """
+    Convert stored text back to its DataType
+
+    Dates stay ISO 8601 strings, as JSON has no date type. Values that do
+    not parse (rows written before values were coerced) are returned as
+    stored.
+
+    Args:
+        text: Stored MetadataValue
+        data_type: Stored DataType
+
+    Returns:
+        Any: Typed value
+    """
+    if text is None:
+        return None
+    try:
+        if data_type == "number":
+            return int(text) if text.lstrip("-").isdigit() else float(text)
+        if data_type == "boolean":
+            return text.strip().lower() in _TRUE
+        if data_type == "json":
+            return json.loads(text)
+    except ValueError:
+        pass
+    return text
+
+def _live_documents(db: Session, document_ids: Iterable[int]) -> set:
+    live = set()
+    for chunk in chunked(sorted(set(document_ids))):
+        live.update(
+            document_id for (document_id,) in db.query(models.Document.DocumentId).filter(
+                models.Document.DocumentId.in_(chunk),
+                models.Document.IsDeleted == False
+            )
+        )
+    return live
+
+def upsert_metadata(db: Session, documents: List[DocumentMetadataSet]) -> Dict:
+    """
+    Insert or overwrite metadata entries for many documents in one transaction
+
+    Every value is coerced before anything is written, so a request either
+    applies completely or not at all. A key listed twice for one document
+    keeps its last value.
+
+    Args:
+        db: Database session
+        documents: Entries per document
+
+    Returns:
+        dict: Upserted entry count and the IDs of missing or deleted documents skipped
+
+    Raises:
+        HTTPException: 400 if the request has too many entries, 409 if documents
+        changed during the write, 422 listing the entries whose values do not
+        match their DataType
+    """
+    total = sum(len(document.Entries) for document in documents)
+    if total > settings.METADATA_UPSERT_MAX_ENTRIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{total} entries exceed the limit of {settings.METADATA_UPSERT_MAX_ENTRIES} per request"
+        )
+
+    entries: Dict[Tuple[int, str], Tuple[Optional[str], str]] = {}
+    errors = []
+    for document in documents:
+        for entry in document.Entries:
+            try:
+                stored = coerce_value(entry.Value, entry.DataType)
+            except ValueError as e:
+                errors.append({"DocumentId": document.DocumentId, "MetadataKey": entry.MetadataKey, "error": str(e)})
+                continue
+            entries[(document.DocumentId, entry.MetadataKey)] = (stored, entry.DataType)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors[:100])
+
+    requested = sorted({document_id for document_id, _ in entries})
+    live = _live_documents(db, requested)
+    now = datetime.utcnow()
+    rows = [
+        {
+            "DocumentId": document_id,
+            "MetadataKey": key,
+            "MetadataValue": stored,
+            "DataType": data_type,
+            "CreatedDate": now,
+            "LastModifiedDate": now,
+        }
+        for (document_id, key), (stored, data_type) in entries.items()
+        if document_id in live
+    ]
+    try:
+        written = backend.upsert_rows(
+            db.connection(), models.DocumentMetadata.__table__, KEY_COLUMNS, rows, UPDATE_COLUMNS
+        ) if rows else 0
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        # A document was hard-deleted, or a concurrent request inserted the same key first
+        raise HTTPException(status_code=409, detail="Documents changed during the update; retry the request")
+    except Exception:
+        db.rollback()
+        raise
+    return {
+        "Upserted": written,
+        "SkippedDocumentIds": [document_id for document_id in requested if document_id not in live],
+    }
+
+def get_metadata(
+    db: Session,
+    document_ids: List[int],
+    keys: Optional[List[str]] = None
+) -> Dict[int, Dict[str, Dict[str, Any]]]:
+    """
+    Read the metadata of many documents, one query per chunk of IDs
+
+    Args:
+        db: Database session
+        document_ids: Documents to read
+        keys: Only return these keys (all keys when None)
+
+    Returns:
+        dict: {DocumentId: {MetadataKey: {"Value", "DataType"}}} in request order;
+        missing and deleted documents map to an empty dict
+    """
+    result: Dict[int, Dict[str, Dict[str, Any]]] = {document_id: {} for document_id in document_ids}
+    metadata = models.DocumentMetadata
+    for chunk in chunked(sorted(result)):
+        query = db.query(
+            metadata.DocumentId, metadata.MetadataKey, metadata.MetadataValue, metadata.DataType
+        ).join(models.Document, models.Document.DocumentId == metadata.DocumentId).filter(
+            metadata.DocumentId.in_(chunk),
+            models.Document.IsDeleted == False
+        )
+        if keys:
+            query = query.filter(metadata.MetadataKey.in_(sorted(set(keys))))
+        for document_id, key, text, data_type in query:
+            result[document_id][key] = {"Value": parse_value(text, data_type), "DataType": data_type}
+    return result
@@ -0,0 +1,386 @@
+"""
+Document Relationship Service Layer
+
+This module handles the document relationship graph, including:
+- Creation and soft deletion of typed, directed edges
+- Batched neighbour lookups for many documents at once
+- Breadth-first traversal issuing one query per level, with depth,
+  node and fan-out limits
+- An LRU adjacency cache for frequently visited documents
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import time
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from app import models
+from app.core.config import settings
+from app.core.worker_channel import worker_channel
+from app.db.batching import chunked
+from app.schemas.schemas import DocumentRelationshipCreate
+
+# Document ids per invalidation message between workers
+_MESSAGE_IDS = 2000
+
+# (RelationshipId, SourceDocumentId, TargetDocumentId, RelationshipType)
+Edge = Tuple[int, int, int, str]
+
+class AdjacencyCache:
+    """
+    LRU cache of the active edges touching each document
+
+    Entries are dropped when an edge changes, in every worker on the same
+    host; the TTL bounds staleness from other hosts, lost messages and
+    documents deleted since caching.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, List[Edge]]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get_many(self, document_ids: Iterable[int]) -> Dict[int, List[Edge]]:
+        """Return cached edges for the documents that have a fresh entry"""
+        if self.max_entries <= 0:
+            return {}
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for document_id in document_ids:
+                entry = self._entries.get(document_id)
+                if entry is None:
+                    continue
+                if entry[0] < now:
+                    del self._entries[document_id]
+                    continue
+                self._entries.move_to_end(document_id)
+                found[document_id] = entry[1]
+        return found
+
+    def put_many(self, edges_by_document: Dict[int, List[Edge]]) -> None:
+        """Cache the complete edge lists of several documents"""
+        if self.max_entries <= 0:
+            return
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for document_id, edges in edges_by_document.items():
+                self._entries[document_id] = (expires, edges)
+                self._entries.move_to_end(document_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, document_ids: Iterable[int], broadcast: bool = True) -> None:
+        """Drop the entries of documents whose edges changed, here and (if broadcast) in other workers"""
+        document_ids = list(document_ids)
+        with self._lock:
+            for document_id in document_ids:
+                self._entries.pop(document_id, None)
+        if broadcast:
+            for chunk in chunked(document_ids, _MESSAGE_IDS):
+                worker_channel.publish("adjacency", chunk)
+
+# Process-wide adjacency cache
+adjacency_cache = AdjacencyCache(
+    max_entries=settings.RELATIONSHIP_CACHE_SIZE,
+    ttl_seconds=settings.RELATIONSHIP_CACHE_SECONDS
+)
+worker_channel.subscribe("adjacency", lambda document_ids: adjacency_cache.invalidate(document_ids, broadcast=False))
+
+def _live_document_ids(db: Session, document_ids: Iterable[int]) -> Set[int]:
+    live = set()
+    for chunk in chunked(sorted(set(document_ids))):
+        live.update(
+            document_id for (document_id,) in db.query(models.Document.DocumentId).filter(
+                models.Document.DocumentId.in_(chunk),
+                models.Document.IsDeleted == False
+            )
+        )
+    return live
+
+def _load_edges(db: Session, document_ids: List[int]) -> Dict[int, List[Edge]]:
+    """Read every active edge touching the documents, two indexed queries per chunk"""
+    edges: Dict[int, List[Edge]] = {document_id: [] for document_id in document_ids}
+    relationship = models.DocumentRelationship
+    other = aliased(models.Document)
+
+    for chunk in chunked(document_ids):
+        # Outgoing edges of the chunk, then incoming ones; the far end must be live
+        for near_column, far_column in (
+            (relationship.SourceDocumentId, relationship.TargetDocumentId),
+            (relationship.TargetDocumentId, relationship.SourceDocumentId),
+        ):
+            rows = db.query(
+                relationship.RelationshipId,
+                relationship.SourceDocumentId,
+                relationship.TargetDocumentId,
+                relationship.RelationshipType,
+                near_column
+            ).join(
+                other, other.DocumentId == far_column
+            ).filter(
+                near_column.in_(chunk),
+                relationship.IsActive == True,
+                other.IsDeleted == False
+            )
+            for relationship_id, source_id, target_id, relationship_type, near_id in rows:
+                edges[near_id].append((relationship_id, source_id, target_id, relationship_type))
+
+    for document_edges in edges.values():
+        document_edges.sort()
+    return edges
+
+def get_neighbors(
+    db: Session,
+    document_ids: Iterable[int],
+    direction: str = "both",
+    relationship_types: Optional[List[str]] = None
+) -> Dict[int, List[Edge]]:
+    """
+    Fetch the edges of many documents at once, using the adjacency cache
+
+    Args:
+        db: Database session
+        document_ids: Documents whose neighbours are needed
+        direction: "outgoing", "incoming" or "both"
+        relationship_types: Only return edges of these types
+
+    Returns:
+        dict: Edges per requested document, ordered by RelationshipId
+    """
+    document_ids = list(dict.fromkeys(document_ids))
+    edges = adjacency_cache.get_many(document_ids)
+    missing = [document_id for document_id in document_ids if document_id not in edges]
+    if missing:
+        loaded = _load_edges(db, missing)
+        adjacency_cache.put_many(loaded)
+        edges.update(loaded)
+
+    wanted_types = set(relationship_types) if relationship_types else None
+    result = {}
+    for document_id in document_ids:
+        result[document_id] = [
+            edge for edge in edges[document_id]
+            if (wanted_types is None or edge[3] in wanted_types)
+            and (direction == "both"
+                 or (direction == "outgoing" and edge[1] == document_id)
+                 or (direction == "incoming" and edge[2] == document_id))
+        ]
+    return result
+
+def traverse(
+    db: Session,
+    start_document_id: int,
+    max_depth: int = 2,
+    max_nodes: Optional[int] = None,
+    max_fanout: Optional[int] = None,
+    direction: str = "both",
+    relationship_types: Optional[List[str]] = None
+) -> Dict:
+    """
+    Breadth-first walk from a document, one batched neighbour fetch per level
+
+    Args:
+        db: Database session
+        start_document_id: Document the walk starts from (depth 0)
+        max_depth: Levels to expand, capped at GRAPH_MAX_DEPTH
+        max_nodes: Maximum documents returned, capped at GRAPH_MAX_NODES
+        max_fanout: Neighbours followed per document, capped at GRAPH_MAX_FANOUT
+        direction: "outgoing", "incoming" or "both"
+        relationship_types: Only follow edges of these types
+
+    Returns:
+        dict: Nodes with their depth, the edges between them and whether the
+        node or fan-out limit cut the walk short
+    """
+    max_depth = min(max_depth, settings.GRAPH_MAX_DEPTH)
+    max_nodes = min(max_nodes or settings.GRAPH_MAX_NODES, settings.GRAPH_MAX_NODES)
+    max_fanout = min(max_fanout or settings.GRAPH_MAX_FANOUT, settings.GRAPH_MAX_FANOUT)
+
+    depths = {start_document_id: 0}
+    edges: Dict[int, Edge] = {}
+    truncated = False
+    frontier = [start_document_id]
+
+    for depth in range(1, max_depth + 1):
+        if not frontier:
+            break
+        neighbors = get_neighbors(db, frontier, direction, relationship_types)
+        next_frontier = []
+        for document_id in frontier:
+            document_edges = neighbors[document_id]
+            if len(document_edges) > max_fanout:
+                document_edges = document_edges[:max_fanout]
+                truncated = True
+            for edge in document_edges:
+                other_id = edge[2] if edge[1] == document_id else edge[1]
+                if other_id not in depths:
+                    if len(depths) >= max_nodes:
+                        truncated = True
+                        continue
+                    depths[other_id] = depth
+                    next_frontier.append(other_id)
+                # Includes edges between already-visited documents
+                edges[edge[0]] = edge
+        frontier = next_frontier
+
+    return {
+        "Nodes": [{"DocumentId": document_id, "Depth": depth} for document_id, depth in depths.items()],
+        "Edges": [_edge_dict(edge) for edge in edges.values()],
+        "Truncated": truncated,
+    }
+
+def _edge_dict(edge: Edge) -> Dict:
+    return {
+        "RelationshipId": edge[0],
+        "SourceDocumentId": edge[1],
+        "TargetDocumentId": edge[2],
+        "RelationshipType": edge[3],
+    }
+
+def neighbor_map(
+    db: Session,
+    document_ids: Iterable[int],
+    direction: str = "both",
+    relationship_types: Optional[List[str]] = None
+) -> Dict[int, List[Dict]]:
+    """
+    Edges of many documents keyed by DocumentId, in response form
+
+    Args:
+        db: Database session
+        document_ids: Documents whose neighbours are needed
+        direction: "outgoing", "incoming" or "both"
+        relationship_types: Only return edges of these types
+
+    Returns:
+        dict: Edge dictionaries per document
+    """
+    return {
+        document_id: [_edge_dict(edge) for edge in document_edges]
+        for document_id, document_edges in get_neighbors(
+            db, document_ids, direction, relationship_types
+        ).items()
+    }
+
+def create_relationship(db: Session, relationship: DocumentRelationshipCreate, created_by_id: int):
+    """
+    Create a relationship between two documents
+
+    Args:
+        db: Database session
+        relationship: Relationship creation data
+        created_by_id: User creating the relationship
+
+    Returns:
+        models.DocumentRelationship: Created relationship instance
+
+    Raises:
+        HTTPException: If an endpoint is missing, the edge is a self-loop or the insert fails
+    """
+    endpoints = {relationship.SourceDocumentId, relationship.TargetDocumentId}
+    if len(endpoints) == 1:
+        raise HTTPException(status_code=400, detail="A document cannot be related to itself")
+    if _live_document_ids(db, endpoints) != endpoints:
+        raise HTTPException(status_code=400, detail="Source or target document not found")
+
+    db_relationship = models.DocumentRelationship(
+        SourceDocumentId=relationship.SourceDocumentId,
+        TargetDocumentId=relationship.TargetDocumentId,
+        RelationshipType=relationship.RelationshipType,
+        RelationshipMetadata=relationship.RelationshipMetadata,
+        CreatedById=created_by_id,
+        IsActive=True
+    )
+    try:
+        db.add(db_relationship)
+        db.commit()
+        db.refresh(db_relationship)
+    except IntegrityError:
+        db.rollback()
+        # An endpoint was hard-deleted after the check above
+        raise HTTPException(status_code=400, detail="Source or target document not found")
+    except Exception:
+        db.rollback()
+        raise
+    adjacency_cache.invalidate(endpoints)
+    return db_relationship
+
+def get_relationship(db: Session, relationship_id: int):
+    """
+    Retrieve a specific active relationship by ID
+
+    Args:
+        db: Database session
+        relationship_id: ID of relationship to retrieve
+
+    Returns:
+        models.DocumentRelationship: Relationship instance if found, None otherwise
+    """
+    return db.query(models.DocumentRelationship).filter(
+        models.DocumentRelationship.RelationshipId == relationship_id,
+        models.DocumentRelationship.IsActive == True
+    ).first()
+
+def get_document_relationships(
+    db: Session,
+    document_id: int,
+    direction: str = "both",
+    relationship_types: Optional[List[str]] = None
+):
+    """
+    Retrieve the active relationships of one document
+
+    Args:
+        db: Database session
+        document_id: Document whose relationships are returned
+        direction: "outgoing", "incoming" or "both"
+        relationship_types: Only return relationships of these types
+
+    Returns:
+        List[models.DocumentRelationship]: Relationships ordered by ID
+    """
+    relationship = models.DocumentRelationship
+    if direction == "outgoing":
+        endpoint_filter = relationship.SourceDocumentId == document_id
+    elif direction == "incoming":
+        endpoint_filter = relationship.TargetDocumentId == document_id
+    else:
+        endpoint_filter = (relationship.SourceDocumentId == document_id) | (relationship.TargetDocumentId == document_id)
+
+    query = db.query(relationship).filter(endpoint_filter, relationship.IsActive == True)
+    if relationship_types:
+        query = query.filter(relationship.RelationshipType.in_(relationship_types))
+    return query.order_by(relationship.RelationshipId).all()
+
+def delete_relationship(db: Session, relationship_id: int) -> bool:
+    """
+    Deactivate a relationship (soft delete)
+
+    Args:
+        db: Database session
+        relationship_id: ID of relationship to deactivate
+
+    Returns:
+        bool: True if the relationship was deactivated, False if not found or operation failed
+    """
+    db_relationship = get_relationship(db, relationship_id)
+    if not db_relationship:
+        return False
+
+    db_relationship.IsActive = False
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        return False
+    adjacency_cache.invalidate([db_relationship.SourceDocumentId, db_relationship.TargetDocumentId])
+    return True
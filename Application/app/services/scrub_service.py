@@ -0,0 +1,322 @@
+"""
+Integrity Scrub Service
+
+This module verifies stored files against the ContentHash recorded for them, including:
+- Keyset-batched walks over Document and DocumentVersion rows
+- Parallel SHA-256 hashing in a process pool (mmap for large files)
+- A shared I/O budget so scrubbing does not starve the API of disk bandwidth
+- Checkpointing after every batch so an interrupted scrub resumes where it stopped
+- Reporting of missing, corrupt and orphaned files
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import mmap
+import os
+import time
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.services.storage_inventory import (
+    iter_stored_objects,
+    normalize_location,
+    referenced_locations
+)
+from app.storage import resolve
+
+logger = logging.getLogger('app')
+
+# Scrub phases in execution order
+PHASES = ["documents", "versions", "orphans", "done"]
+
+def hash_file(
+    location: str,
+    bytes_per_second: float,
+    buffer_size: int,
+    mmap_threshold: int
+) -> Tuple[str, Optional[str], int]:
+    """
+    Hash one stored file, pacing reads to a byte rate
+
+    Runs inside the scrub worker processes. Local files are read directly
+    (mapped when large); remote objects are streamed from their backend.
+
+    Args:
+        location: FileLocation of the file to hash
+        bytes_per_second: Read budget for this worker; 0 disables throttling
+        buffer_size: Bytes hashed per read
+        mmap_threshold: Files at least this large are mapped instead of read
+
+    Returns:
+        tuple: (status, SHA-256 hex digest or error message, bytes read) where
+        status is "ok", "missing" or "error"
+    """
+    digest = hashlib.sha256()
+    started = time.monotonic()
+    total = 0
+
+    def throttle():
+        if bytes_per_second > 0:
+            ahead = total / bytes_per_second - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+
+    try:
+        backend, key = resolve(location)
+        path = backend.local_path(key)
+        if path is None:
+            for chunk in backend.read(key, chunk_size=buffer_size):
+                digest.update(chunk)
+                total += len(chunk)
+                throttle()
+            return "ok", digest.hexdigest(), total
+
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            if size >= mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, size, buffer_size):
+                            chunk = view[offset:offset + buffer_size]
+                            digest.update(chunk)
+                            total += len(chunk)
+                            chunk.release()
+                            throttle()
+                    finally:
+                        view.release()
+            else:
+                buffer = bytearray(buffer_size)
+                view = memoryview(buffer)
+                while True:
+                    read = f.readinto(buffer)
+                    if not read:
+                        break
+                    digest.update(view[:read])
+                    total += read
+                    throttle()
+
+            # Scrubbed data will not be read again soon; keep the page cache for the API
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except FileNotFoundError:
+        return "missing", None, 0
+    except Exception as e:
+        # OSError locally; client or protocol errors from remote backends
+        return "error", str(e), total
+
+    return "ok", digest.hexdigest(), total
+
+class ScrubCheckpoint:
+    """Resumable scrub progress persisted under SCRUB_STATE_DIR"""
+
+    def __init__(self, state_dir=None):
+        self.state_dir = state_dir or settings.SCRUB_STATE_DIR
+        self.path = self.state_dir / "checkpoint.json"
+        self.report_path = self.state_dir / "problems.jsonl"
+        self.state: Dict[str, Any] = {}
+
+    def load(self, restart: bool = False) -> Dict[str, Any]:
+        """Load saved progress, or start a new scrub"""
+        os.makedirs(self.state_dir, exist_ok=True)
+        if not restart and self.path.exists():
+            self.state = json.loads(self.path.read_text())
+            if self.state.get("phase") != "done":
+                return self.state
+
+        self.state = {
+            "phase": PHASES[0],
+            "last_id": 0,
+            "started": datetime.utcnow().isoformat(),
+            "counters": {"ok": 0, "missing": 0, "corrupt": 0, "error": 0, "orphaned": 0, "bytes": 0},
+        }
+        if self.report_path.exists():
+            self.report_path.unlink()
+        self.save()
+        return self.state
+
+    def save(self) -> None:
+        """Atomically persist the current progress"""
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(self.state))
+        os.replace(temp_path, self.path)
+
+    def record_problems(self, problems: List[Dict[str, Any]]) -> None:
+        """Append problem entries to the report"""
+        if not problems:
+            return
+        with open(self.report_path, "a") as f:
+            for problem in problems:
+                f.write(json.dumps(problem) + "\n")
+
+    def problems(self) -> List[Dict[str, Any]]:
+        """Read every problem recorded by the current scrub"""
+        if not self.report_path.exists():
+            return []
+        with open(self.report_path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+def _row_source(phase: str):
+    """Columns read for a phase: (key, location, hash, expected size or None)"""
+    if phase == "documents":
+        return (
+            models.Document.DocumentId,
+            models.Document.FileLocation,
+            models.Document.ContentHash,
+            models.Document.FileSizeBytes,
+        )
+    return (
+        models.DocumentVersion.VersionId,
+        models.DocumentVersion.FileLocation,
+        models.DocumentVersion.ContentHash,
+        None,
+    )
+
+def _verify_batch(
+    executor: ProcessPoolExecutor,
+    phase: str,
+    rows: List[Tuple],
+    worker_budget: float
+) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+    """Hash one batch of rows in the pool and classify the results"""
+    futures = [
+        executor.submit(
+            hash_file,
+            row[1],
+            worker_budget,
+            settings.SCRUB_READ_BUFFER_BYTES,
+            settings.SCRUB_MMAP_THRESHOLD_BYTES
+        )
+        for row in rows
+    ]
+
+    counters = {"ok": 0, "missing": 0, "corrupt": 0, "error": 0, "bytes": 0}
+    problems = []
+    for row, future in zip(rows, futures):
+        row_id, location, expected_hash, expected_size = row
+        status, result, bytes_read = future.result()
+        counters["bytes"] += bytes_read
+
+        if status == "ok":
+            size_matches = expected_size is None or expected_size == bytes_read
+            if result.lower() == expected_hash.lower() and size_matches:
+                counters["ok"] += 1
+                continue
+            status = "corrupt"
+
+        counters[status] += 1
+        problems.append({
+            "status": status,
+            "table": "Documents" if phase == "documents" else "DocumentVersions",
+            "id": row_id,
+            "location": location,
+            "expected_hash": expected_hash,
+            "actual_hash": result if status == "corrupt" else None,
+            "error": result if status == "error" else None,
+        })
+    return counters, problems
+
+def find_orphans(db: Session) -> List[Dict[str, Any]]:
+    """
+    List stored files that no Document or DocumentVersion row references
+
+    Args:
+        db: Database session
+
+    Returns:
+        list: Problem entries with status "orphaned"
+    """
+    referenced = referenced_locations(db)
+    return [
+        {"status": "orphaned", "location": stored.uri, "size": stored.size}
+        for stored in iter_stored_objects()
+        if normalize_location(stored.uri) not in referenced
+    ]
+
+def run_scrub(
+    db: Session,
+    restart: bool = False,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    io_bytes_per_second: Optional[int] = None,
+    include_orphans: bool = True,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Verify every stored file, resuming from the last checkpoint
+
+    Args:
+        db: Database session
+        restart: Discard saved progress and start over
+        workers: Hashing processes (defaults to SCRUB_WORKERS or the CPU count)
+        batch_size: Rows per keyset batch (defaults to SCRUB_BATCH_SIZE)
+        io_bytes_per_second: Total read budget (defaults to SCRUB_IO_BYTES_PER_SEC)
+        include_orphans: Also scan the storage backend for unreferenced files
+        progress: Optional callback receiving the checkpoint state after each batch
+
+    Returns:
+        dict: Final counters and the list of problems found
+    """
+    workers = workers or settings.SCRUB_WORKERS or os.cpu_count() or 1
+    batch_size = batch_size or settings.SCRUB_BATCH_SIZE
+    if io_bytes_per_second is None:
+        io_bytes_per_second = settings.SCRUB_IO_BYTES_PER_SEC
+    worker_budget = io_bytes_per_second / workers if io_bytes_per_second else 0
+
+    checkpoint = ScrubCheckpoint()
+    state = checkpoint.load(restart=restart)
+    logger.info(f"Scrub starting at phase {state['phase']} after id {state['last_id']}")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while state["phase"] in ("documents", "versions"):
+            key_column, location_column, hash_column, size_column = _row_source(state["phase"])
+            columns = [key_column, location_column, hash_column]
+            if size_column is not None:
+                columns.append(size_column)
+
+            rows = db.query(*columns).filter(
+                key_column > state["last_id"]
+            ).order_by(key_column).limit(batch_size).all()
+            # Release the read transaction while the batch is hashed
+            db.rollback()
+
+            if not rows:
+                state["phase"] = PHASES[PHASES.index(state["phase"]) + 1]
+                state["last_id"] = 0
+                checkpoint.save()
+                continue
+
+            rows = [tuple(row) + ((None,) if size_column is None else ()) for row in rows]
+            counters, problems = _verify_batch(executor, state["phase"], rows, worker_budget)
+
+            checkpoint.record_problems(problems)
+            for name, value in counters.items():
+                state["counters"][name] += value
+            state["last_id"] = rows[-1][0]
+            checkpoint.save()
+            if progress:
+                progress(state)
+
+    if state["phase"] == "orphans":
+        if include_orphans:
+            orphans = find_orphans(db)
+            checkpoint.record_problems(orphans)
+            state["counters"]["orphaned"] = len(orphans)
+        state["phase"] = "done"
+        state["finished"] = datetime.utcnow().isoformat()
+        checkpoint.save()
+
+    logger.info(f"Scrub finished: {state['counters']}")
+    return {"counters": state["counters"], "problems": checkpoint.problems()}
@@ -0,0 +1,225 @@
+"""
+Document Statistics Service
+
+This module maintains live document counts and total bytes per facet value, including:
+- Facets by DocumentType, month of CreatedDate and FileType, plus a grand total
+- Incremental updates in the same transaction as each document write
+- Counters spread over STATS_COUNTER_SHARDS rows per value, summed on read
+- Reconciliation against the Documents table to repair any drift
+
+Reads touch only the DocumentStats table, whose size depends on the number
+of facet values rather than the number of documents.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import logging
+import random
+
+from sqlalchemy import extract, func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db.database import backend
+
+logger = logging.getLogger('app')
+
+# Facets; FACET_TOTAL has a single value with an empty key
+FACET_TOTAL = "Total"
+FACET_DOCUMENT_TYPE = "DocumentType"
+FACET_CREATED_MONTH = "CreatedMonth"
+FACET_FILE_TYPE = "FileType"
+
+KEY_COLUMNS = ["Facet", "FacetKey", "Shard"]
+
+FacetValue = Tuple[str, str]
+
+class DocumentFacets(NamedTuple):
+    """The attributes of a live document that its statistics depend on"""
+    DocumentTypeId: Optional[int]
+    FileType: Optional[str]
+    CreatedDate: Optional[datetime]
+    FileSizeBytes: int
+
+def facets_of(document: models.Document) -> Optional[DocumentFacets]:
+    """
+    Capture a document's facet values
+
+    Args:
+        document: Document row
+
+    Returns:
+        DocumentFacets: Its facet values, or None if the document is deleted (it is not counted)
+    """
+    if document.IsDeleted:
+        return None
+    return DocumentFacets(
+        document.DocumentTypeId,
+        document.FileType,
+        document.CreatedDate,
+        document.FileSizeBytes or 0
+    )
+
+def _month_key(year, month) -> str:
+    return f"{int(year):04d}-{int(month):02d}" if year is not None else ""
+
+def _values(facets: DocumentFacets) -> List[FacetValue]:
+    created = facets.CreatedDate
+    return [
+        (FACET_TOTAL, ""),
+        (FACET_DOCUMENT_TYPE, str(facets.DocumentTypeId) if facets.DocumentTypeId is not None else ""),
+        (FACET_CREATED_MONTH, _month_key(created.year, created.month) if created else ""),
+        (FACET_FILE_TYPE, (facets.FileType or "").lower()),
+    ]
+
+def _add(totals: Dict[FacetValue, List[int]], value: FacetValue, count: int, size: int) -> None:
+    entry = totals.setdefault(value, [0, 0])
+    entry[0] += count
+    entry[1] += size
+
+def _apply(db: Session, deltas: Dict[FacetValue, List[int]], shard: int) -> int:
+    rows = [
+        {
+            "Facet": facet,
+            "FacetKey": key,
+            "Shard": shard,
+            "DocumentCount": count,
+            "TotalBytes": size,
+        }
+        for (facet, key), (count, size) in deltas.items()
+        if count or size
+    ]
+    if rows:
+        backend.add_to_counters(db.connection(), models.DocumentStat.__table__, KEY_COLUMNS, rows)
+    return len(rows)
+
+def record_document_change(
+    db: Session,
+    before: Optional[DocumentFacets],
+    after: Optional[DocumentFacets]
+) -> None:
+    """
+    Adjust the counters for a document write, in the caller's transaction
+
+    Args:
+        db: Database session holding the write
+        before: Facet values before the write (None for a new or already deleted document)
+        after: Facet values after the write (None if the document is now deleted)
+    """
+    if before == after:
+        return
+    deltas: Dict[FacetValue, List[int]] = {}
+    for facets, sign in ((before, -1), (after, 1)):
+        if facets is not None:
+            for value in _values(facets):
+                _add(deltas, value, sign, sign * facets.FileSizeBytes)
+    _apply(db, deltas, random.randrange(max(1, settings.STATS_COUNTER_SHARDS)))
+
+def _stored(db: Session) -> Dict[FacetValue, List[int]]:
+    stat = models.DocumentStat
+    return {
+        (facet, key): [int(count), int(size)]
+        for facet, key, count, size in db.query(
+            stat.Facet, stat.FacetKey, func.sum(stat.DocumentCount), func.sum(stat.TotalBytes)
+        ).group_by(stat.Facet, stat.FacetKey)
+    }
+
+def _actual(db: Session) -> Dict[FacetValue, List[int]]:
+    """Count live documents per facet value straight from the Documents table"""
+    document = models.Document
+    count, size = func.count(), func.coalesce(func.sum(document.FileSizeBytes), 0)
+    live = document.IsDeleted == False
+    totals: Dict[FacetValue, List[int]] = {}
+
+    for documents, total_bytes in db.query(count, size).filter(live):
+        _add(totals, (FACET_TOTAL, ""), documents, int(total_bytes))
+    for type_id, documents, total_bytes in db.query(document.DocumentTypeId, count, size).filter(live).group_by(
+        document.DocumentTypeId
+    ):
+        key = str(type_id) if type_id is not None else ""
+        _add(totals, (FACET_DOCUMENT_TYPE, key), documents, int(total_bytes))
+    year, month = extract("year", document.CreatedDate), extract("month", document.CreatedDate)
+    for year_value, month_value, documents, total_bytes in db.query(year, month, count, size).filter(live).group_by(
+        year, month
+    ):
+        _add(totals, (FACET_CREATED_MONTH, _month_key(year_value, month_value)), documents, int(total_bytes))
+    file_type = func.lower(document.FileType)
+    for file_type_value, documents, total_bytes in db.query(file_type, count, size).filter(live).group_by(file_type):
+        _add(totals, (FACET_FILE_TYPE, file_type_value or ""), documents, int(total_bytes))
+    return totals
+
+def reconcile_statistics(db: Session) -> Dict[str, int]:
+    """
+    Recount live documents and correct any counters that drifted
+
+    Corrections are applied as deltas, so writes committed meanwhile are
+    not lost. The stored counters are read before and after the recount;
+    if documents changed in between, the attempt is repeated.
+
+    Args:
+        db: Database session
+
+    Returns:
+        dict: Number of facet values checked and corrected
+
+    Raises:
+        RuntimeError: If documents kept changing for STATS_RECONCILE_ATTEMPTS attempts
+    """
+    for _ in range(max(1, settings.STATS_RECONCILE_ATTEMPTS)):
+        stored = _stored(db)
+        actual = _actual(db)
+        if _stored(db) != stored:
+            db.rollback()
+            continue
+        drift: Dict[FacetValue, List[int]] = {}
+        for value in set(stored) | set(actual):
+            counted = actual.get(value, [0, 0])
+            recorded = stored.get(value, [0, 0])
+            _add(drift, value, counted[0] - recorded[0], counted[1] - recorded[1])
+        corrected = _apply(db, drift, 0)
+        db.commit()
+        if corrected:
+            logger.warning(f"Document statistics corrected for {corrected} facet values")
+        return {"checked": len(drift), "corrected": corrected}
+    raise RuntimeError("Documents kept changing during reconciliation; try again later")
+
+def get_statistics(db: Session) -> Dict:
+    """
+    Document counts and total bytes, overall and per facet value
+
+    Args:
+        db: Database session
+
+    Returns:
+        dict: DocumentCount and TotalBytes, and buckets per DocumentType,
+        CreatedMonth (oldest first) and FileType (largest first)
+    """
+    stored = _stored(db)
+    buckets: Dict[str, List[Dict]] = {FACET_DOCUMENT_TYPE: [], FACET_CREATED_MONTH: [], FACET_FILE_TYPE: []}
+    for (facet, key), (count, size) in stored.items():
+        if count and facet in buckets:
+            buckets[facet].append({"Key": key or None, "DocumentCount": count, "TotalBytes": size})
+
+    type_ids = [int(bucket["Key"]) for bucket in buckets[FACET_DOCUMENT_TYPE] if bucket["Key"]]
+    names = dict(db.query(models.DocumentType.DocumentTypeId, models.DocumentType.TypeName).filter(
+        models.DocumentType.DocumentTypeId.in_(type_ids)
+    )) if type_ids else {}
+    for bucket in buckets[FACET_DOCUMENT_TYPE]:
+        bucket["Label"] = names.get(int(bucket["Key"])) if bucket["Key"] else None
+
+    buckets[FACET_CREATED_MONTH].sort(key=lambda bucket: bucket["Key"] or "")
+    for facet in (FACET_DOCUMENT_TYPE, FACET_FILE_TYPE):
+        buckets[facet].sort(key=lambda bucket: (-bucket["DocumentCount"], bucket["Key"] or ""))
+
+    count, size = stored.get((FACET_TOTAL, ""), [0, 0])
+    return {
+        "DocumentCount": count,
+        "TotalBytes": size,
+        "DocumentTypes": buckets[FACET_DOCUMENT_TYPE],
+        "CreatedMonths": buckets[FACET_CREATED_MONTH],
+        "FileTypes": buckets[FACET_FILE_TYPE],
+    }
@@ -0,0 +1,93 @@
+"""
+Storage Inventory Helpers
+
+This module answers "which files exist" and "which files are referenced" for
+the document storage backend, shared by the integrity scrubber and garbage
+collector:
+- Normalisation of stored FileLocation values (URIs and legacy paths)
+- Listing every object in the default storage backend
+- Keyset-batched collection of every referenced file location
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from typing import Iterator, List, Set
+import os
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.storage import StoredObject, default_backend, resolve
+
+def normalize_location(location: str) -> str:
+    """
+    Normalise a file location for comparison
+
+    Local files compare by absolute path, so local:// URIs and the absolute
+    paths stored by older rows match; remote objects compare by URI.
+
+    Args:
+        location: Value stored in FileLocation or reported by a backend listing
+
+    Returns:
+        str: Comparable form of the location
+    """
+    backend, key = resolve(location)
+    path = backend.local_path(key)
+    if path is None:
+        return location
+    return os.path.normcase(os.path.abspath(path))
+
+def location_forms(location: str) -> List[str]:
+    """
+    Spellings a FileLocation column may use for a stored object
+
+    Args:
+        location: URI reported by a backend listing
+
+    Returns:
+        List[str]: The URI, plus the absolute path for local files
+    """
+    backend, key = resolve(location)
+    path = backend.local_path(key)
+    return [location] if path is None else [location, str(path)]
+
+def iter_stored_objects() -> Iterator[StoredObject]:
+    """
+    List every document file in the default storage backend
+
+    Yields:
+        StoredObject: URI, size and modification time of each file
+    """
+    return default_backend().list()
+
+def referenced_locations(db: Session, batch_size: int = 10000) -> Set[str]:
+    """
+    Collect the normalised FileLocation of every document and version row
+
+    Deleted documents are included: their files are only removed by the
+    garbage collector, which deletes the rows at the same time.
+
+    Args:
+        db: Database session
+        batch_size: Rows fetched per keyset batch
+
+    Returns:
+        set: Normalised file locations
+    """
+    locations: Set[str] = set()
+    for key_column, location_column in (
+        (models.Document.DocumentId, models.Document.FileLocation),
+        (models.DocumentVersion.VersionId, models.DocumentVersion.FileLocation),
+    ):
+        last_id = 0
+        while True:
+            rows = db.query(key_column, location_column).filter(
+                key_column > last_id
+            ).order_by(key_column).limit(batch_size).all()
+            if not rows:
+                break
+            locations.update(normalize_location(location) for _, location in rows)
+            last_id = rows[-1][0]
+    return locations
@@ -0,0 +1,638 @@
+"""
+Tag Service Layer
+
+This module handles tag management and tag-based document filtering, including:
+- Tag creation, retrieval, updates and soft deletion
+- Bulk tagging and untagging of documents
+- An in-memory bitmap index per tag, rebuilt at startup and kept current on
+  writes in every worker process
+- Evaluation of AND / OR / NOT tag expressions against the index
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from datetime import datetime
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+import re
+
+import sqlalchemy as sa
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.bitmap import RoaringBitmap
+from app.core.config import settings
+from app.core.worker_channel import worker_channel
+from app.db.batching import chunked
+from app.db.database import backend
+from app.schemas.schemas import TagCreate, TagUpdate
+
+logger = logging.getLogger('app')
+
+# (TagId, DocumentId) pairs per message to the other workers
+_MESSAGE_PAIRS = 1000
+
+class TagIndexNotReady(Exception):
+    """Raised when the tag index is queried before its first build completes"""
+
+class _IndexState:
+    """Bitmaps for every tag plus the set of live (not deleted) documents"""
+
+    def __init__(self):
+        self.tags: Dict[int, RoaringBitmap] = {}
+        self.names: Dict[str, int] = {}
+        self.live = RoaringBitmap()
+
+class TagIndex:
+    """
+    Per-process bitmap index of tag assignments
+
+    Writes made through this process update the index as soon as they commit,
+    and are passed to the other workers on the same host through the worker
+    channel. Mutations that arrive while a rebuild is running are journaled and
+    replayed onto the new index before it is swapped in. The periodic rebuild
+    picks up changes committed on other hosts or lost between workers.
+    """
+
+    def __init__(self, rebuild_seconds: int):
+        self.rebuild_seconds = rebuild_seconds
+        self._state: Optional[_IndexState] = None
+        self._journal: Optional[List[Callable[[_IndexState], None]]] = None
+        self._lock = Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._state is not None
+
+    def _mutate(self, change: Callable[[_IndexState], None]) -> None:
+        with self._lock:
+            if self._state is not None:
+                change(self._state)
+            if self._journal is not None:
+                self._journal.append(change)
+
+    def rebuild(self, db: Session, batch_size: int = 50000) -> None:
+        """
+        Rebuild the index from DocumentTags, Tags and Documents
+
+        Args:
+            db: Database session
+            batch_size: Rows fetched per round trip while streaming
+        """
+        with self._lock:
+            self._journal = []
+        try:
+            state = _IndexState()
+            for tag_id, tag_name in db.query(models.Tag.TagId, models.Tag.TagName).filter(
+                models.Tag.IsActive == True
+            ):
+                state.names[tag_name.casefold()] = tag_id
+                state.tags[tag_id] = RoaringBitmap()
+
+            rows = db.query(models.DocumentTag.TagId, models.DocumentTag.DocumentId).order_by(
+                models.DocumentTag.TagId, models.DocumentTag.DocumentId
+            ).yield_per(batch_size)
+            current_tag, pending = None, []
+            for tag_id, document_id in rows:
+                if tag_id != current_tag or len(pending) >= batch_size:
+                    if pending:
+                        state.tags.setdefault(current_tag, RoaringBitmap()).update(pending)
+                    current_tag, pending = tag_id, []
+                pending.append(document_id)
+            if pending:
+                state.tags.setdefault(current_tag, RoaringBitmap()).update(pending)
+
+            live = db.query(models.Document.DocumentId).filter(
+                models.Document.IsDeleted == False
+            ).yield_per(batch_size)
+            state.live.update(document_id for (document_id,) in live)
+            db.rollback()
+        except Exception:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            for change in self._journal:
+                change(state)
+            self._journal = None
+            self._state = state
+        logger.info(f"Tag index rebuilt: {len(state.names)} tags, {len(state.live)} live documents")
+
+    def _rebuild_with_new_session(self) -> None:
+        # Imported here so the index can be created before the engine
+        from app.db.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self._rebuild_with_new_session)
+            except Exception as e:
+                logger.error(f"Tag index rebuild failed: {e}")
+            if self.rebuild_seconds <= 0 and self.ready:
+                return
+            await asyncio.sleep(self.rebuild_seconds if self.rebuild_seconds > 0 else 5)
+
+    def start(self) -> None:
+        """Build the index in the background and keep rebuilding it on an interval"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the rebuild task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @staticmethod
+    def _broadcast(operation: str, *args) -> None:
+        worker_channel.publish("tag_index", operation, *args)
+
+    def _receive(self, operation: str, *args) -> None:
+        if operation in ("tags_added", "tags_removed", "tag_saved", "document_live"):
+            getattr(self, operation)(*args, broadcast=False)
+
+    def tags_added(self, pairs: Iterable[Tuple[int, int]], broadcast: bool = True) -> None:
+        """Record committed (TagId, DocumentId) assignments"""
+        pairs = list(pairs)
+        grouped: Dict[int, List[int]] = {}
+        for tag_id, document_id in pairs:
+            grouped.setdefault(tag_id, []).append(document_id)
+
+        def change(state: _IndexState) -> None:
+            for tag_id, document_ids in grouped.items():
+                state.tags.setdefault(tag_id, RoaringBitmap()).update(document_ids)
+        self._mutate(change)
+        if broadcast:
+            for chunk in chunked(pairs, _MESSAGE_PAIRS):
+                self._broadcast("tags_added", chunk)
+
+    def tags_removed(self, pairs: Iterable[Tuple[int, int]], broadcast: bool = True) -> None:
+        """Record committed (TagId, DocumentId) removals"""
+        pairs = list(pairs)
+
+        def change(state: _IndexState) -> None:
+            for tag_id, document_id in pairs:
+                if tag_id in state.tags:
+                    state.tags[tag_id].discard(document_id)
+        self._mutate(change)
+        if broadcast:
+            for chunk in chunked(pairs, _MESSAGE_PAIRS):
+                self._broadcast("tags_removed", chunk)
+
+    def tag_saved(self, tag_id: int, tag_name: str, is_active: bool, broadcast: bool = True) -> None:
+        """Record a created, renamed, activated or deactivated tag"""
+        def change(state: _IndexState) -> None:
+            for name, known_id in list(state.names.items()):
+                if known_id == tag_id:
+                    del state.names[name]
+            if is_active:
+                state.names[tag_name.casefold()] = tag_id
+                state.tags.setdefault(tag_id, RoaringBitmap())
+        self._mutate(change)
+        if broadcast:
+            self._broadcast("tag_saved", tag_id, tag_name, is_active)
+
+    def document_live(self, document_id: int, is_live: bool, broadcast: bool = True) -> None:
+        """Record a document being created, deleted or restored"""
+        def change(state: _IndexState) -> None:
+            if is_live:
+                state.live.add(document_id)
+            else:
+                state.live.discard(document_id)
+        self._mutate(change)
+        if broadcast:
+            self._broadcast("document_live", document_id, is_live)
+
+    def evaluate(self, expression: "TagExpression") -> RoaringBitmap:
+        """
+        Evaluate a parsed tag expression
+
+        Args:
+            expression: Tree returned by parse_tag_expression
+
+        Returns:
+            RoaringBitmap: Live documents matching the expression
+
+        Raises:
+            TagIndexNotReady: If the first build has not finished
+            ValueError: If the expression names unknown tags
+        """
+        with self._lock:
+            state = self._state
+            if state is None:
+                raise TagIndexNotReady()
+            unknown = sorted({
+                name for name in _tag_names(expression) if name.casefold() not in state.names
+            })
+            if unknown:
+                raise ValueError(f"Unknown tags: {', '.join(unknown)}")
+            return _evaluate(expression, state) & state.live
+
+# Process-wide tag index
+tag_index = TagIndex(rebuild_seconds=settings.TAG_INDEX_REBUILD_SECONDS)
+worker_channel.subscribe("tag_index", tag_index._receive)
+
+# Parsed expressions: ("tag", name) | ("not", node) | ("and", [nodes]) | ("or", [nodes])
+TagExpression = Tuple
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"((?:[^"\\]|\\.)*)"|([^\s()"]+))')
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens, position = [], 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise ValueError(f"Unexpected character at position {position}")
+        position = match.end()
+        open_paren, close_paren, quoted, word = match.groups()
+        if open_paren:
+            tokens.append(("(", open_paren))
+        elif close_paren:
+            tokens.append((")", close_paren))
+        elif quoted is not None:
+            tokens.append(("name", re.sub(r"\\(.)", r"\1", quoted)))
+        elif word.upper() in ("AND", "OR", "NOT"):
+            tokens.append((word.upper(), word))
+        else:
+            tokens.append(("name", word))
+    return tokens
+
+def parse_tag_expression(text: str) -> TagExpression:
+    """
+    Parse a tag expression such as: invoice AND ("fiscal 2024" OR audit) AND NOT draft
+
+    NOT binds tightest, then AND, then OR. Tag names containing spaces,
+    parentheses or keywords must be double-quoted.
+
+    Args:
+        text: Expression to parse
+
+    Returns:
+        tuple: Expression tree
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    tokens = _tokenize(text)
+    position = 0
+
+    def peek() -> Optional[str]:
+        return tokens[position][0] if position < len(tokens) else None
+
+    def take(kind: str) -> str:
+        nonlocal position
+        if peek() != kind:
+            found = tokens[position][1] if position < len(tokens) else "end of expression"
+            raise ValueError(f"Expected {kind} but found {found}")
+        position += 1
+        return tokens[position - 1][1]
+
+    def parse_or() -> TagExpression:
+        operands = [parse_and()]
+        while peek() == "OR":
+            take("OR")
+            operands.append(parse_and())
+        return operands[0] if len(operands) == 1 else ("or", operands)
+
+    def parse_and() -> TagExpression:
+        operands = [parse_not()]
+        while peek() == "AND":
+            take("AND")
+            operands.append(parse_not())
+        return operands[0] if len(operands) == 1 else ("and", operands)
+
+    def parse_not() -> TagExpression:
+        if peek() == "NOT":
+            take("NOT")
+            return ("not", parse_not())
+        if peek() == "(":
+            take("(")
+            node = parse_or()
+            take(")")
+            return node
+        return ("tag", take("name"))
+
+    if not tokens:
+        raise ValueError("Empty tag expression")
+    expression = parse_or()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected {tokens[position][1]}")
+    return expression
+
+def _tag_names(expression: TagExpression) -> Iterable[str]:
+    kind, operand = expression
+    if kind == "tag":
+        yield operand
+    elif kind == "not":
+        yield from _tag_names(operand)
+    else:
+        for child in operand:
+            yield from _tag_names(child)
+
+def _evaluate(expression: TagExpression, state: _IndexState) -> RoaringBitmap:
+    kind, operand = expression
+    if kind == "tag":
+        return state.tags[state.names[operand.casefold()]]
+    if kind == "not":
+        return state.live - _evaluate(operand, state)
+    if kind == "or":
+        result = RoaringBitmap()
+        for child in operand:
+            result = result | _evaluate(child, state)
+        return result
+
+    # AND: intersect the positive operands, then subtract the negated ones
+    # instead of materialising the complement of each NOT
+    positives = [child for child in operand if child[0] != "not"]
+    negatives = [child[1] for child in operand if child[0] == "not"]
+    if positives:
+        bitmaps = sorted((_evaluate(child, state) for child in positives), key=len)
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            result = result & bitmap
+    else:
+        result = state.live
+    for child in negatives:
+        result = result - _evaluate(child, state)
+    return result
+
+def query_documents(expression: str, skip: int = 0, limit: int = 100) -> Dict:
+    """
+    Find live documents matching a tag expression
+
+    Args:
+        expression: Tag expression (see parse_tag_expression)
+        skip: Number of matching IDs to skip
+        limit: Maximum number of IDs to return
+
+    Returns:
+        dict: Total match count and one page of DocumentIds in ascending order
+
+    Raises:
+        HTTPException: 400 for malformed expressions or unknown tags,
+            503 while the index is still being built
+    """
+    try:
+        result = tag_index.evaluate(parse_tag_expression(expression))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except TagIndexNotReady:
+        raise HTTPException(
+            status_code=503,
+            detail="Tag index is being built",
+            headers={"Retry-After": "5"}
+        )
+    return {"Total": len(result), "DocumentIds": result.page(skip, limit)}
+
+def create_tag(db: Session, tag: TagCreate):
+    """
+    Create a new tag
+
+    Args:
+        db: Database session
+        tag: Tag creation data
+
+    Returns:
+        models.Tag: Created tag instance
+
+    Raises:
+        HTTPException: If creation fails due to validation or DB constraints
+    """
+    db_tag = models.Tag(
+        TagName=tag.TagName,
+        Description=tag.Description,
+        IsActive=tag.IsActive
+    )
+    try:
+        db.add(db_tag)
+        db.commit()
+        db.refresh(db_tag)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    tag_index.tag_saved(db_tag.TagId, db_tag.TagName, db_tag.IsActive)
+    return db_tag
+
+def get_tags(db: Session, skip: int = 0, limit: int = 100):
+    """
+    Retrieve all active tags with pagination
+
+    Args:
+        db: Database session
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+
+    Returns:
+        List[models.Tag]: List of active tag instances
+    """
+    return db.query(models.Tag).filter(
+        models.Tag.IsActive == True
+    ).order_by(models.Tag.TagId).offset(skip).limit(limit).all()
+
+def get_tag(db: Session, tag_id: int):
+    """
+    Retrieve a specific active tag by ID
+
+    Args:
+        db: Database session
+        tag_id: ID of tag to retrieve
+
+    Returns:
+        models.Tag: Tag instance if found, None otherwise
+    """
+    return db.query(models.Tag).filter(
+        models.Tag.TagId == tag_id,
+        models.Tag.IsActive == True
+    ).first()
+
+def update_tag(db: Session, tag_id: int, tag: TagUpdate):
+    """
+    Update a tag's attributes
+
+    Args:
+        db: Database session
+        tag_id: ID of tag to update
+        tag: Updated tag information
+
+    Returns:
+        models.Tag: Updated tag instance if found, None otherwise
+
+    Raises:
+        HTTPException: If update fails due to validation or DB constraints
+    """
+    db_tag = get_tag(db, tag_id)
+    if not db_tag:
+        return None
+
+    for field, value in tag.dict(exclude_unset=True).items():
+        setattr(db_tag, field, value)
+
+    try:
+        db.commit()
+        db.refresh(db_tag)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    tag_index.tag_saved(db_tag.TagId, db_tag.TagName, db_tag.IsActive)
+    return db_tag
+
+def delete_tag(db: Session, tag_id: int) -> bool:
+    """
+    Deactivate a tag (soft delete)
+
+    Args:
+        db: Database session
+        tag_id: ID of tag to deactivate
+
+    Returns:
+        bool: True if tag was deactivated, False if not found or operation failed
+    """
+    db_tag = get_tag(db, tag_id)
+    if not db_tag:
+        return False
+
+    db_tag.IsActive = False
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        return False
+    tag_index.tag_saved(db_tag.TagId, db_tag.TagName, False)
+    return True
+
+def _existing_pairs(db: Session, tag_ids: List[int], document_ids: List[int]) -> set:
+    pairs = set()
+    for chunk in chunked(document_ids):
+        pairs.update(
+            tuple(row) for row in db.query(models.DocumentTag.TagId, models.DocumentTag.DocumentId).filter(
+                models.DocumentTag.TagId.in_(tag_ids),
+                models.DocumentTag.DocumentId.in_(chunk)
+            )
+        )
+    return pairs
+
+def tag_documents(db: Session, tag_ids: List[int], document_ids: List[int]) -> int:
+    """
+    Apply every listed tag to every listed document
+
+    Args:
+        db: Database session
+        tag_ids: Tags to apply
+        document_ids: Documents to tag
+
+    Returns:
+        int: Number of new assignments
+
+    Raises:
+        HTTPException: If a tag does not exist or the insert fails
+    """
+    tag_ids = sorted(set(tag_ids))
+    active = {
+        tag_id for (tag_id,) in db.query(models.Tag.TagId).filter(
+            models.Tag.TagId.in_(tag_ids),
+            models.Tag.IsActive == True
+        )
+    }
+    missing = [tag_id for tag_id in tag_ids if tag_id not in active]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Tags not found: {missing}")
+
+    live = []
+    for chunk in chunked(sorted(set(document_ids))):
+        live.extend(
+            document_id for (document_id,) in db.query(models.Document.DocumentId).filter(
+                models.Document.DocumentId.in_(chunk),
+                models.Document.IsDeleted == False
+            )
+        )
+    existing = _existing_pairs(db, tag_ids, live)
+    new_pairs = [
+        (tag_id, document_id)
+        for tag_id in tag_ids
+        for document_id in live
+        if (tag_id, document_id) not in existing
+    ]
+    if not new_pairs:
+        return 0
+
+    now = datetime.utcnow()
+    try:
+        # COPY on PostgreSQL, fast executemany on SQL Server
+        backend.bulk_insert(
+            db.connection(),
+            models.DocumentTag.__table__,
+            [{"TagId": tag_id, "DocumentId": document_id, "CreatedDate": now} for tag_id, document_id in new_pairs]
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    tag_index.tags_added(new_pairs)
+    return len(new_pairs)
+
+def untag_documents(db: Session, tag_ids: List[int], document_ids: List[int]) -> int:
+    """
+    Remove every listed tag from every listed document
+
+    Args:
+        db: Database session
+        tag_ids: Tags to remove
+        document_ids: Documents to untag
+
+    Returns:
+        int: Number of assignments removed
+    """
+    tag_ids = sorted(set(tag_ids))
+    document_ids = sorted(set(document_ids))
+    removed_pairs = list(_existing_pairs(db, tag_ids, document_ids))
+    if not removed_pairs:
+        return 0
+
+    table = models.DocumentTag.__table__
+    try:
+        for chunk in chunked(document_ids):
+            db.execute(sa.delete(table).where(
+                table.c.TagId.in_(tag_ids),
+                table.c.DocumentId.in_(chunk)
+            ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    tag_index.tags_removed(removed_pairs)
+    return len(removed_pairs)
+
+def get_document_tags(db: Session, document_id: int):
+    """
+    Retrieve the active tags of a document
+
+    Args:
+        db: Database session
+        document_id: Document whose tags are returned
+
+    Returns:
+        List[models.Tag]: Tags ordered by name
+    """
+    return db.query(models.Tag).join(
+        models.DocumentTag, models.DocumentTag.TagId == models.Tag.TagId
+    ).filter(
+        models.DocumentTag.DocumentId == document_id,
+        models.Tag.IsActive == True
+    ).order_by(models.Tag.TagName).all()
@@ -0,0 +1,414 @@
+"""
+Text Extraction Service
+
+This module provides the plain text of stored documents, including:
+- A pool of extraction worker processes with a per-file timeout and a
+  per-worker memory limit; a worker that overruns either is replaced
+- A compressed on-disk cache under TEXT_CACHE_DIR keyed by ContentHash, so
+  duplicate uploads and unchanged versions are never extracted twice
+- Failure markers, so files that cannot be extracted are not retried on
+  every request
+- Background extraction of new documents and a batched backfill
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Event, Lock, get_ident
+from typing import Dict, NamedTuple, Optional
+import gzip
+import json
+import logging
+import multiprocessing
+import os
+import queue
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core import metrics
+from app.core.config import settings
+from app.core.text_extraction import (
+    STATUS_ERROR, STATUS_MISSING, STATUS_OK, STATUS_UNSUPPORTED, worker_main
+)
+
+logger = logging.getLogger('app')
+
+# Reported when a worker is killed for running past TEXT_EXTRACTION_TIMEOUT_SECONDS
+STATUS_TIMEOUT = "timeout"
+
+class ExtractionResult(NamedTuple):
+    """Outcome of extracting one file; text is set only when status is "ok" """
+    status: str
+    format: Optional[str] = None
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+class _Worker(NamedTuple):
+    process: multiprocessing.Process
+    conn: object
+
+class ExtractionPool:
+    """
+    Long-lived worker processes, each extracting one file at a time
+
+    ProcessPoolExecutor cannot abandon a single task, so the pool manages
+    its own processes: a worker that runs past the timeout is killed and
+    replaced, as is one that died (e.g. at its memory limit). Workers are
+    spawned rather than forked so they never inherit the API process's
+    threads, sockets or database connections, and are started on first use.
+    """
+
+    def __init__(self, workers: int, timeout: float, memory_bytes: int, max_input_bytes: int):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_bytes = memory_bytes
+        self.max_input_bytes = max_input_bytes
+        self._lock = Lock()
+        self._slots: Optional[queue.Queue] = None
+        self._pid: Optional[int] = None
+
+    def _get_slots(self) -> queue.Queue:
+        # One slot per worker; an empty slot (None) is filled by spawning on checkout
+        with self._lock:
+            if self._slots is None or self._pid != os.getpid():
+                self._slots = queue.Queue()
+                for _ in range(self.workers):
+                    self._slots.put(None)
+                self._pid = os.getpid()
+            return self._slots
+
+    def _spawn(self) -> _Worker:
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=worker_main,
+            args=(child_conn, self.memory_bytes, self.max_input_bytes),
+            name="text-extraction",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    @staticmethod
+    def _kill(worker: _Worker) -> None:
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+
+    def extract(self, location: str, file_type: Optional[str]) -> ExtractionResult:
+        """
+        Extract one stored file, waiting for a free worker first
+
+        Args:
+            location: FileLocation of the file
+            file_type: Declared FileType
+
+        Returns:
+            ExtractionResult: Text, or why there is none
+        """
+        slots = self._get_slots()
+        worker = slots.get()
+        try:
+            if worker is not None and not worker.process.is_alive():
+                self._kill(worker)
+                worker = None
+            if worker is None:
+                worker = self._spawn()
+            worker.conn.send((location, file_type))
+            if not worker.conn.poll(self.timeout):
+                self._kill(worker)
+                worker = None
+                return ExtractionResult(STATUS_TIMEOUT, error=f"extraction took longer than {self.timeout:g}s")
+            status, content_format, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            # The worker died mid-file, most likely at its memory limit
+            if worker is not None:
+                self._kill(worker)
+                worker = None
+            return ExtractionResult(STATUS_ERROR, error="extraction worker exited before finishing")
+        finally:
+            slots.put(worker)
+
+        if status == STATUS_OK:
+            return ExtractionResult(status, content_format, payload)
+        return ExtractionResult(status, error=payload)
+
+    def shutdown(self) -> None:
+        """Stop the idle workers; busy ones are daemons and end with the process"""
+        with self._lock:
+            slots, self._slots = self._slots, None
+            if self._pid != os.getpid():
+                # Workers of a parent process are not ours to stop
+                return
+        while slots is not None:
+            try:
+                worker = slots.get_nowait()
+            except queue.Empty:
+                break
+            if worker is None:
+                continue
+            try:
+                worker.conn.send(None)
+                worker.process.join(1)
+            except OSError:
+                pass
+            self._kill(worker)
+
+class TextCache:
+    """
+    Extracted text on disk, keyed by ContentHash
+
+    Text is stored gzip-compressed with its format on the first line;
+    failures are stored as small JSON markers next to it. Files are
+    written to a temporary name and renamed, so readers in other processes
+    never see a partial entry.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _path(self, content_hash: str, suffix: str) -> Path:
+        return self.directory / content_hash[:2] / f"{content_hash}{suffix}"
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}-{get_ident()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+
+    def get(self, content_hash: str) -> Optional[ExtractionResult]:
+        """
+        Look up a cached result
+
+        Args:
+            content_hash: ContentHash of the file
+
+        Returns:
+            ExtractionResult: Cached text or failure, or None if the content was never extracted
+        """
+        try:
+            with gzip.open(self._path(content_hash, ".txt.gz"), "rt", encoding="utf-8") as cached:
+                content_format = cached.readline().rstrip("\n")
+                return ExtractionResult(STATUS_OK, content_format, cached.read())
+        except FileNotFoundError:
+            pass
+        try:
+            marker = json.loads(self._path(content_hash, ".failed.json").read_text())
+        except FileNotFoundError:
+            return None
+        return ExtractionResult(marker["Status"], error=marker["Error"])
+
+    def put(self, content_hash: str, result: ExtractionResult) -> None:
+        """
+        Store a result, replacing any earlier one for the same content
+
+        Args:
+            content_hash: ContentHash of the file
+            result: Extraction result
+        """
+        failure = self._path(content_hash, ".failed.json")
+        if result.status == STATUS_OK:
+            payload = f"{result.format}\n{result.text}".encode("utf-8")
+            self._write(self._path(content_hash, ".txt.gz"), gzip.compress(payload, compresslevel=6))
+            failure.unlink(missing_ok=True)
+        else:
+            self._write(failure, json.dumps({"Status": result.status, "Error": result.error}).encode())
+
+class TextExtractor:
+    """Cached extraction on top of the worker pool, plus background scheduling"""
+
+    def __init__(self, pool: ExtractionPool, cache: TextCache):
+        self.pool = pool
+        self.cache = cache
+        self._lock = Lock()
+        self._in_progress: Dict[str, Event] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self.extractions = metrics.register(metrics.Counter(
+            "dms_text_extractions_total", "Files run through text extraction", ["status"]
+        ))
+
+    def extract(
+        self,
+        location: str,
+        file_type: Optional[str],
+        content_hash: Optional[str],
+        retry_failed: bool = False
+    ) -> ExtractionResult:
+        """
+        Text of a stored file, from the cache when possible
+
+        Concurrent calls for the same ContentHash wait for one extraction
+        instead of each running their own.
+
+        Args:
+            location: FileLocation of the file
+            file_type: Declared FileType
+            content_hash: ContentHash of the file (None skips the cache)
+            retry_failed: Extract again even if an earlier attempt failed
+
+        Returns:
+            ExtractionResult: Text, or why there is none
+        """
+        if not content_hash:
+            return self._run(location, file_type)
+        while True:
+            cached = self.cache.get(content_hash)
+            if cached is not None and (cached.status == STATUS_OK or not retry_failed):
+                return cached
+            with self._lock:
+                running = self._in_progress.get(content_hash)
+                if running is None:
+                    self._in_progress[content_hash] = Event()
+                    break
+            running.wait()
+            # The other caller's result is in the cache now, unless the file was missing
+            retry_failed = False
+
+        try:
+            result = self._run(location, file_type)
+            # A missing file says nothing about the content; another copy may be fine
+            if result.status != STATUS_MISSING:
+                self.cache.put(content_hash, result)
+            return result
+        finally:
+            with self._lock:
+                self._in_progress.pop(content_hash).set()
+
+    def _run(self, location: str, file_type: Optional[str]) -> ExtractionResult:
+        result = self.pool.extract(location, file_type)
+        self.extractions.inc(result.status)
+        if result.status not in (STATUS_OK, STATUS_UNSUPPORTED):
+            logger.warning(f"Text extraction {result.status} for {location}: {result.error}")
+        return result
+
+    def _extract_logged(self, location: str, file_type: Optional[str], content_hash: Optional[str]) -> None:
+        try:
+            self.extract(location, file_type, content_hash)
+        except Exception as e:
+            logger.error(f"Text extraction failed for {location}: {e}")
+
+    def schedule(self, location: str, file_type: Optional[str], content_hash: Optional[str]) -> None:
+        """Extract a newly stored file in the background"""
+        with self._lock:
+            # Threads do not survive fork, so an inherited executor is replaced
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor_pid = os.getpid()
+                self._executor = ThreadPoolExecutor(max_workers=self.pool.workers, thread_name_prefix="text")
+            executor = self._executor
+        executor.submit(self._extract_logged, location, file_type, content_hash)
+
+    def shutdown(self) -> None:
+        """Drop queued background work and stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            # Anything dropped here is picked up by manage.py extract-text
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.shutdown()
+
+# Process-wide extractor
+text_extractor = TextExtractor(
+    ExtractionPool(
+        workers=settings.TEXT_EXTRACTION_WORKERS,
+        timeout=settings.TEXT_EXTRACTION_TIMEOUT_SECONDS,
+        memory_bytes=settings.TEXT_EXTRACTION_MEMORY_BYTES,
+        max_input_bytes=settings.TEXT_EXTRACTION_MAX_INPUT_BYTES
+    ),
+    TextCache(settings.TEXT_CACHE_DIR)
+)
+
+def get_text_source(db: Session, document_id: int):
+    """
+    Look up what is needed to extract a document's text
+
+    Callers extract after releasing the session, so a slow file does not
+    hold a database connection.
+
+    Args:
+        db: Database session
+        document_id: Document's unique identifier
+
+    Returns:
+        Row with FileLocation, FileType and ContentHash, or None if the document does not exist
+    """
+    return db.query(
+        models.Document.FileLocation,
+        models.Document.FileType,
+        models.Document.ContentHash
+    ).filter(
+        models.Document.DocumentId == document_id,
+        models.Document.IsDeleted == False
+    ).first()
+
+def backfill_text(
+    db: Session,
+    batch_size: int = 500,
+    retry_failed: bool = False,
+    progress=None
+) -> Dict[str, int]:
+    """
+    Extract every live document whose content is not in the cache yet
+
+    Args:
+        db: Database session
+        batch_size: Documents read per query
+        retry_failed: Also retry content whose extraction failed before
+        progress: Optional callable receiving the running totals after each batch
+
+    Returns:
+        dict: Counts of extracted, already cached, unsupported and failed documents
+    """
+    totals = {"extracted": 0, "cached": 0, "unsupported": 0, "failed": 0}
+    last_id = 0
+    with ThreadPoolExecutor(max_workers=max(1, text_extractor.pool.workers)) as executor:
+        while True:
+            batch = db.query(
+                models.Document.DocumentId,
+                models.Document.FileLocation,
+                models.Document.FileType,
+                models.Document.ContentHash
+            ).filter(
+                models.Document.DocumentId > last_id,
+                models.Document.IsDeleted == False
+            ).order_by(models.Document.DocumentId).limit(batch_size).all()
+            if not batch:
+                break
+            last_id = batch[-1].DocumentId
+
+            pending, seen = [], set()
+            for row in batch:
+                cached = text_extractor.cache.get(row.ContentHash) if row.ContentHash else None
+                if row.ContentHash in seen or (
+                    cached is not None and (cached.status == STATUS_OK or not retry_failed)
+                ):
+                    totals["cached"] += 1
+                    continue
+                if row.ContentHash:
+                    seen.add(row.ContentHash)
+                pending.append(row)
+
+            futures = [
+                executor.submit(text_extractor.extract, row.FileLocation, row.FileType, row.ContentHash, retry_failed)
+                for row in pending
+            ]
+            for row, future in zip(pending, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = ExtractionResult(STATUS_ERROR, error=str(e))
+                if result.status == STATUS_OK:
+                    totals["extracted"] += 1
+                elif result.status == STATUS_UNSUPPORTED:
+                    totals["unsupported"] += 1
+                else:
+                    totals["failed"] += 1
+                    logger.error(f"Text extraction {result.status} for document {row.DocumentId}: {result.error}")
+            if progress:
+                progress(totals)
+    return totals
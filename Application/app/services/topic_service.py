@@ -0,0 +1,552 @@
+"""
+Topic Service Layer
+
+This module handles the topic hierarchy business logic, including:
+- Topic creation, retrieval, updates and soft deletion
+- Maintenance of the TopicClosure table on insert and subtree moves
+- Single-query subtree and ancestor lookups
+- Document assignment and documents-under-subtree queries
+- An in-memory topic tree invalidated on change, in every worker process
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, List, Optional
+import json
+import time
+
+import sqlalchemy as sa
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.core.worker_channel import worker_channel
+from app.db.batching import chunked
+from app.db.database import backend
+from app.schemas.schemas import TopicCreate, TopicUpdate
+
+closure = models.TopicClosure.__table__
+
+class TopicTree:
+    """
+    Cached copy of the active topic hierarchy
+
+    Built from one query and dropped whenever a topic changes. Workers on the
+    same host are told through the worker channel; the TTL bounds how long
+    changes made elsewhere (or a lost message) stay invisible.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._built_at: Optional[float] = None
+        self._nodes: Dict[int, Dict[str, Any]] = {}
+        self._children: Dict[Optional[int], List[int]] = {}
+        self._rendered: Optional[bytes] = None
+
+    def invalidate(self, broadcast: bool = True) -> None:
+        """Drop the cached tree so the next read rebuilds it, here and (if broadcast) in other workers"""
+        with self._lock:
+            self._built_at = None
+            self._rendered = None
+        if broadcast:
+            worker_channel.publish("topic_tree")
+
+    def _stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > self.ttl_seconds
+
+    def _build(self, db: Session) -> None:
+        rows = db.query(
+            models.Topic.TopicId,
+            models.Topic.TopicName,
+            models.Topic.Description,
+            models.Topic.ParentTopicId,
+            models.Topic.IsActive,
+            models.Topic.CreatedDate
+        ).filter(models.Topic.IsActive == True).order_by(models.Topic.TopicId).all()
+
+        nodes = {
+            row.TopicId: {
+                "TopicName": row.TopicName,
+                "Description": row.Description,
+                "ParentTopicId": row.ParentTopicId,
+                "IsActive": row.IsActive,
+                "TopicId": row.TopicId,
+                "CreatedDate": row.CreatedDate.isoformat() if row.CreatedDate else None,
+            }
+            for row in rows
+        }
+        children: Dict[Optional[int], List[int]] = {}
+        for topic_id, node in nodes.items():
+            # Topics whose parent is inactive are shown at the root
+            parent_id = node["ParentTopicId"] if node["ParentTopicId"] in nodes else None
+            children.setdefault(parent_id, []).append(topic_id)
+
+        self._nodes = nodes
+        self._children = children
+        self._rendered = None
+        self._built_at = time.monotonic()
+
+    def _ensure(self, db: Session) -> None:
+        with self._lock:
+            if self._stale():
+                self._build(db)
+
+    def _render(self, topic_id: int) -> Dict[str, Any]:
+        # Iterative so deep hierarchies cannot hit the recursion limit
+        root = dict(self._nodes[topic_id], child_topics=[])
+        pending = [(topic_id, root)]
+        while pending:
+            parent_id, parent = pending.pop()
+            for child_id in self._children.get(parent_id, []):
+                child = dict(self._nodes[child_id], child_topics=[])
+                parent["child_topics"].append(child)
+                pending.append((child_id, child))
+        return root
+
+    def rendered(self, db: Session) -> bytes:
+        """
+        Return the whole active hierarchy as encoded JSON
+
+        Args:
+            db: Database session used if the cache needs rebuilding
+
+        Returns:
+            bytes: JSON list of root topics with nested child_topics
+        """
+        self._ensure(db)
+        with self._lock:
+            if self._rendered is None:
+                roots = [self._render(topic_id) for topic_id in self._children.get(None, [])]
+                self._rendered = json.dumps(roots, separators=(",", ":")).encode()
+            return self._rendered
+
+    def descendant_ids(self, db: Session, topic_id: int) -> List[int]:
+        """
+        List a topic and all of its active descendants from the cache
+
+        Args:
+            db: Database session used if the cache needs rebuilding
+            topic_id: Subtree root
+
+        Returns:
+            List[int]: Topic IDs in the subtree, empty if the topic is unknown
+        """
+        self._ensure(db)
+        with self._lock:
+            if topic_id not in self._nodes:
+                return []
+            result, pending = [], [topic_id]
+            while pending:
+                current = pending.pop()
+                result.append(current)
+                pending.extend(self._children.get(current, []))
+            return result
+
+# Process-wide tree cache
+topic_tree = TopicTree(ttl_seconds=settings.TOPIC_TREE_CACHE_SECONDS)
+worker_channel.subscribe("topic_tree", lambda: topic_tree.invalidate(broadcast=False))
+
+def _subtree_ids(topic_id: int):
+    """Subquery selecting a topic and all of its descendants"""
+    return sa.select(closure.c.DescendantTopicId).where(closure.c.AncestorTopicId == topic_id)
+
+def _insert_closure(db: Session, topic_id: int, parent_id: Optional[int]) -> None:
+    """Add closure rows for a new leaf topic"""
+    db.execute(sa.insert(closure).values(
+        AncestorTopicId=topic_id, DescendantTopicId=topic_id, Depth=0
+    ))
+    if parent_id is not None:
+        db.execute(sa.insert(closure).from_select(
+            ["AncestorTopicId", "DescendantTopicId", "Depth"],
+            sa.select(
+                closure.c.AncestorTopicId,
+                sa.literal(topic_id),
+                closure.c.Depth + 1
+            ).where(closure.c.DescendantTopicId == parent_id)
+        ))
+
+def _lock_move(db: Session, topic_id: int, new_parent_id: Optional[int]) -> None:
+    """Lock the moved topic and the new parent's ancestors, including the parent itself"""
+    topics = models.Topic.__table__
+    locked = set()
+    while True:
+        wanted = {topic_id}
+        if new_parent_id is not None:
+            wanted.update(db.execute(
+                sa.select(closure.c.AncestorTopicId).where(closure.c.DescendantTopicId == new_parent_id)
+            ).scalars())
+        # A concurrent move may have re-parented the new parent while we waited
+        if wanted <= locked:
+            return
+        backend.lock_rows(db.connection(), topics, "TopicId", sorted(wanted))
+        locked |= wanted
+
+def _move_subtree(db: Session, topic_id: int, new_parent_id: Optional[int]) -> None:
+    """
+    Re-link a subtree under a new parent, touching only the affected closure rows
+
+    The moved topic and every ancestor of the new parent are locked first, so
+    two moves that would together form a cycle (A under B and B under A, or
+    through deeper ancestors) share a locked row and the second one sees the
+    first one's closure rows when it checks for a cycle.
+
+    Raises:
+        HTTPException: If the new parent does not exist or lies inside the subtree
+    """
+    _lock_move(db, topic_id, new_parent_id)
+
+    if new_parent_id is not None:
+        if get_topic(db, new_parent_id) is None:
+            raise HTTPException(status_code=400, detail="Parent topic not found")
+        creates_cycle = db.query(closure).filter(
+            closure.c.AncestorTopicId == topic_id,
+            closure.c.DescendantTopicId == new_parent_id
+        ).first()
+        if creates_cycle:
+            raise HTTPException(status_code=400, detail="A topic cannot be moved under itself or its descendants")
+
+    # Detach: drop paths from the old ancestors into the subtree
+    old_ancestors = sa.select(closure.c.AncestorTopicId).where(
+        closure.c.DescendantTopicId == topic_id,
+        closure.c.AncestorTopicId != topic_id
+    )
+    db.execute(sa.delete(closure).where(
+        closure.c.DescendantTopicId.in_(_subtree_ids(topic_id)),
+        closure.c.AncestorTopicId.in_(old_ancestors)
+    ))
+
+    # Attach: every new ancestor reaches every subtree node
+    if new_parent_id is not None:
+        supertree = closure.alias("supertree")
+        subtree = closure.alias("subtree")
+        db.execute(sa.insert(closure).from_select(
+            ["AncestorTopicId", "DescendantTopicId", "Depth"],
+            sa.select(
+                supertree.c.AncestorTopicId,
+                subtree.c.DescendantTopicId,
+                supertree.c.Depth + subtree.c.Depth + 1
+            ).select_from(
+                supertree.join(subtree, sa.true())
+            ).where(
+                supertree.c.DescendantTopicId == new_parent_id,
+                subtree.c.AncestorTopicId == topic_id
+            )
+        ))
+
+def create_topic(db: Session, topic: TopicCreate):
+    """
+    Create a new topic and its closure rows
+
+    Args:
+        db: Database session
+        topic: Topic creation data
+
+    Returns:
+        models.Topic: Created topic instance
+
+    Raises:
+        HTTPException: If the parent does not exist or the insert fails
+    """
+    if topic.ParentTopicId is not None and get_topic(db, topic.ParentTopicId) is None:
+        raise HTTPException(status_code=400, detail="Parent topic not found")
+
+    db_topic = models.Topic(
+        TopicName=topic.TopicName,
+        Description=topic.Description,
+        ParentTopicId=topic.ParentTopicId,
+        IsActive=True,
+        CreatedDate=datetime.utcnow()
+    )
+    try:
+        db.add(db_topic)
+        db.flush()
+        _insert_closure(db, db_topic.TopicId, topic.ParentTopicId)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    topic_tree.invalidate()
+    db.refresh(db_topic)
+    return db_topic
+
+def get_topics(db: Session, skip: int = 0, limit: int = 100):
+    """
+    Retrieve all active topics with pagination
+
+    Args:
+        db: Database session
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+
+    Returns:
+        List[models.Topic]: List of active topic instances
+    """
+    return db.query(models.Topic).filter(
+        models.Topic.IsActive == True
+    ).order_by(models.Topic.TopicId).offset(skip).limit(limit).all()
+
+def get_topic(db: Session, topic_id: int):
+    """
+    Retrieve a specific active topic by ID
+
+    Args:
+        db: Database session
+        topic_id: ID of topic to retrieve
+
+    Returns:
+        models.Topic: Topic instance if found, None otherwise
+    """
+    return db.query(models.Topic).filter(
+        models.Topic.TopicId == topic_id,
+        models.Topic.IsActive == True
+    ).first()
+
+def get_descendants(db: Session, topic_id: int, max_depth: Optional[int] = None):
+    """
+    Retrieve the active descendants of a topic in one query
+
+    Args:
+        db: Database session
+        topic_id: Subtree root (not included in the result)
+        max_depth: Only return descendants at most this many levels down
+
+    Returns:
+        List[models.Topic]: Descendants ordered by depth, then ID
+    """
+    query = db.query(models.Topic).join(
+        closure, closure.c.DescendantTopicId == models.Topic.TopicId
+    ).filter(
+        closure.c.AncestorTopicId == topic_id,
+        closure.c.Depth > 0,
+        models.Topic.IsActive == True
+    )
+    if max_depth is not None:
+        query = query.filter(closure.c.Depth <= max_depth)
+    return query.order_by(closure.c.Depth, models.Topic.TopicId).all()
+
+def get_ancestors(db: Session, topic_id: int):
+    """
+    Retrieve the path from the root down to a topic's parent in one query
+
+    Args:
+        db: Database session
+        topic_id: Topic whose ancestors are returned (not included)
+
+    Returns:
+        List[models.Topic]: Ancestors ordered from the root
+    """
+    return db.query(models.Topic).join(
+        closure, closure.c.AncestorTopicId == models.Topic.TopicId
+    ).filter(
+        closure.c.DescendantTopicId == topic_id,
+        closure.c.Depth > 0
+    ).order_by(closure.c.Depth.desc()).all()
+
+def move_topic(db: Session, topic_id: int, new_parent_id: Optional[int]):
+    """
+    Move a topic and its subtree under a new parent
+
+    Args:
+        db: Database session
+        topic_id: Root of the subtree to move
+        new_parent_id: New parent topic, or None to make it a root
+
+    Returns:
+        models.Topic: Moved topic instance if found, None otherwise
+
+    Raises:
+        HTTPException: If the move would create a cycle or the parent is missing
+    """
+    db_topic = get_topic(db, topic_id)
+    if not db_topic:
+        return None
+    if db_topic.ParentTopicId == new_parent_id:
+        return db_topic
+
+    try:
+        _move_subtree(db, topic_id, new_parent_id)
+        db_topic.ParentTopicId = new_parent_id
+        db.commit()
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    topic_tree.invalidate()
+    db.refresh(db_topic)
+    return db_topic
+
+def update_topic(db: Session, topic_id: int, topic: TopicUpdate):
+    """
+    Update a topic's attributes, moving its subtree if the parent changes
+
+    Args:
+        db: Database session
+        topic_id: ID of topic to update
+        topic: Updated topic information
+
+    Returns:
+        models.Topic: Updated topic instance if found, None otherwise
+
+    Raises:
+        HTTPException: If update fails due to validation or DB constraints
+    """
+    db_topic = get_topic(db, topic_id)
+    if not db_topic:
+        return None
+
+    update_data = topic.dict(exclude_unset=True)
+    try:
+        if "ParentTopicId" in update_data and update_data["ParentTopicId"] != db_topic.ParentTopicId:
+            _move_subtree(db, topic_id, update_data["ParentTopicId"])
+        for field, value in update_data.items():
+            setattr(db_topic, field, value)
+        db.commit()
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    topic_tree.invalidate()
+    db.refresh(db_topic)
+    return db_topic
+
+def delete_topic(db: Session, topic_id: int) -> bool:
+    """
+    Deactivate a topic and its whole subtree (soft delete)
+
+    Args:
+        db: Database session
+        topic_id: ID of topic to deactivate
+
+    Returns:
+        bool: True if the topic was deactivated, False if not found or operation failed
+    """
+    if not get_topic(db, topic_id):
+        return False
+
+    try:
+        db.execute(
+            sa.update(models.Topic.__table__).where(
+                models.Topic.__table__.c.TopicId.in_(_subtree_ids(topic_id))
+            ).values(IsActive=False)
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        return False
+    topic_tree.invalidate()
+    return True
+
+def assign_documents(db: Session, topic_id: int, document_ids: List[int]) -> int:
+    """
+    Assign documents to a topic, skipping existing assignments
+
+    Args:
+        db: Database session
+        topic_id: Target topic
+        document_ids: Documents to assign
+
+    Returns:
+        int: Number of new assignments
+
+    Raises:
+        HTTPException: If the insert fails
+    """
+    requested = set(document_ids)
+    live = set()
+    for chunk in chunked(sorted(requested)):
+        assigned = {
+            document_id for (document_id,) in db.query(models.DocumentTopic.DocumentId).filter(
+                models.DocumentTopic.TopicId == topic_id,
+                models.DocumentTopic.DocumentId.in_(chunk)
+            )
+        }
+        live.update(
+            document_id for (document_id,) in db.query(models.Document.DocumentId).filter(
+                models.Document.DocumentId.in_(set(chunk) - assigned),
+                models.Document.IsDeleted == False
+            )
+        )
+    if not live:
+        return 0
+
+    now = datetime.utcnow()
+    try:
+        # COPY on PostgreSQL, fast executemany on SQL Server
+        backend.bulk_insert(
+            db.connection(),
+            models.DocumentTopic.__table__,
+            [{"DocumentId": document_id, "TopicId": topic_id, "CreatedDate": now} for document_id in sorted(live)]
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    return len(live)
+
+def remove_documents(db: Session, topic_id: int, document_ids: List[int]) -> int:
+    """
+    Remove documents from a topic
+
+    Args:
+        db: Database session
+        topic_id: Topic to remove the documents from
+        document_ids: Documents to remove
+
+    Returns:
+        int: Number of assignments removed
+    """
+    table = models.DocumentTopic.__table__
+    removed = 0
+    for chunk in chunked(sorted(set(document_ids))):
+        removed += db.execute(sa.delete(table).where(
+            table.c.TopicId == topic_id,
+            table.c.DocumentId.in_(chunk)
+        )).rowcount
+    db.commit()
+    return removed
+
+def get_topic_documents(
+    db: Session,
+    topic_id: int,
+    include_descendants: bool = True,
+    skip: int = 0,
+    limit: int = 100
+):
+    """
+    Retrieve live documents assigned to a topic or anywhere in its subtree
+
+    Args:
+        db: Database session
+        topic_id: Topic (subtree root when include_descendants is set)
+        include_descendants: Include documents assigned to descendant topics
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+
+    Returns:
+        List[models.Document]: Documents ordered like get_documents
+    """
+    assignments = models.DocumentTopic.__table__
+    if include_descendants:
+        topic_filter = assignments.c.TopicId.in_(
+            sa.select(closure.c.DescendantTopicId).where(closure.c.AncestorTopicId == topic_id)
+        )
+    else:
+        topic_filter = assignments.c.TopicId == topic_id
+
+    # IN (subquery) returns each document once even when it sits on several topics
+    return db.query(models.Document).filter(
+        models.Document.DocumentId.in_(sa.select(assignments.c.DocumentId).where(topic_filter)),
+        models.Document.IsDeleted == False
+    ).order_by(
+        models.Document.CreatedDate,
+        models.Document.DocumentId
+    ).offset(skip).limit(limit).all()
@@ -0,0 +1,361 @@
+"""
+Resumable Upload Service
+
+This module implements tus-style resumable uploads for very large files, including:
+- Upload sessions announced with the file's metadata and total length
+- Chunks appended at an explicit offset and staged on disk
+- Incremental SHA-256 hashing across chunks
+- Finalization into a regular document through document_service
+- Expiry of sessions abandoned for longer than UPLOAD_SESSION_TTL_SECONDS
+
+Each session is a directory in UPLOAD_STAGING_DIR holding the received bytes
+and a small JSON state file. The byte count of the staged file is the
+session's offset, so a session can be resumed from any worker process; the
+running hash lives in the process that received the chunks and is rebuilt
+from the staged file if the upload is finished elsewhere.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.schemas.schemas import DocumentBase, UploadSessionCreate
+from app.services import document_service
+
+logger = logging.getLogger('app')
+
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+STATE_FILE = "session.json"
+DATA_FILE = "data"
+
+def _hash_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(settings.UPLOAD_BUFFER_BYTES), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+class UploadSessions:
+    """Staged resumable uploads and the background task expiring them"""
+
+    def __init__(self, ttl_seconds: int, sweep_interval: float, staging_dir: Path = None):
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._staging_dir = staging_dir
+        # Running hash per session: [hasher, bytes hashed so far]
+        self._hashers: Dict[str, list] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def staging_dir(self) -> Path:
+        return Path(self._staging_dir or settings.UPLOAD_STAGING_DIR)
+
+    def _session_dir(self, upload_id: str) -> Optional[Path]:
+        # IDs come from the URL; only accept the form create() hands out
+        if not _UPLOAD_ID.match(upload_id):
+            return None
+        return self.staging_dir / upload_id
+
+    def _lock(self, upload_id: str) -> asyncio.Lock:
+        return self._locks.setdefault(upload_id, asyncio.Lock())
+
+    def _write_state(self, session_dir: Path, state: Dict) -> None:
+        temporary = session_dir / f"{STATE_FILE}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary, session_dir / STATE_FILE)
+
+    def _touch(self, session_dir: Path, state: Dict) -> None:
+        """Push back the expiry of an active session"""
+        state["Expires"] = time.time() + self.ttl_seconds
+        self._write_state(session_dir, state)
+
+    def _read_state(self, session_dir: Path) -> Optional[Dict]:
+        try:
+            with open(session_dir / STATE_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _forget(self, upload_id: str) -> None:
+        self._hashers.pop(upload_id, None)
+        self._locks.pop(upload_id, None)
+
+    def _remove(self, upload_id: str, session_dir: Path) -> None:
+        self._forget(upload_id)
+        shutil.rmtree(session_dir, ignore_errors=True)
+
+    def _describe(self, state: Dict, session_dir: Path) -> Dict:
+        return {
+            **{key: value for key, value in state.items() if key not in ("Created", "Expires")},
+            "Offset": os.path.getsize(session_dir / DATA_FILE),
+            "CreatedDate": datetime.fromtimestamp(state["Created"]),
+            "ExpiresAt": datetime.fromtimestamp(state["Expires"]),
+        }
+
+    def _load(self, upload_id: str):
+        """Return (session_dir, state) of a live session, expiring it if it is stale"""
+        session_dir = self._session_dir(upload_id)
+        state = self._read_state(session_dir) if session_dir is not None else None
+        if state is None:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        if state["Expires"] < time.time():
+            self._remove(upload_id, session_dir)
+            raise HTTPException(status_code=404, detail="Upload not found")
+        return session_dir, state
+
+    def create(self, upload: UploadSessionCreate) -> Dict:
+        """
+        Open a new upload session
+
+        Args:
+            upload: Document metadata, original file name and total length
+
+        Returns:
+            dict: Session state shaped like schemas.UploadSession
+
+        Raises:
+            HTTPException: If the announced length exceeds UPLOAD_MAX_BYTES
+        """
+        if upload.Length > settings.UPLOAD_MAX_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Upload exceeds the maximum size of {settings.UPLOAD_MAX_BYTES} bytes"
+            )
+
+        upload_id = uuid.uuid4().hex
+        session_dir = self.staging_dir / upload_id
+        os.makedirs(session_dir)
+        (session_dir / DATA_FILE).touch()
+        now = time.time()
+        state = {
+            **upload.dict(),
+            "UploadId": upload_id,
+            "Created": now,
+            "Expires": now + self.ttl_seconds,
+        }
+        self._write_state(session_dir, state)
+        self._hashers[upload_id] = [hashlib.sha256(), 0]
+        return self._describe(state, session_dir)
+
+    def get(self, upload_id: str) -> Dict:
+        """
+        Return the state of an upload session
+
+        Args:
+            upload_id: Session identifier
+
+        Returns:
+            dict: Session state shaped like schemas.UploadSession
+
+        Raises:
+            HTTPException: If the session does not exist or has expired
+        """
+        session_dir, state = self._load(upload_id)
+        return self._describe(state, session_dir)
+
+    def _write(self, f, block: bytes, running: Optional[list]) -> None:
+        f.write(block)
+        if running is not None:
+            running[0].update(block)
+            running[1] += len(block)
+
+    async def append(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> int:
+        """
+        Append a chunk of the file at the given offset
+
+        Bytes are staged in UPLOAD_BUFFER_BYTES steps as they arrive. If the
+        client disconnects part-way, everything received so far is kept and
+        the upload resumes from the new offset.
+
+        Args:
+            upload_id: Session identifier
+            offset: Offset the chunk starts at; must equal the current offset
+            chunks: Request body stream
+
+        Returns:
+            int: New offset
+
+        Raises:
+            HTTPException: If the session is unknown, the offset does not match
+            or the chunk would run past the announced length
+        """
+        async with self._lock(upload_id):
+            session_dir, state = self._load(upload_id)
+            data_path = session_dir / DATA_FILE
+            current = os.path.getsize(data_path)
+            if offset != current:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Upload-Offset {offset} does not match the current offset {current}"
+                )
+
+            running = self._hashers.get(upload_id)
+            if running is not None and running[1] != current:
+                # Chunks were received by another process; rehash when finishing
+                running = None
+                self._hashers.pop(upload_id, None)
+
+            remaining = state["Length"] - current
+            received = 0
+            buffer = bytearray()
+            with open(data_path, "r+b") as f:
+                f.seek(current)
+                try:
+                    async for chunk in chunks:
+                        received += len(chunk)
+                        if received > remaining:
+                            raise HTTPException(status_code=413, detail="Chunk runs past the upload length")
+                        buffer += chunk
+                        if len(buffer) >= settings.UPLOAD_BUFFER_BYTES:
+                            await asyncio.to_thread(self._write, f, bytes(buffer), running)
+                            buffer.clear()
+                except HTTPException:
+                    # Keep the staged file exactly as it was before this chunk
+                    f.truncate(current)
+                    self._hashers.pop(upload_id, None)
+                    raise
+                except Exception:
+                    # Client went away: keep what arrived so the upload can resume from it
+                    await asyncio.to_thread(self._write, f, bytes(buffer), running)
+                    self._touch(session_dir, state)
+                    raise
+                await asyncio.to_thread(self._write, f, bytes(buffer), running)
+
+            self._touch(session_dir, state)
+            return os.path.getsize(data_path)
+
+    async def complete(self, db: Session, upload_id: str):
+        """
+        Turn a fully received upload into a document
+
+        Args:
+            db: Database session
+            upload_id: Session identifier
+
+        Returns:
+            models.Document: Created document instance
+
+        Raises:
+            HTTPException: If the session is unknown or incomplete, or document creation fails
+        """
+        async with self._lock(upload_id):
+            session_dir, state = self._load(upload_id)
+            data_path = session_dir / DATA_FILE
+            size = os.path.getsize(data_path)
+            if size != state["Length"]:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Upload incomplete: {size} of {state['Length']} bytes received"
+                )
+
+            running = self._hashers.get(upload_id)
+            if running is not None and running[1] == size:
+                content_hash = running[0].hexdigest()
+            else:
+                content_hash = await asyncio.to_thread(_hash_file, data_path)
+
+            document = await document_service.create_document_from_file(
+                db,
+                DocumentBase(
+                    DocumentName=state["DocumentName"],
+                    FileType=state["FileType"],
+                    DocumentTypeId=state["DocumentTypeId"]
+                ),
+                data_path,
+                state["FileName"],
+                size,
+                content_hash
+            )
+            self._remove(upload_id, session_dir)
+            return document
+
+    async def abort(self, upload_id: str) -> bool:
+        """
+        Discard an upload session and its staged bytes
+
+        Args:
+            upload_id: Session identifier
+
+        Returns:
+            bool: True if the session existed
+        """
+        session_dir = self._session_dir(upload_id)
+        if session_dir is None or not session_dir.is_dir():
+            return False
+        async with self._lock(upload_id):
+            self._remove(upload_id, session_dir)
+        return True
+
+    def expire(self) -> List[str]:
+        """
+        Remove sessions that have been idle for longer than the TTL
+
+        Returns:
+            List[str]: IDs of the removed sessions
+        """
+        if not self.staging_dir.is_dir():
+            return []
+        now = time.time()
+        removed = []
+        for entry in os.scandir(self.staging_dir):
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            lock = self._locks.get(entry.name)
+            if lock is not None and lock.locked():
+                continue
+            state = self._read_state(Path(entry.path))
+            # Sessions without readable state are judged by their directory's age
+            expires = state["Expires"] if state else entry.stat().st_mtime + self.ttl_seconds
+            if expires < now:
+                self._remove(entry.name, Path(entry.path))
+                removed.append(entry.name)
+        return removed
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = await asyncio.to_thread(self.expire)
+                if removed:
+                    logger.info(f"Expired {len(removed)} abandoned upload sessions")
+            except Exception as e:
+                logger.error(f"Upload session expiry failed: {e}")
+
+    def start(self) -> None:
+        """Expire abandoned sessions on an interval"""
+        if self._task is None and self.sweep_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the expiry task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+# Process-wide upload sessions
+upload_sessions = UploadSessions(
+    ttl_seconds=settings.UPLOAD_SESSION_TTL_SECONDS,
+    sweep_interval=settings.UPLOAD_EXPIRY_INTERVAL_SECONDS
+)
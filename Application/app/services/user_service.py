@@ -15,30 +15,39 @@ Created: February 7, 2025
 from sqlalchemy.orm import Session
 from datetime import datetime
 from fastapi import HTTPException
-from passlib.context import CryptContext
+from typing import List
+import asyncio
 
 from app import models
+from app.core.security import password_hasher
+from app.core.serialization import schema_columns
+from app.db.batching import load_by_ids
+from app.schemas.schemas import User as UserSchema
 from app.schemas.schemas import UserCreate, UserUpdate
+from app.services.change_service import ENTITY_USER, OPERATION_CREATE, OPERATION_DELETE, OPERATION_UPDATE, record_change
 
-# Initialize password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """
     Hash a password using bcrypt
     
+    The hash runs in the password hashing process pool so the event loop
+    and request workers are not blocked by bcrypt.
+    
     Args:
         password: Plain text password to hash
     
     Returns:
         str: Hashed password
     """
-    return pwd_context.hash(password)
+    return await password_hasher.hash(password)
 
-def create_user(db: Session, user: UserCreate):
+async def create_user(db: Session, user: UserCreate):
     """
     Create a new user with hashed password
     
+    bcrypt runs in the password hashing pool and the database work in a
+    worker thread, so neither blocks the event loop.
+    
     Args:
         db: Database session
         user: User creation data including password
@@ -49,7 +58,10 @@ def create_user(db: Session, user: UserCreate):
     Raises:
         HTTPException: If creation fails due to validation or DB constraints
     """
-    hashed_password = get_password_hash(user.Password)
+    hashed_password = await get_password_hash(user.Password)
+    return await asyncio.to_thread(_insert_user, db, user, hashed_password)
+
+def _insert_user(db: Session, user: UserCreate, hashed_password: str):
     db_user = models.User(
         Username=user.Username,
         Email=user.Email,
@@ -58,6 +70,8 @@ def create_user(db: Session, user: UserCreate):
     )
     try:
         db.add(db_user)
+        db.flush()
+        record_change(db, ENTITY_USER, db_user.UserId, OPERATION_CREATE)
         db.commit()
         db.refresh(db_user)
         return db_user
@@ -79,7 +93,25 @@ def get_users(db: Session, skip: int = 0, limit: int = 100):
     """
     return db.query(models.User).filter(
         models.User.IsActive == True
-    ).offset(skip).limit(limit).all()
+    ).order_by(models.User.UserId).offset(skip).limit(limit).all()
+
+def get_user_rows(db: Session, skip: int = 0, limit: int = 100):
+    """
+    Retrieve a page of active users as plain dicts for the fast list response path
+    
+    Args:
+        db: Database session
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+    
+    Returns:
+        List[dict]: Users shaped like schemas.User, ordered like get_users
+    """
+    fields = schema_columns(UserSchema, models.User)
+    rows = db.query(*[getattr(models.User, field) for field in fields]).filter(
+        models.User.IsActive == True
+    ).order_by(models.User.UserId).offset(skip).limit(limit).all()
+    return [dict(zip(fields, row)) for row in rows]
 
 def get_user(db: Session, user_id: int):
     """
@@ -97,10 +129,27 @@ def get_user(db: Session, user_id: int):
         models.User.IsActive == True
     ).first()
 
-def update_user(db: Session, user_id: int, user: UserUpdate):
+def get_users_by_ids(db: Session, user_ids: List[int]):
+    """
+    Retrieve many active users by ID
+    
+    Args:
+        db: Database session
+        user_ids: IDs of users to retrieve
+    
+    Returns:
+        dict: models.User instances keyed by UserId (missing IDs are absent)
+    """
+    query = db.query(models.User).filter(models.User.IsActive == True)
+    return load_by_ids(query, models.User.UserId, user_ids)
+
+async def update_user(db: Session, user_id: int, user: UserUpdate):
     """
     Update a user's information including password if provided
     
+    bcrypt runs in the password hashing pool and the database work in a
+    worker thread, so neither blocks the event loop.
+    
     Args:
         db: Database session
         user_id: ID of user to update
@@ -112,18 +161,21 @@ def update_user(db: Session, user_id: int, user: UserUpdate):
     Raises:
         HTTPException: If update fails due to validation or DB constraints
     """
-    db_user = get_user(db, user_id)
+    db_user = await asyncio.to_thread(get_user, db, user_id)
     if not db_user:
         return None
         
     # Handle password hashing if included in update
     user_data = user.dict(exclude_unset=True)
     if "Password" in user_data:
-        user_data["PasswordHash"] = get_password_hash(user_data.pop("Password"))
-    
+        user_data["PasswordHash"] = await get_password_hash(user_data.pop("Password"))
+    return await asyncio.to_thread(_apply_user_update, db, db_user, user_data)
+
+def _apply_user_update(db: Session, db_user: models.User, user_data: dict):
     # Update user attributes
     for field, value in user_data.items():
         setattr(db_user, field, value)
+    record_change(db, ENTITY_USER, db_user.UserId, OPERATION_UPDATE if db_user.IsActive else OPERATION_DELETE)
     
     try:
         db.commit()
@@ -149,6 +201,7 @@ def delete_user(db: Session, user_id: int) -> bool:
         return False
         
     db_user.IsActive = False
+    record_change(db, ENTITY_USER, user_id, OPERATION_DELETE)
     
     try:
         db.commit()
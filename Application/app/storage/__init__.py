@@ -0,0 +1,3 @@
+from .base import HashingReader, StorageBackend, StoredObject
+from .local import LocalBackend, RESERVED_DIR_SETTINGS
+from .registry import default_backend, get_backend, resolve
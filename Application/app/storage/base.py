@@ -0,0 +1,153 @@
+"""
+Storage Backend Interface
+
+This module defines what every storage driver provides, including:
+- Streaming puts from file objects and from files already on disk
+- Streamed and ranged reads
+- Existence checks, sizes, deletion and listing
+- Backend-neutral URIs recorded in FileLocation
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+import hashlib
+import os
+import uuid
+
+class StoredObject(NamedTuple):
+    """One stored file as reported by a backend listing"""
+    uri: str
+    size: int
+    modified: float  # POSIX timestamp
+
+class HashingReader:
+    """File-like wrapper that hashes and counts the bytes read through it"""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._hasher = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self._hasher.update(data)
+        self.size += len(data)
+        return data
+
+    def hexdigest(self) -> str:
+        """SHA-256 of everything read so far"""
+        return self._hasher.hexdigest()
+
+class StorageBackend(ABC):
+    """A place document files are kept, addressed by key within the backend"""
+
+    scheme: str
+    prefix: str = ""
+
+    @abstractmethod
+    def uri(self, key: str) -> str:
+        """URI recorded in FileLocation for a key"""
+
+    def new_key(self, filename: str) -> str:
+        """
+        Pick a new, unique key for an uploaded file
+
+        Args:
+            filename: Original file name, used for the key's extension
+
+        Returns:
+            str: Key under the backend's prefix
+        """
+        # Timestamped for readability; the random suffix keeps same-second uploads apart
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_extension = os.path.splitext(filename or "")[1]
+        return f"{self.prefix}{timestamp}_{uuid.uuid4().hex[:8]}{file_extension}"
+
+    @abstractmethod
+    def put(self, key: str, stream: BinaryIO) -> str:
+        """
+        Store the rest of a stream under a key
+
+        Args:
+            key: Key to store under
+            stream: Object with read(size); read until exhausted
+
+        Returns:
+            str: URI of the stored file
+        """
+
+    @abstractmethod
+    def put_file(self, key: str, path: Path) -> str:
+        """
+        Store a file that is already on local disk, leaving the source in place
+
+        Args:
+            key: Key to store under
+            path: File to store
+
+        Returns:
+            str: URI of the stored file
+        """
+
+    @abstractmethod
+    def read(
+        self,
+        key: str,
+        start: int = 0,
+        length: Optional[int] = None,
+        chunk_size: int = 1024 * 1024
+    ) -> Iterator[bytes]:
+        """
+        Stream a file, or a byte range of it
+
+        Args:
+            key: Key of the file
+            start: First byte to return
+            length: Number of bytes to return (None reads to the end)
+            chunk_size: Preferred size of the yielded chunks
+
+        Yields:
+            bytes: Consecutive chunks of the file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        """
+        Size of a stored file in bytes
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+
+    def exists(self, key: str) -> bool:
+        """Whether a file is stored under the key"""
+        try:
+            self.size(key)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @abstractmethod
+    def delete(self, key: str) -> int:
+        """
+        Delete a stored file
+
+        Returns:
+            int: Bytes freed (0 if the file was already gone)
+        """
+
+    @abstractmethod
+    def list(self) -> Iterator[StoredObject]:
+        """Every file this backend holds for documents"""
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Path of the file on this machine, or None for remote backends"""
+        return None
@@ -0,0 +1,126 @@
+"""
+Local Disk Storage Driver
+
+This module keeps document files in a directory on the API node, including:
+- Keys relative to STORAGE_DIR, recorded as local://<key>
+- Legacy absolute paths stored before URIs were introduced
+- Hard-linking of staged files instead of copying them where possible
+- Listing that skips the internal state directories inside STORAGE_DIR
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Set
+import os
+import shutil
+
+from app.core.config import settings
+from app.storage.base import StorageBackend, StoredObject
+
+# Settings naming directories inside STORAGE_DIR that hold internal state, not documents
+RESERVED_DIR_SETTINGS = [
+    "SCRUB_STATE_DIR",
+    "GC_STATE_DIR",
+    "UPLOAD_STAGING_DIR",
+    "MINHASH_DIR",
+    "TEXT_CACHE_DIR",
+    "ML_MODELS_DIR",
+    "VECTOR_STORE_DIR",
+]
+
+def reserved_dirs() -> Set[str]:
+    """Normalised paths of the internal state directories"""
+    return {
+        os.path.normcase(os.path.abspath(getattr(settings, name)))
+        for name in RESERVED_DIR_SETTINGS
+    }
+
+class LocalBackend(StorageBackend):
+    """Files under a root directory on this machine"""
+
+    scheme = "local"
+
+    def __init__(self, root: Path, buffer_size: int):
+        self.root = Path(root)
+        self.buffer_size = buffer_size
+
+    def uri(self, key: str) -> str:
+        return f"{self.scheme}://{key}"
+
+    def local_path(self, key: str) -> Path:
+        path = Path(key)
+        # Rows written before URIs hold absolute paths
+        return path if path.is_absolute() else self.root / key
+
+    def put(self, key: str, stream: BinaryIO) -> str:
+        path = self.local_path(key)
+        os.makedirs(path.parent, exist_ok=True)
+        try:
+            with open(path, "wb") as f:
+                shutil.copyfileobj(stream, f, self.buffer_size)
+        except BaseException:
+            if path.exists():
+                path.unlink()
+            raise
+        return self.uri(key)
+
+    def put_file(self, key: str, path: Path) -> str:
+        target = self.local_path(key)
+        os.makedirs(target.parent, exist_ok=True)
+        try:
+            os.link(path, target)
+        except OSError:
+            # Different volume, or a filesystem without hard links
+            shutil.copyfile(path, target)
+        return self.uri(key)
+
+    def read(
+        self,
+        key: str,
+        start: int = 0,
+        length: Optional[int] = None,
+        chunk_size: int = 1024 * 1024
+    ) -> Iterator[bytes]:
+        with open(self.local_path(key), "rb") as f:
+            f.seek(start)
+            remaining = length
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self.local_path(key))
+
+    def delete(self, key: str) -> int:
+        path = self.local_path(key)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size
+        except FileNotFoundError:
+            return 0
+
+    def list(self) -> Iterator[StoredObject]:
+        """Walk the root without following symlinks, skipping reserved directories"""
+        if not self.root.is_dir():
+            return
+
+        skipped = reserved_dirs()
+        pending = [str(self.root)]
+        while pending:
+            directory = pending.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if os.path.normcase(os.path.abspath(entry.path)) not in skipped:
+                            pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        key = Path(os.path.relpath(entry.path, self.root)).as_posix()
+                        yield StoredObject(self.uri(key), stat.st_size, stat.st_mtime)
@@ -0,0 +1,93 @@
+"""
+Storage Backend Registry
+
+This module maps FileLocation values to the backend that holds them, including:
+- The default backend new files are written to (STORAGE_BACKEND)
+- Resolution of local://, s3:// and legacy absolute-path locations
+- One backend instance per process, recreated after a fork so pooled
+  connections are never shared between processes
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from threading import Lock
+from typing import Dict, Optional, Tuple
+import os
+
+from app.core.config import settings
+from app.storage.base import StorageBackend
+from app.storage.local import LocalBackend
+
+_backends: Dict[Tuple[str, Optional[str]], StorageBackend] = {}
+_backends_pid = os.getpid()
+_lock = Lock()
+
+def _create(scheme: str, bucket: Optional[str]) -> StorageBackend:
+    if scheme == "local":
+        return LocalBackend(settings.STORAGE_DIR, settings.UPLOAD_BUFFER_BYTES)
+    if scheme == "s3":
+        # Imported here so the minio client is only needed when S3 is in use
+        from app.storage.s3 import S3Backend
+        return S3Backend(
+            bucket=bucket,
+            endpoint=settings.S3_ENDPOINT,
+            secure=settings.S3_SECURE,
+            region=settings.S3_REGION,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            prefix=settings.S3_PREFIX,
+            part_size=settings.S3_PART_SIZE_BYTES,
+            parallel_uploads=settings.S3_PARALLEL_UPLOADS,
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS
+        )
+    raise ValueError(f"Unsupported storage backend: {scheme}")
+
+def get_backend(scheme: str, bucket: Optional[str] = None) -> StorageBackend:
+    """
+    Return this process's backend for a scheme (and bucket, for S3)
+
+    Args:
+        scheme: "local" or "s3"
+        bucket: Bucket name for S3
+
+    Returns:
+        StorageBackend: Shared backend instance
+    """
+    global _backends_pid
+    with _lock:
+        if _backends_pid != os.getpid():
+            # Forked worker: the parent's HTTP pools must not be reused
+            _backends.clear()
+            _backends_pid = os.getpid()
+        backend = _backends.get((scheme, bucket))
+        if backend is None:
+            backend = _backends[(scheme, bucket)] = _create(scheme, bucket)
+        return backend
+
+def default_backend() -> StorageBackend:
+    """Backend new document files are written to"""
+    if settings.STORAGE_BACKEND == "s3":
+        return get_backend("s3", settings.S3_BUCKET)
+    return get_backend(settings.STORAGE_BACKEND)
+
+def resolve(location: str) -> Tuple[StorageBackend, str]:
+    """
+    Find the backend and key for a FileLocation value
+
+    Args:
+        location: local://<key>, s3://<bucket>/<key>, or a legacy absolute path
+
+    Returns:
+        tuple: (backend, key)
+
+    Raises:
+        ValueError: If the location uses an unknown scheme
+    """
+    if "://" not in location:
+        return get_backend("local"), location
+    scheme, rest = location.split("://", 1)
+    if scheme == "s3":
+        bucket, _, key = rest.partition("/")
+        return get_backend("s3", bucket), key
+    return get_backend(scheme), rest
@@ -0,0 +1,140 @@
+"""
+S3-Compatible Storage Driver
+
+This module keeps document files in an S3-compatible object store through the
+MinIO client, including:
+- Objects recorded as s3://<bucket>/<object name>
+- Multipart uploads with parts sent in parallel
+- A pooled, retrying HTTP client shared by every request in the process
+- Ranged reads streamed from the object store
+
+Works against AWS S3, MinIO, or a local stand-in server via S3_ENDPOINT.
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from app.storage.base import StorageBackend, StoredObject
+
+try:
+    import certifi
+    import urllib3
+    from minio import Minio
+    from minio.error import S3Error
+except ImportError:  # pragma: no cover - only needed when STORAGE_BACKEND is "s3"
+    Minio = None
+
+# Error codes meaning the object (or its bucket) is not there
+MISSING_CODES = {"NoSuchKey", "NoSuchBucket", "NoSuchObject", "ResourceNotFound"}
+
+class S3Backend(StorageBackend):
+    """Objects in one bucket of an S3-compatible service"""
+
+    scheme = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint: str,
+        secure: bool = True,
+        region: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        prefix: str = "",
+        part_size: int = 16 * 1024 * 1024,
+        parallel_uploads: int = 4,
+        max_pool_connections: int = 32
+    ):
+        if Minio is None:
+            raise RuntimeError("The minio package is required when STORAGE_BACKEND is \"s3\"")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.part_size = part_size
+        self.parallel_uploads = parallel_uploads
+        # One pool per backend; sized for parallel part uploads from several requests
+        http_client = urllib3.PoolManager(
+            maxsize=max_pool_connections,
+            block=True,
+            timeout=urllib3.Timeout(connect=10, read=300),
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=certifi.where(),
+            retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+        )
+        self.client = Minio(
+            endpoint,
+            access_key=access_key,
+            secret_key=secret_key,
+            secure=secure,
+            region=region,
+            http_client=http_client
+        )
+
+    def uri(self, key: str) -> str:
+        return f"{self.scheme}://{self.bucket}/{key}"
+
+    def _not_found(self, error: "S3Error", key: str) -> Exception:
+        if error.code in MISSING_CODES:
+            return FileNotFoundError(self.uri(key))
+        return error
+
+    def put(self, key: str, stream: BinaryIO) -> str:
+        # Unknown length: the client splits the stream into parts as it reads
+        self.client.put_object(
+            self.bucket,
+            key,
+            stream,
+            length=-1,
+            part_size=self.part_size,
+            num_parallel_uploads=self.parallel_uploads
+        )
+        return self.uri(key)
+
+    def put_file(self, key: str, path: Path) -> str:
+        self.client.fput_object(
+            self.bucket,
+            key,
+            str(path),
+            part_size=self.part_size,
+            num_parallel_uploads=self.parallel_uploads
+        )
+        return self.uri(key)
+
+    def read(
+        self,
+        key: str,
+        start: int = 0,
+        length: Optional[int] = None,
+        chunk_size: int = 1024 * 1024
+    ) -> Iterator[bytes]:
+        try:
+            response = self.client.get_object(self.bucket, key, offset=start, length=length or 0)
+        except S3Error as e:
+            raise self._not_found(e, key)
+        try:
+            yield from response.stream(chunk_size)
+        finally:
+            response.close()
+            response.release_conn()
+
+    def size(self, key: str) -> int:
+        try:
+            return self.client.stat_object(self.bucket, key).size
+        except S3Error as e:
+            raise self._not_found(e, key)
+
+    def delete(self, key: str) -> int:
+        try:
+            size = self.size(key)
+        except FileNotFoundError:
+            return 0
+        self.client.remove_object(self.bucket, key)
+        return size
+
+    def list(self) -> Iterator[StoredObject]:
+        for item in self.client.list_objects(self.bucket, prefix=self.prefix or None, recursive=True):
+            if item.is_dir:
+                continue
+            yield StoredObject(self.uri(item.object_name), item.size, item.last_modified.timestamp())
@@ -0,0 +1,293 @@
+"""
+Management Commands
+
+This module provides command line entry points for maintenance jobs that run
+outside the API process, including:
+- Index usage and missing-index reports
+- Integrity scrubbing of stored files
+- Storage garbage collection
+- Change log compaction
+- Near-duplicate signature backfill and duplicate reports
+- Text extraction backfill
+- Document statistics reconciliation
+
+Usage:
+    python manage.py <command> [options]
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+import argparse
+import json
+import sys
+
+def index_report(args):
+    """Print index usage and missing-index suggestions"""
+    from app.db import index_advisor, query_log
+    from app.db.database import Base, get_engine
+    from app import models  # noqa: F401 - registers models on Base.metadata
+
+    engine = get_engine()
+
+    query_stats = query_log.load(args.log or None)
+
+    print("Index usage")
+    for row in index_advisor.index_usage(engine, query_stats):
+        print("  " + ", ".join(f"{key}={value}" for key, value in row.items()))
+
+    hints = index_advisor.missing_index_hints(engine)
+    if hints:
+        print("\nOptimizer missing-index hints")
+        for row in hints:
+            print("  " + ", ".join(f"{key}={value}" for key, value in row.items()))
+
+    print(f"\nSuggestions from {len(query_stats)} logged statements")
+    suggestions = index_advisor.suggest_indexes(query_stats, Base.metadata)
+    if args.json:
+        print(json.dumps(suggestions, indent=2))
+    for suggestion in suggestions:
+        print(
+            f"  {suggestion['ddl']}  "
+            f"-- {suggestion['executions']} executions, {suggestion['total_seconds']:.2f}s"
+        )
+    if not suggestions:
+        print("  No missing indexes found")
+
+def scrub(args):
+    """Verify stored files against their ContentHash"""
+    from app.db.database import SessionLocal
+    from app.services import scrub_service
+
+    def progress(state):
+        counters = state["counters"]
+        print(
+            f"  {state['phase']} through id {state['last_id']}: "
+            f"{counters['ok']} ok, {counters['missing']} missing, {counters['corrupt']} corrupt, "
+            f"{counters['bytes'] / (1024 ** 3):.1f} GiB read"
+        )
+
+    db = SessionLocal()
+    try:
+        result = scrub_service.run_scrub(
+            db,
+            restart=args.restart,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            io_bytes_per_second=int(args.io_mbps * 1024 * 1024) if args.io_mbps is not None else None,
+            include_orphans=not args.no_orphans,
+            progress=progress
+        )
+    finally:
+        db.close()
+
+    for problem in result["problems"]:
+        print(json.dumps(problem))
+    print(f"Scrub complete: {result['counters']}")
+    return 1 if result["problems"] else 0
+
+def gc(args):
+    """Purge expired soft-deleted documents and orphaned files"""
+    from app.db.database import SessionLocal
+    from app.services import gc_service
+
+    db = SessionLocal()
+    try:
+        result = gc_service.collect_garbage(
+            db,
+            dry_run=not args.apply,
+            retention_days=args.retention_days,
+            grace_seconds=args.grace_seconds,
+            batch_size=args.batch_size
+        )
+    finally:
+        db.close()
+
+    verb = "Would remove" if result["dry_run"] else "Removed"
+    for item in result["expired"]["items"]:
+        print(f"  expired document {item['document_id']}: {item['location']}")
+    for item in result["orphans"]["items"]:
+        print(f"  orphan: {item['location']}")
+    print(
+        f"{verb} {result['expired']['documents']} documents, {result['expired']['versions']} versions "
+        f"and {result['orphans']['removed']} orphan files "
+        f"({(result['expired']['bytes'] + result['orphans']['bytes']) / (1024 ** 2):.1f} MiB); "
+        f"{result['orphans']['marked']} files marked for a later run"
+    )
+
+def compact_changes(args):
+    """Remove change log entries superseded by a newer change to the same entity"""
+    from datetime import timedelta
+    from app.db.database import SessionLocal
+    from app.services import change_service
+
+    db = SessionLocal()
+    try:
+        removed = change_service.compact_changes(
+            db,
+            older_than=timedelta(hours=args.older_than_hours) if args.older_than_hours is not None else None,
+            batch_size=args.batch_size
+        )
+    finally:
+        db.close()
+    print(f"Removed {removed} superseded changes")
+
+def minhash_backfill(args):
+    """Sign documents missing from the near-duplicate index"""
+    from app.db.database import SessionLocal
+    from app.services import duplicate_service
+
+    def progress(totals):
+        print(f"  signed {totals['signed']}, no content {totals['empty']}, failed {totals['failed']}")
+
+    db = SessionLocal()
+    try:
+        duplicate_service.backfill_signatures(db, batch_size=args.batch_size, progress=progress)
+    finally:
+        db.close()
+
+def dedupe_report(args):
+    """Print groups of near-duplicate documents"""
+    from app.db.database import SessionLocal
+    from app.services import duplicate_service
+
+    db = SessionLocal()
+    try:
+        groups = duplicate_service.get_duplicate_report(db, args.threshold)
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(groups, indent=2))
+        return
+    for group in groups:
+        print(f"  similarity >= {group['Similarity']:.2f}: {', '.join(map(str, group['DocumentIds']))}")
+    print(f"{len(groups)} groups, {sum(len(group['DocumentIds']) for group in groups)} documents")
+
+def extract_text(args):
+    """Extract text for documents whose content is not in the text cache"""
+    from app.db.database import SessionLocal
+    from app.services import text_service
+
+    def progress(totals):
+        print(
+            f"  extracted {totals['extracted']}, already cached {totals['cached']}, "
+            f"unsupported {totals['unsupported']}, failed {totals['failed']}"
+        )
+
+    db = SessionLocal()
+    try:
+        totals = text_service.backfill_text(
+            db,
+            batch_size=args.batch_size,
+            retry_failed=args.retry_failed,
+            progress=progress
+        )
+    finally:
+        db.close()
+        text_service.text_extractor.shutdown()
+    return 1 if totals["failed"] else 0
+
+def reconcile_stats(args):
+    """Recount live documents and correct drifted statistics counters"""
+    from app.db.database import SessionLocal
+    from app.services import stats_service
+
+    db = SessionLocal()
+    try:
+        result = stats_service.reconcile_statistics(db)
+    finally:
+        db.close()
+    print(f"Checked {result['checked']} facet values, corrected {result['corrected']}")
+
+def startup_profile(args):
+    """Import the application, run its startup and report how long each phase took"""
+    import asyncio
+
+    if args.prewarm:
+        from app.core.config import settings
+        settings.STARTUP_PREWARM = True
+    from app.main import app, lifespan
+    from app.core.startup import startup_profile
+
+    async def run():
+        async with lifespan(app):
+            pass
+    asyncio.run(run())
+
+    report = startup_profile.report()
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for name, seconds in report.items():
+        print(f"{name:<20} {seconds * 1000:8.1f} ms")
+
+def serve(args):
+    """Run the API in several worker processes (see app.core.server)"""
+    from app.core.server import serve
+
+    serve(host=args.host, port=args.port, workers=args.workers, preload=False if args.no_preload else None)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Document Management System maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    report = subparsers.add_parser("index-report", help="Report index usage and missing indexes")
+    report.add_argument("--log", nargs="*", help="Query log snapshot files (defaults to QUERY_LOG_DIR)")
+    report.add_argument("--json", action="store_true", help="Also print suggestions as JSON")
+    report.set_defaults(handler=index_report)
+
+    scrubber = subparsers.add_parser("scrub", help="Verify stored files against ContentHash")
+    scrubber.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+    scrubber.add_argument("--workers", type=int, help="Hashing processes")
+    scrubber.add_argument("--batch-size", type=int, help="Rows per batch")
+    scrubber.add_argument("--io-mbps", type=float, help="Total read budget in MiB/s (0 is unthrottled)")
+    scrubber.add_argument("--no-orphans", action="store_true", help="Skip the orphaned file scan")
+    scrubber.set_defaults(handler=scrub)
+
+    collector = subparsers.add_parser("gc", help="Reclaim storage (dry run unless --apply)")
+    collector.add_argument("--apply", action="store_true", help="Actually delete rows and files")
+    collector.add_argument("--retention-days", type=int, help="Override GC_RETENTION_DAYS")
+    collector.add_argument("--grace-seconds", type=int, help="Override GC_GRACE_SECONDS")
+    collector.add_argument("--batch-size", type=int, help="Rows or files per batch")
+    collector.set_defaults(handler=gc)
+
+    compactor = subparsers.add_parser("compact-changes", help="Compact the change log")
+    compactor.add_argument("--older-than-hours", type=float, help="Override CHANGE_LOG_COMPACT_AFTER_HOURS")
+    compactor.add_argument("--batch-size", type=int, help="Changes deleted per transaction")
+    compactor.set_defaults(handler=compact_changes)
+
+    signer = subparsers.add_parser("minhash-backfill", help="Sign documents for near-duplicate detection")
+    signer.add_argument("--batch-size", type=int, default=500, help="Documents per batch")
+    signer.set_defaults(handler=minhash_backfill)
+
+    deduper = subparsers.add_parser("dedupe-report", help="Report groups of near-duplicate documents")
+    deduper.add_argument("--threshold", type=float, help="Override NEAR_DUPLICATE_THRESHOLD")
+    deduper.add_argument("--json", action="store_true", help="Print the groups as JSON")
+    deduper.set_defaults(handler=dedupe_report)
+
+    extractor = subparsers.add_parser("extract-text", help="Extract and cache the text of stored documents")
+    extractor.add_argument("--batch-size", type=int, default=500, help="Documents per batch")
+    extractor.add_argument("--retry-failed", action="store_true", help="Retry content whose extraction failed before")
+    extractor.set_defaults(handler=extract_text)
+
+    reconciler = subparsers.add_parser("reconcile-stats", help="Recount documents and repair statistics counters")
+    reconciler.set_defaults(handler=reconcile_stats)
+
+    profiler = subparsers.add_parser("startup-profile", help="Time application import and startup")
+    profiler.add_argument("--prewarm", action="store_true", help="Prewarm as with STARTUP_PREWARM")
+    profiler.add_argument("--json", action="store_true", help="Print the phases as JSON")
+    profiler.set_defaults(handler=startup_profile)
+
+    server = subparsers.add_parser("serve", help="Serve the API with one worker process per CPU")
+    server.add_argument("--host", help="Override WEB_HOST")
+    server.add_argument("--port", type=int, help="Override WEB_PORT")
+    server.add_argument("--workers", type=int, help="Override WEB_WORKERS")
+    server.add_argument("--no-preload", action="store_true", help="Import the application in each worker instead")
+    server.set_defaults(handler=serve)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
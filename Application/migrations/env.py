@@ -0,0 +1,106 @@
+"""
+Alembic Migration Environment
+
+This module wires Alembic to the application's database configuration, including:
+- Engine creation through the configured database backend
+- Schema translation so "dbo" migrations run on SQLite and PostgreSQL
+- Model metadata for autogenerate, with "dbo" replaced by the schema the
+  tables actually live in so comparisons work on every backend
+
+Author: Marco Alejandro Santiago
+Created: October 19, 2026
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import BLANK_SCHEMA, MetaData
+
+from app.db.backends import MODEL_SCHEMA
+from app.db.database import Base, backend
+from app import models  # noqa: F401 - registers models on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def comparison_schema(connection):
+    """
+    Schema the model tables live in, as the inspector reports it
+
+    Tables in the connection's default schema are reflected without a
+    schema, so that schema is returned as None.
+    """
+    schema = backend.schema
+    if schema == connection.dialect.default_schema_name:
+        return None
+    return schema
+
+
+def comparison_metadata(schema) -> MetaData:
+    """
+    Copy the model metadata with the "dbo" schema translated for autogenerate
+
+    schema_translate_map only applies to executed statements, not to the
+    schema names autogenerate compares against the reflected database.
+    """
+    if schema == MODEL_SCHEMA:
+        return Base.metadata
+    # Foreign keys need BLANK_SCHEMA to drop their schema; None would keep "dbo"
+    referred = BLANK_SCHEMA if schema is None else schema
+    metadata = MetaData(naming_convention=Base.metadata.naming_convention)
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(
+            metadata,
+            schema=schema,
+            # Foreign keys to other "dbo" tables follow them to the new schema
+            referred_schema_fn=lambda table, to_schema, constraint, referred_schema: (
+                referred if referred_schema == MODEL_SCHEMA else referred_schema
+            ),
+        )
+    return metadata
+
+
+def run_migrations_offline():
+    """Emit migration SQL to stdout without connecting to the database"""
+    context.configure(
+        url=str(backend.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=backend.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations against the configured database"""
+    connectable = backend.create_engine()
+
+    with connectable.connect() as connection:
+        schema = comparison_schema(connection)
+        context.configure(
+            connection=connection,
+            target_metadata=comparison_metadata(schema),
+            # SQLite cannot ALTER constraints in place; use batch (copy-and-move) mode
+            render_as_batch=backend.name == "sqlite",
+            compare_type=True,
+            # A non-default schema is only reflected when schemas are included; compare just that one
+            include_schemas=schema is not None,
+            include_name=lambda name, type_, parent_names: type_ != "schema" or name == schema,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+    connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,169 @@
+"""Baseline schema equivalent to Scripts/02_CreateTables.sql - 04_CreateIndexes.sql
+
+Existing SQL Server databases that were deployed with DeployDatabase.ps1
+already have this schema; mark them with `alembic stamp 0001` instead of
+upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Tables are created in the "dbo" schema; the engine maps it to the
+# configured backend schema at execution time.
+SCHEMA = "dbo"
+
+
+def upgrade():
+    # 02_CreateTables.sql + 03_CreateConstraints.sql
+    # Constraints are declared inline so the same script runs on SQLite,
+    # which cannot add constraints to an existing table.
+    op.create_table(
+        "Users",
+        sa.Column("UserId", sa.Integer, primary_key=True),
+        sa.Column("Username", sa.String(100), nullable=False),
+        sa.Column("Email", sa.String(255), nullable=False),
+        sa.Column("PasswordHash", sa.String(255), nullable=False),
+        sa.Column("IsActive", sa.Boolean, nullable=False, server_default=sa.true()),
+        sa.Column("CreatedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.Column("LastLoginDate", sa.DateTime, nullable=True),
+        sa.UniqueConstraint("Username", name="UQ_Users_Username"),
+        sa.UniqueConstraint("Email", name="UQ_Users_Email"),
+        schema=SCHEMA,
+    )
+
+    op.create_table(
+        "DocumentTypes",
+        sa.Column("DocumentTypeId", sa.Integer, primary_key=True),
+        sa.Column("TypeName", sa.String(100), nullable=False),
+        sa.Column("Description", sa.String(500), nullable=True),
+        sa.Column("SchemaDefinition", sa.Text, nullable=True),
+        sa.Column("IsActive", sa.Boolean, nullable=False, server_default=sa.true()),
+        sa.Column("CreatedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.Column("LastModifiedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.UniqueConstraint("TypeName", name="UQ_DocumentTypes_TypeName"),
+        schema=SCHEMA,
+    )
+
+    op.create_table(
+        "Documents",
+        sa.Column("DocumentId", sa.Integer, primary_key=True),
+        sa.Column("DocumentName", sa.String(255), nullable=False),
+        sa.Column("FileLocation", sa.String(1000), nullable=False),
+        sa.Column("FileType", sa.String(50), nullable=False),
+        sa.Column("FileSizeBytes", sa.BigInteger, nullable=False),
+        sa.Column("CreatedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.Column("CreatedById", sa.Integer, nullable=False),
+        sa.Column("LastModifiedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.Column("LastModifiedById", sa.Integer, nullable=False),
+        sa.Column("IsDeleted", sa.Boolean, nullable=False, server_default=sa.false()),
+        sa.Column("ContentHash", sa.String(255), nullable=False),
+        sa.Column("DocumentTypeId", sa.Integer, nullable=True),
+        sa.ForeignKeyConstraint(["CreatedById"], [f"{SCHEMA}.Users.UserId"], name="FK_Documents_Users_CreatedBy"),
+        sa.ForeignKeyConstraint(["LastModifiedById"], [f"{SCHEMA}.Users.UserId"], name="FK_Documents_Users_ModifiedBy"),
+        sa.ForeignKeyConstraint(["DocumentTypeId"], [f"{SCHEMA}.DocumentTypes.DocumentTypeId"], name="FK_Documents_DocumentTypes"),
+        schema=SCHEMA,
+    )
+
+    op.create_table(
+        "DocumentVersions",
+        sa.Column("VersionId", sa.Integer, primary_key=True),
+        sa.Column("DocumentId", sa.Integer, nullable=False),
+        sa.Column("VersionNumber", sa.Integer, nullable=False),
+        sa.Column("FileLocation", sa.String(1000), nullable=False),
+        sa.Column("CreatedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.Column("CreatedById", sa.Integer, nullable=False),
+        sa.Column("ContentHash", sa.String(255), nullable=False),
+        sa.UniqueConstraint("DocumentId", "VersionNumber", name="UQ_DocumentVersion"),
+        sa.ForeignKeyConstraint(["DocumentId"], [f"{SCHEMA}.Documents.DocumentId"], name="FK_DocumentVersions_Documents"),
+        sa.ForeignKeyConstraint(["CreatedById"], [f"{SCHEMA}.Users.UserId"], name="FK_DocumentVersions_Users"),
+        schema=SCHEMA,
+    )
+
+    op.create_table(
+        "Topics",
+        sa.Column("TopicId", sa.Integer, primary_key=True),
+        sa.Column("TopicName", sa.String(100), nullable=False),
+        sa.Column("Description", sa.String(500), nullable=True),
+        sa.Column("IsActive", sa.Boolean, nullable=False, server_default=sa.true()),
+        sa.Column("CreatedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.Column("ParentTopicId", sa.Integer, nullable=True),
+        sa.UniqueConstraint("TopicName", name="UQ_Topics_TopicName"),
+        sa.ForeignKeyConstraint(["ParentTopicId"], [f"{SCHEMA}.Topics.TopicId"], name="FK_Topics_ParentTopic"),
+        schema=SCHEMA,
+    )
+
+    op.create_table(
+        "Tags",
+        sa.Column("TagId", sa.Integer, primary_key=True),
+        sa.Column("TagName", sa.String(100), nullable=False),
+        sa.Column("Description", sa.String(500), nullable=True),
+        sa.Column("IsActive", sa.Boolean, nullable=False, server_default=sa.true()),
+        sa.UniqueConstraint("TagName", name="UQ_Tags_TagName"),
+        schema=SCHEMA,
+    )
+
+    op.create_table(
+        "DocumentMetadata",
+        sa.Column("DocumentMetadataId", sa.Integer, primary_key=True),
+        sa.Column("DocumentId", sa.Integer, nullable=False),
+        sa.Column("MetadataKey", sa.String(100), nullable=False),
+        sa.Column("MetadataValue", sa.Text, nullable=True),
+        sa.Column("DataType", sa.String(50), nullable=False),
+        sa.Column("CreatedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.Column("LastModifiedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.UniqueConstraint("DocumentId", "MetadataKey", name="UQ_DocumentMetadata"),
+        sa.ForeignKeyConstraint(["DocumentId"], [f"{SCHEMA}.Documents.DocumentId"], name="FK_DocumentMetadata_Documents"),
+        sa.CheckConstraint(
+            sa.column("DataType").in_(["string", "number", "date", "boolean", "json"]),
+            name="CHK_DataType"
+        ),
+        schema=SCHEMA,
+    )
+
+    op.create_table(
+        "DocumentRelationships",
+        sa.Column("RelationshipId", sa.Integer, primary_key=True),
+        sa.Column("SourceDocumentId", sa.Integer, nullable=False),
+        sa.Column("TargetDocumentId", sa.Integer, nullable=False),
+        sa.Column("RelationshipType", sa.String(50), nullable=False),
+        sa.Column("RelationshipMetadata", sa.Text, nullable=True),
+        sa.Column("CreatedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.Column("CreatedById", sa.Integer, nullable=False),
+        sa.Column("IsActive", sa.Boolean, nullable=False, server_default=sa.true()),
+        sa.ForeignKeyConstraint(["SourceDocumentId"], [f"{SCHEMA}.Documents.DocumentId"], name="FK_DocumentRelationships_SourceDoc"),
+        sa.ForeignKeyConstraint(["TargetDocumentId"], [f"{SCHEMA}.Documents.DocumentId"], name="FK_DocumentRelationships_TargetDoc"),
+        sa.ForeignKeyConstraint(["CreatedById"], [f"{SCHEMA}.Users.UserId"], name="FK_DocumentRelationships_Users"),
+        schema=SCHEMA,
+    )
+
+    # 04_CreateIndexes.sql
+    op.create_index("IX_Documents_DocumentType", "Documents", ["DocumentTypeId"], schema=SCHEMA)
+    op.create_index("IX_Documents_CreatedDate", "Documents", ["CreatedDate"], schema=SCHEMA)
+    op.create_index("IX_Documents_IsDeleted", "Documents", ["IsDeleted"], schema=SCHEMA)
+    op.create_index("IX_DocumentMetadata_Key", "DocumentMetadata", ["MetadataKey"], schema=SCHEMA)
+    op.create_index("IX_DocumentRelationships_Source", "DocumentRelationships", ["SourceDocumentId"], schema=SCHEMA)
+    op.create_index("IX_DocumentRelationships_Target", "DocumentRelationships", ["TargetDocumentId"], schema=SCHEMA)
+    op.create_index("IX_DocumentVersions_Document", "DocumentVersions", ["DocumentId", "VersionNumber"], schema=SCHEMA)
+    op.create_index("IX_Users_Email", "Users", ["Email"], schema=SCHEMA)
+
+
+def downgrade():
+    op.drop_table("DocumentRelationships", schema=SCHEMA)
+    op.drop_table("DocumentMetadata", schema=SCHEMA)
+    op.drop_table("Tags", schema=SCHEMA)
+    op.drop_table("Topics", schema=SCHEMA)
+    op.drop_table("DocumentVersions", schema=SCHEMA)
+    op.drop_table("Documents", schema=SCHEMA)
+    op.drop_table("DocumentTypes", schema=SCHEMA)
+    op.drop_table("Users", schema=SCHEMA)
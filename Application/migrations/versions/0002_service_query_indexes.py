@@ -0,0 +1,82 @@
+"""Replace single-column indexes with indexes matching the service queries
+
+- IX_Documents_IsDeleted and IX_Documents_CreatedDate are superseded by the
+  composite IX_Documents_Live_CreatedDate, which covers the list columns.
+- IX_Documents_DocumentType becomes a filtered index over live documents.
+- IX_Users_Email and IX_DocumentVersions_Document duplicate the indexes
+  behind UQ_Users_Email and UQ_DocumentVersion.
+- Users and DocumentTypes get (IsActive, <key>) indexes for their list queries.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Tables are created in the "dbo" schema; the engine maps it to the
+# configured backend schema at execution time.
+SCHEMA = "dbo"
+
+DOCUMENT_LIST_COLUMNS = ["DocumentName", "FileType", "FileSizeBytes", "DocumentTypeId"]
+
+
+def upgrade():
+    op.drop_index("IX_Documents_IsDeleted", table_name="Documents", schema=SCHEMA)
+    op.drop_index("IX_Documents_CreatedDate", table_name="Documents", schema=SCHEMA)
+    op.drop_index("IX_Documents_DocumentType", table_name="Documents", schema=SCHEMA)
+    op.drop_index("IX_Users_Email", table_name="Users", schema=SCHEMA)
+    op.drop_index("IX_DocumentVersions_Document", table_name="DocumentVersions", schema=SCHEMA)
+
+    op.create_index(
+        "IX_Documents_Live_CreatedDate",
+        "Documents",
+        ["IsDeleted", "CreatedDate", "DocumentId"],
+        schema=SCHEMA,
+        mssql_include=DOCUMENT_LIST_COLUMNS,
+        postgresql_include=DOCUMENT_LIST_COLUMNS,
+    )
+    op.create_index(
+        "IX_Documents_Live_DocumentType",
+        "Documents",
+        ["DocumentTypeId", "CreatedDate"],
+        schema=SCHEMA,
+        mssql_where=sa.text("[IsDeleted] = 0"),
+        postgresql_where=sa.text('"IsDeleted" = false'),
+        sqlite_where=sa.text('"IsDeleted" = 0'),
+    )
+    op.create_index(
+        "IX_Users_Active",
+        "Users",
+        ["IsActive", "UserId"],
+        schema=SCHEMA,
+        mssql_include=["Username", "Email"],
+        postgresql_include=["Username", "Email"],
+    )
+    op.create_index(
+        "IX_DocumentTypes_Active",
+        "DocumentTypes",
+        ["IsActive", "DocumentTypeId"],
+        schema=SCHEMA,
+    )
+
+
+def downgrade():
+    op.drop_index("IX_DocumentTypes_Active", table_name="DocumentTypes", schema=SCHEMA)
+    op.drop_index("IX_Users_Active", table_name="Users", schema=SCHEMA)
+    op.drop_index("IX_Documents_Live_DocumentType", table_name="Documents", schema=SCHEMA)
+    op.drop_index("IX_Documents_Live_CreatedDate", table_name="Documents", schema=SCHEMA)
+
+    op.create_index("IX_DocumentVersions_Document", "DocumentVersions", ["DocumentId", "VersionNumber"], schema=SCHEMA)
+    op.create_index("IX_Users_Email", "Users", ["Email"], schema=SCHEMA)
+    op.create_index("IX_Documents_DocumentType", "Documents", ["DocumentTypeId"], schema=SCHEMA)
+    op.create_index("IX_Documents_CreatedDate", "Documents", ["CreatedDate"], schema=SCHEMA)
+    op.create_index("IX_Documents_IsDeleted", "Documents", ["IsDeleted"], schema=SCHEMA)
@@ -0,0 +1,43 @@
+"""Add Documents.LastAccessedDate for batched access tracking
+
+The column is written in bulk by the activity write-behind buffer, never
+per request, so it carries no index.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "dbo"
+
+
+def _schema():
+    """Backend schema for "dbo"; ALTER TABLE is not covered by schema_translate_map"""
+    connection = op.get_context().connection
+    if connection is None:
+        return SCHEMA
+    translate_map = connection.get_execution_options().get("schema_translate_map") or {}
+    return translate_map.get(SCHEMA, SCHEMA)
+
+
+def upgrade():
+    op.add_column(
+        "Documents",
+        sa.Column("LastAccessedDate", sa.DateTime(), nullable=True),
+        schema=_schema(),
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("Documents", schema=_schema()) as batch_op:
+        batch_op.drop_column("LastAccessedDate")
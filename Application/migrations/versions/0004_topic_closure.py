@@ -0,0 +1,80 @@
+"""Add the TopicClosure table and DocumentTopics assignments
+
+TopicClosure holds every (ancestor, descendant, depth) pair of the topic
+hierarchy. Existing topics are backfilled from ParentTopicId.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "dbo"
+
+
+def _closure_rows(parents):
+    """Walk each topic up to its root; parents maps TopicId to ParentTopicId"""
+    rows = []
+    for topic_id in parents:
+        ancestor, depth, seen = topic_id, 0, set()
+        while ancestor is not None and ancestor not in seen:
+            rows.append({"AncestorTopicId": ancestor, "DescendantTopicId": topic_id, "Depth": depth})
+            seen.add(ancestor)
+            ancestor, depth = parents.get(ancestor), depth + 1
+    return rows
+
+
+def upgrade():
+    closure = op.create_table(
+        "TopicClosure",
+        sa.Column("AncestorTopicId", sa.Integer, nullable=False),
+        sa.Column("DescendantTopicId", sa.Integer, nullable=False),
+        sa.Column("Depth", sa.Integer, nullable=False),
+        sa.PrimaryKeyConstraint("AncestorTopicId", "DescendantTopicId", name="PK_TopicClosure"),
+        sa.ForeignKeyConstraint(["AncestorTopicId"], [f"{SCHEMA}.Topics.TopicId"], name="FK_TopicClosure_Ancestor"),
+        sa.ForeignKeyConstraint(["DescendantTopicId"], [f"{SCHEMA}.Topics.TopicId"], name="FK_TopicClosure_Descendant"),
+        schema=SCHEMA,
+    )
+    op.create_index("IX_TopicClosure_Descendant", "TopicClosure", ["DescendantTopicId", "Depth"], schema=SCHEMA)
+
+    op.create_table(
+        "DocumentTopics",
+        sa.Column("DocumentId", sa.Integer, nullable=False),
+        sa.Column("TopicId", sa.Integer, nullable=False),
+        sa.Column("CreatedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.PrimaryKeyConstraint("DocumentId", "TopicId", name="PK_DocumentTopics"),
+        sa.ForeignKeyConstraint(["DocumentId"], [f"{SCHEMA}.Documents.DocumentId"], name="FK_DocumentTopics_Document"),
+        sa.ForeignKeyConstraint(["TopicId"], [f"{SCHEMA}.Topics.TopicId"], name="FK_DocumentTopics_Topic"),
+        schema=SCHEMA,
+    )
+    op.create_index("IX_DocumentTopics_Topic", "DocumentTopics", ["TopicId", "DocumentId"], schema=SCHEMA)
+
+    if context.is_offline_mode():
+        return
+    topics = sa.Table(
+        "Topics",
+        sa.MetaData(),
+        sa.Column("TopicId", sa.Integer),
+        sa.Column("ParentTopicId", sa.Integer),
+        schema=SCHEMA,
+    )
+    parents = dict(op.get_bind().execute(sa.select(topics.c.TopicId, topics.c.ParentTopicId)).all())
+    rows = _closure_rows(parents)
+    if rows:
+        op.bulk_insert(closure, rows)
+
+
+def downgrade():
+    op.drop_index("IX_DocumentTopics_Topic", table_name="DocumentTopics", schema=SCHEMA)
+    op.drop_table("DocumentTopics", schema=SCHEMA)
+    op.drop_index("IX_TopicClosure_Descendant", table_name="TopicClosure", schema=SCHEMA)
+    op.drop_table("TopicClosure", schema=SCHEMA)
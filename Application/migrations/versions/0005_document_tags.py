@@ -0,0 +1,37 @@
+"""Add DocumentTags assignments
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "dbo"
+
+
+def upgrade():
+    op.create_table(
+        "DocumentTags",
+        sa.Column("DocumentId", sa.Integer, nullable=False),
+        sa.Column("TagId", sa.Integer, nullable=False),
+        sa.Column("CreatedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        sa.PrimaryKeyConstraint("DocumentId", "TagId", name="PK_DocumentTags"),
+        sa.ForeignKeyConstraint(["DocumentId"], [f"{SCHEMA}.Documents.DocumentId"], name="FK_DocumentTags_Document"),
+        sa.ForeignKeyConstraint(["TagId"], [f"{SCHEMA}.Tags.TagId"], name="FK_DocumentTags_Tag"),
+        schema=SCHEMA,
+    )
+    op.create_index("IX_DocumentTags_Tag", "DocumentTags", ["TagId", "DocumentId"], schema=SCHEMA)
+
+
+def downgrade():
+    op.drop_index("IX_DocumentTags_Tag", table_name="DocumentTags", schema=SCHEMA)
+    op.drop_table("DocumentTags", schema=SCHEMA)
@@ -0,0 +1,53 @@
+"""Cover relationship traversal with filtered two-column indexes
+
+Each BFS level reads the active edges of a batch of documents from one end.
+The new indexes hold both endpoints (and the type, where INCLUDE is
+supported) for active edges only, so a level is answered from the index.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "dbo"
+
+ACTIVE_FILTER = {
+    "mssql_where": sa.text("[IsActive] = 1"),
+    "postgresql_where": sa.text('"IsActive" = true'),
+    "sqlite_where": sa.text('"IsActive" = 1'),
+}
+
+
+def upgrade():
+    op.drop_index("IX_DocumentRelationships_Source", table_name="DocumentRelationships", schema=SCHEMA)
+    op.drop_index("IX_DocumentRelationships_Target", table_name="DocumentRelationships", schema=SCHEMA)
+    for name, columns in (
+        ("IX_DocumentRelationships_Source", ["SourceDocumentId", "TargetDocumentId"]),
+        ("IX_DocumentRelationships_Target", ["TargetDocumentId", "SourceDocumentId"]),
+    ):
+        op.create_index(
+            name,
+            "DocumentRelationships",
+            columns,
+            schema=SCHEMA,
+            mssql_include=["RelationshipType"],
+            postgresql_include=["RelationshipType"],
+            **ACTIVE_FILTER,
+        )
+
+
+def downgrade():
+    op.drop_index("IX_DocumentRelationships_Target", table_name="DocumentRelationships", schema=SCHEMA)
+    op.drop_index("IX_DocumentRelationships_Source", table_name="DocumentRelationships", schema=SCHEMA)
+    op.create_index("IX_DocumentRelationships_Source", "DocumentRelationships", ["SourceDocumentId"], schema=SCHEMA)
+    op.create_index("IX_DocumentRelationships_Target", "DocumentRelationships", ["TargetDocumentId"], schema=SCHEMA)
@@ -0,0 +1,37 @@
+"""Add the ChangeLog change feed
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "dbo"
+
+
+def upgrade():
+    op.create_table(
+        "ChangeLog",
+        # SQLite only autoincrements INTEGER primary keys
+        sa.Column("ChangeId", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True),
+        sa.Column("EntityType", sa.String(50), nullable=False),
+        sa.Column("EntityId", sa.Integer, nullable=False),
+        sa.Column("Operation", sa.String(10), nullable=False),
+        sa.Column("ChangedDate", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        schema=SCHEMA,
+    )
+    op.create_index("IX_ChangeLog_Entity", "ChangeLog", ["EntityType", "EntityId", "ChangeId"], schema=SCHEMA)
+
+
+def downgrade():
+    op.drop_index("IX_ChangeLog_Entity", table_name="ChangeLog", schema=SCHEMA)
+    op.drop_table("ChangeLog", schema=SCHEMA)
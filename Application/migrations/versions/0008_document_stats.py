@@ -0,0 +1,38 @@
+"""Add DocumentStats aggregate counters
+
+Counters start empty; run manage.py reconcile-stats once after upgrading
+to count the existing documents.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "dbo"
+
+
+def upgrade():
+    op.create_table(
+        "DocumentStats",
+        sa.Column("Facet", sa.String(20), nullable=False),
+        sa.Column("FacetKey", sa.String(100), nullable=False),
+        sa.Column("Shard", sa.Integer, nullable=False),
+        sa.Column("DocumentCount", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("TotalBytes", sa.BigInteger, nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("Facet", "FacetKey", "Shard", name="PK_DocumentStats"),
+        schema=SCHEMA,
+    )
+
+
+def downgrade():
+    op.drop_table("DocumentStats", schema=SCHEMA)